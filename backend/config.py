@@ -6,6 +6,11 @@ class Settings(BaseSettings):
 
     SUPABASE_PASSWORD: str
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: str | None = None  # Defaults to DATABASE_URL with the asyncpg driver
+    READ_REPLICA_URLS: str = ""  # Comma-separated; empty keeps every read on the primary
+    READ_REPLICA_HEALTH_CHECK_SECONDS: float = 5.0
+    READ_YOUR_WRITES_SECONDS: int = 10  # Reads stay on the primary this long after a write
+    DB_HEALTH_CACHE_SECONDS: float = 10.0  # /health/db re-checks the database at most this often
     SUPABASE_URL: str
     OPENAI_API_KEY: str
 
@@ -13,6 +18,46 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str 
     ACCESS_TOKEN_EXPIRE_MINUTES: int 
     ENVIRONMENT: str = "development"
+    FRONTEND_URL: str = "http://localhost:3000"  # Allowed CORS and WebSocket origin
+
+    ANSWER_KEY_CACHE_TTL_SECONDS: int = 300
+    AUTH_USER_CACHE_TTL_SECONDS: float = 60.0  # 0 disables the authenticated user cache
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10_000
+    AUTH_USER_CACHE_LISTEN: bool = True  # Apply invalidations from other processes via LISTEN/NOTIFY
+    PASSWORD_HASH_WORKERS: int = 2  # bcrypt worker processes; 0 hashes on the request threadpool
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Queued password operations per process before answering 503
+
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    N_PLUS_ONE_THRESHOLD: int = 5  # Runs of one statement shape per request flagged as N+1
+    SQL_SLOW_REQUEST_MS: float = 500.0  # Requests with more database time log their slowest statements
+    SQL_SLOWEST_STATEMENTS: int = 3
+
+    LLM_PROVIDER: str = "openai"  # "openai" or "fake" for offline development
+    FAKE_LLM_LATENCY_SECONDS: float = 0.0
+    PLAN_GENERATION_WORKERS: int = 2  # Worker threads per process; 0 disables them
+    PLAN_GENERATION_MAX_CONCURRENCY: int = 2  # Running jobs across all processes
+    PLAN_GENERATION_MAX_ATTEMPTS: int = 3
+    PLAN_GENERATION_LEASE_SECONDS: int = 900
+    PLAN_GENERATION_POLL_SECONDS: float = 2.0
+    PLAN_CACHE_TTL_SECONDS: int = 86400
+    PLAN_CACHE_MAX_ENTRIES: int = 256
+
+    PDF_RENDER_WORKERS: int = 1
+
+    ANALYTICS_API_KEY: str | None = None  # X-Analytics-Key for /results/analytics; unset disables it
+    ANALYTICS_MIN_COHORT_SIZE: int = 5  # Competencies with fewer records in the cohort are hidden
+
+    EXPORT_API_KEY: str | None = None  # X-Export-Key for /exports; unset disables the endpoint
+    EXPORT_BATCH_SIZE: int = 1000  # Rows fetched from the export cursor and written per chunk
+    IMPORT_API_KEY: str | None = None  # X-Import-Key for /imports; unset disables the endpoint
+    IMPORT_BATCH_SIZE: int = 5000  # Historical rows validated, scored and loaded per transaction
+
+    LINK_CHECK_CONCURRENCY: int = 10
+    LINK_CHECK_PER_HOST_INTERVAL_SECONDS: float = 0.5
+    LINK_CHECK_TIMEOUT_SECONDS: float = 5.0
+    LINK_CHECK_TOTAL_TIMEOUT_SECONDS: float = 60.0  # Longest a caller waits for a batch of checks
+    LINK_CHECK_TTL_SECONDS: int = 604800  # Valid links are re-checked after a week
+    LINK_CHECK_FAILURE_TTL_SECONDS: int = 3600
     
     
 
@@ -1,106 +1,81 @@
 import logging
+import threading
+import time
 
 from fastapi import HTTPException
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.exc import OperationalError
-from sqlmodel import Session, SQLModel, create_engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, create_engine, text
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config import settings
 
+from .instrumentation import (
+    TimedAsyncAdaptedQueuePool,
+    TimedQueuePool,
+    instrument_engine,
+)
+
 logger = logging.getLogger(__name__)
 
 
-connect_args = {}
-if settings.DATABASE_URL.startswith("postgresql"):
-    # "prefer" keeps SSL in production while allowing non-SSL local dev
-    connect_args = {"sslmode": "prefer"}
-
-engine = create_engine(
-    settings.DATABASE_URL,
-    # connect_args={"sslmode": "require"},
-    connect_args=connect_args,
-    echo=False,
-    pool_pre_ping=True,  # Validate connections before using them
-    pool_recycle=3600,  # Recycle connections after 1 hour (before they timeout)
-    pool_size=20,
-    max_overflow=20,
+def create_database_engine(url: str, name: str = "primary") -> Engine:
+    """Create a psycopg2 engine with the pool settings shared by the primary and replicas."""
+    connect_args = {}
+    if url.startswith("postgresql"):
+        # "prefer" keeps SSL in production while allowing non-SSL local dev
+        connect_args = {"sslmode": "prefer"}
+    engine = create_engine(
+        url,
+        # connect_args={"sslmode": "require"},
+        connect_args=connect_args,
+        echo=False,
+        pool_pre_ping=True,  # Validate connections before using them
+        pool_recycle=3600,  # Recycle connections after 1 hour (before they timeout)
+        pool_size=20,
+        max_overflow=20,
+        poolclass=TimedQueuePool,
+        pool_logging_name=name,  # Pool label in metrics
+    )
+    instrument_engine(engine, name)
+    return engine
+
+
+def to_async_database_url(url: str) -> str:
+    """Return the given database URL switched to the asyncpg driver."""
+    async_url = make_url(url)
+    # asyncpg takes `ssl` instead of libpq's `sslmode`
+    async_url = async_url.difference_update_query(["sslmode"])
+    return async_url.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def create_async_database_engine(url: str, name: str = "primary_async") -> AsyncEngine:
+    """Create an asyncpg engine with the same pool settings as `create_database_engine`."""
+    engine = create_async_engine(
+        url,
+        connect_args={"ssl": "prefer"},
+        echo=False,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        pool_size=20,
+        max_overflow=20,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_logging_name=name,
+    )
+    instrument_engine(engine.sync_engine, name)
+    return engine
+
+
+engine = create_database_engine(settings.DATABASE_URL)
+
+# Async endpoints share the entities above through their own asyncpg pool, so
+# awaiting the database does not hold one of Starlette's threadpool slots.
+async_engine = create_async_database_engine(
+    settings.ASYNC_DATABASE_URL or to_async_database_url(settings.DATABASE_URL)
 )
 
 
-def _ensure_development_plan_schema() -> None:
-    """Ensure new development_plan columns exist without relying on external migrations."""
-    with engine.begin() as conn:
-        conn.exec_driver_sql(
-            """
-            ALTER TABLE development_plans
-            ADD COLUMN IF NOT EXISTS user_answers_record_id VARCHAR(32)
-            """
-        )
-        conn.exec_driver_sql(
-            """
-            ALTER TABLE development_plans
-            ADD COLUMN IF NOT EXISTS plan_markdown TEXT
-            """
-        )
-        conn.exec_driver_sql(
-            """
-            ALTER TABLE development_plans
-            ALTER COLUMN plan_markdown SET DEFAULT ''
-            """
-        )
-        conn.exec_driver_sql(
-            """
-            UPDATE development_plans
-            SET plan_markdown = ''
-            WHERE plan_markdown IS NULL
-            """
-        )
-        conn.exec_driver_sql(
-            """
-            ALTER TABLE development_plans
-            ALTER COLUMN plan_markdown SET NOT NULL
-            """
-        )
-        conn.exec_driver_sql(
-            """
-            CREATE INDEX IF NOT EXISTS ix_development_plans_user_answers_record_id
-            ON development_plans (user_answers_record_id)
-            """
-        )
-        conn.exec_driver_sql(
-            """
-            DO $$
-            BEGIN
-                IF NOT EXISTS (
-                    SELECT 1
-                    FROM information_schema.table_constraints
-                    WHERE constraint_name = 'development_plans_user_answers_record_id_fkey'
-                      AND table_name = 'development_plans'
-                ) THEN
-                    ALTER TABLE development_plans
-                    ADD CONSTRAINT development_plans_user_answers_record_id_fkey
-                    FOREIGN KEY (user_answers_record_id)
-                    REFERENCES user_answers(id)
-                    ON DELETE SET NULL;
-                END IF;
-            END;
-            $$
-            """
-        )
-
-
-def create_db_and_tables():
-    """
-    Create the database and tables if they do not exist.
-    This function should be called at the start of the application.
-    """
-    SQLModel.metadata.create_all(engine)
-    try:
-        _ensure_development_plan_schema()
-    except Exception as exc:
-        logger.error("Failed to enforce development plan schema: %s", exc)
-        raise
-
-
 def get_session():
     """
     FastAPI dependency that yields a new SQLModel Session
@@ -142,6 +117,22 @@ def get_session():
             raise
 
 
+async def get_async_session():
+    """
+    FastAPI dependency that yields a new SQLModel AsyncSession
+    and commits/rolls back automatically when the request ends.
+    Objects are not expired on commit, so attributes stay readable without
+    an implicit (and, under asyncio, forbidden) lazy reload.
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
 def check_db_connection():
     """
     Check if the database connection is alive.
@@ -156,4 +147,27 @@ def check_db_connection():
         raise
     except Exception as e:
         logger.error(f"Unexpected error while checking database connection: {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+_db_health_lock = threading.Lock()
+_db_health: tuple[float, bool] | None = None  # (monotonic time checked, connected)
+
+
+def get_db_health() -> bool:
+    """
+    Return whether the primary database answered its last check. The check
+    (`check_db_connection`) runs at most once per DB_HEALTH_CACHE_SECONDS, so
+    frequent health probes do not each take a connection.
+    """
+    global _db_health
+    with _db_health_lock:
+        if _db_health is not None and time.monotonic() - _db_health[0] < settings.DB_HEALTH_CACHE_SECONDS:
+            return _db_health[1]
+        try:
+            check_db_connection()
+            connected = True
+        except Exception:
+            connected = False
+        _db_health = (time.monotonic(), connected)
+        return connected
@@ -0,0 +1,249 @@
+"""
+Per-request SQL instrumentation.
+
+`instrument_engine` hooks SQLAlchemy's cursor events on an engine (the
+primary, its asyncpg twin and every read replica are hooked on creation).
+While `QueryStatsMiddleware` serves a request, each statement executed on its
+behalf, from async handlers, threadpool handlers and `run_sync` alike, is
+added to that request's `QueryStats`: query count, total database time, the
+slowest statements and how often each statement shape ran.
+
+A shape that runs `N_PLUS_ONE_THRESHOLD` times or more in one request is
+flagged as a likely N+1 (a query issued once per row of a previous one).
+Outside production the stats go into response headers (`X-DB-Query-Count`,
+`Server-Timing`, `X-DB-N-Plus-One`); flagged or slow requests are logged in
+every environment, and every request feeds the per-route query metrics. Work
+outside a request (plan workers, helpers) is not recorded.
+
+Engines are created with `TimedQueuePool` / `TimedAsyncAdaptedQueuePool`,
+which record how long each checkout waited for a connection, and every
+instrumented engine's pool size, checked-out connections and overflow are
+exported as gauges and by `get_pool_status`.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from prometheus_client import REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.datastructures import MutableHeaders
+
+from config import settings
+from metrics import (
+    DB_N_PLUS_ONE,
+    DB_POOL_CHECKOUT_SECONDS,
+    DB_REQUEST_QUERIES,
+    DB_REQUEST_SECONDS,
+    route_label,
+)
+
+logger = logging.getLogger(__name__)
+
+# psycopg2 (%(name)s) and asyncpg ($1::TYPE) placeholders
+_PARAMETER = re.compile(r"(%\(\w+\)s|\$\d+(::(TIMESTAMP WITH(OUT)? TIME ZONE|[\w\[\]]+))?)")
+_PARAMETER_LIST = re.compile(r"\?(\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a statement so queries differing only in parameters (or in the
+    length of an IN list) compare equal.
+    """
+    shape = _PARAMETER.sub("?", statement)
+    shape = _PARAMETER_LIST.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    slowest: list[tuple[float, str]] = field(default_factory=list)  # (ms, shape), slowest first
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        shape = statement_shape(statement)
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.shapes[shape] += 1
+        self.slowest.append((elapsed_ms, shape))
+        self.slowest.sort(key=lambda item: item[0], reverse=True)
+        del self.slowest[settings.SQL_SLOWEST_STATEMENTS:]
+
+    def repeated_shapes(self) -> list[tuple[str, int]]:
+        """
+        Return the statement shapes run at least N_PLUS_ONE_THRESHOLD times, most repeated first.
+        """
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count >= settings.N_PLUS_ONE_THRESHOLD
+        ]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def get_query_stats() -> QueryStats | None:
+    """
+    Return the stats of the request being served, or None outside a request.
+    """
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None or not conn.info.get("query_start"):
+        return
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    stats.record(statement, elapsed_ms)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+class _TimedCheckout:
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(self._orig_logging_name or "default").observe(
+                time.perf_counter() - start
+            )
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool recording checkout wait time under its `pool_logging_name`."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording checkout wait time under its `pool_logging_name`."""
+
+
+_engines: dict = {}  # name -> Engine whose pool is reported
+
+
+def instrument_engine(engine, name: str) -> None:
+    """
+    Report `engine`'s pool as `name` and record the statements it executes into
+    the current request's QueryStats. Pass the `sync_engine` of an AsyncEngine.
+    """
+    _engines[name] = engine
+    if not settings.SQL_INSTRUMENTATION_ENABLED:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def get_pool_status() -> dict[str, dict[str, int]]:
+    """
+    Return size, checked-out connections and overflow of every instrumented engine's pool.
+    Reads in-process counters only; no connection is made.
+    """
+    status = {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            status[name] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),  # Negative while the pool is not full yet
+            }
+    return status
+
+
+class _PoolCollector:
+    def collect(self):
+        families = {
+            stat: GaugeMetricFamily(f"db_pool_{stat}", f"Connection pool {stat.replace('_', ' ')}", labels=["pool"])
+            for stat in ("size", "checked_out", "checked_in", "overflow")
+        }
+        for name, stats in get_pool_status().items():
+            for stat, value in stats.items():
+                families[stat].add_metric([name], value)
+        yield from families.values()
+
+
+REGISTRY.register(_PoolCollector())
+
+
+def _truncate(shape: str, length: int = 200) -> str:
+    return shape if len(shape) <= length else shape[: length - 3] + "..."
+
+
+class QueryStatsMiddleware:
+    """
+    Collect QueryStats for every HTTP request, expose them as response headers
+    outside production and log requests with N+1 patterns or slow database time.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.headers_enabled = settings.ENVIRONMENT != "production"
+
+    async def __call__(self, scope, receive, send):
+        if not settings.SQL_INSTRUMENTATION_ENABLED or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start" and self.headers_enabled:
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Query-Count", str(stats.count))
+                headers.append(
+                    "Server-Timing", f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"'
+                )
+                repeated = stats.repeated_shapes()
+                if repeated:
+                    headers.append("X-DB-N-Plus-One", str(repeated[0][1]))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current_stats.reset(token)
+            self._record(scope, stats)
+
+    def _record(self, scope, stats: QueryStats) -> None:
+        route_template = route_label(scope)
+        DB_REQUEST_QUERIES.labels(route_template).observe(stats.count)
+        DB_REQUEST_SECONDS.labels(route_template).observe(stats.total_ms / 1000)
+        repeated = stats.repeated_shapes()
+        if repeated:
+            DB_N_PLUS_ONE.labels(route_template).inc()
+
+        route = f"{scope['method']} {scope['path']}"
+        for shape, count in repeated:
+            logger.warning(
+                f"Possible N+1 in {route}: statement ran {count} times: {_truncate(shape)}"
+            )
+        if stats.total_ms >= settings.SQL_SLOW_REQUEST_MS:
+            slowest = "; ".join(f"{ms:.1f} ms {_truncate(shape)}" for ms, shape in stats.slowest)
+            logger.warning(
+                f"Slow database time in {route}: {stats.count} queries, "
+                f"{stats.total_ms:.1f} ms; slowest: {slowest}"
+            )
+        elif stats.count:
+            logger.debug(f"{route}: {stats.count} queries, {stats.total_ms:.1f} ms")
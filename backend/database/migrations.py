@@ -0,0 +1,579 @@
+"""
+Versioned schema migrations.
+
+Every migration runs exactly once, in its own transaction (in autocommit mode
+when marked non-transactional, as `CREATE INDEX CONCURRENTLY` requires), and
+is recorded in `schema_version`. `run_migrations` holds a session-level
+advisory lock for the whole run, so concurrent deploy jobs wait for each
+other instead of racing, and DDL waits at most `MIGRATION_LOCK_TIMEOUT` for
+table locks rather than queueing live traffic behind it. Run them with `python -m helpers.migrate`
+before starting the new API processes; `lifespan` only calls
+`verify_schema_version`.
+
+Migration 1 creates the tables as they stood when migrations were introduced;
+every schema change since is a migration of its own, so a fresh database ends
+up with the same schema as one migrated step by step. Migrations use
+`IF NOT EXISTS` so databases created before them are adopted as-is.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy import Connection
+from sqlmodel import text
+
+from .core import engine
+
+logger = logging.getLogger(__name__)
+
+_MIGRATION_LOCK_KEY = 0x6D696772  # Advisory lock serializing migration runs
+MIGRATION_LOCK_TIMEOUT = "30s"
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable[[Connection], None]
+    # False runs `apply` in autocommit mode, e.g. for CREATE INDEX CONCURRENTLY
+    transactional: bool = True
+
+
+# The tables as migration 1 first shipped, frozen: schema changes since then are
+# later migrations, never edits here. IF NOT EXISTS adopts databases created by
+# the boot-time create_all that preceded migrations.
+_BASELINE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS leadership_modules (
+        id VARCHAR NOT NULL,
+        title VARCHAR NOT NULL,
+        topic VARCHAR NOT NULL,
+        format VARCHAR NOT NULL,
+        duration INTEGER NOT NULL,
+        difficulty_level VARCHAR NOT NULL,
+        estimated_completion_time INTEGER NOT NULL,
+        prerequisites VARCHAR,
+        learning_outcomes VARCHAR NOT NULL,
+        target_audience VARCHAR NOT NULL,
+        content VARCHAR NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        description VARCHAR NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_leadership_modules_id ON leadership_modules (id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS questionnaires (
+        id VARCHAR NOT NULL,
+        title VARCHAR NOT NULL,
+        description VARCHAR,
+        questions VARCHAR[] NOT NULL,
+        is_active BOOLEAN NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_questionnaires_id ON questionnaires (id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS questions (
+        id VARCHAR NOT NULL,
+        question_text VARCHAR NOT NULL,
+        competency VARCHAR,
+        explanation VARCHAR,
+        is_active BOOLEAN NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_questions_id ON questions (id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS url_statuses (
+        url VARCHAR NOT NULL,
+        ok BOOLEAN NOT NULL,
+        final_url VARCHAR,
+        status_code INTEGER,
+        checked_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (url)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id VARCHAR NOT NULL,
+        first_name VARCHAR NOT NULL,
+        last_name VARCHAR NOT NULL,
+        email VARCHAR NOT NULL,
+        hashed_password VARCHAR NOT NULL,
+        role VARCHAR NOT NULL,
+        industry VARCHAR,
+        years_experience INTEGER NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (id),
+        UNIQUE (email)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_users_id ON users (id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS answers (
+        id VARCHAR NOT NULL,
+        question_id VARCHAR NOT NULL,
+        answer_text VARCHAR NOT NULL,
+        score_value INTEGER NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(question_id) REFERENCES questions (id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_answers_id ON answers (id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS competency_score_buckets (
+        questionnaire_id VARCHAR NOT NULL,
+        industry VARCHAR NOT NULL,
+        role VARCHAR NOT NULL,
+        experience_band VARCHAR NOT NULL,
+        competency VARCHAR NOT NULL,
+        score INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (questionnaire_id, industry, role, experience_band, competency, score),
+        FOREIGN KEY(questionnaire_id) REFERENCES questionnaires (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS leadership_assessments (
+        id VARCHAR NOT NULL,
+        user_id VARCHAR NOT NULL,
+        self_rating INTEGER NOT NULL,
+        assessment_rating INTEGER NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES users (id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_leadership_assessments_id ON leadership_assessments (id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_answers (
+        id VARCHAR NOT NULL,
+        user_id VARCHAR NOT NULL,
+        questionnaire_id VARCHAR NOT NULL,
+        answers JSONB NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        completed_at TIMESTAMP WITH TIME ZONE,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES users (id),
+        FOREIGN KEY(questionnaire_id) REFERENCES questionnaires (id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_user_answers_id ON user_answers (id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_module_progress (
+        id VARCHAR NOT NULL,
+        user_id VARCHAR NOT NULL,
+        module_id VARCHAR NOT NULL,
+        status VARCHAR NOT NULL,
+        progress_percentage INTEGER NOT NULL,
+        last_accessed TIMESTAMP WITH TIME ZONE NOT NULL,
+        notes VARCHAR,
+        completed INTEGER NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        completed_at TIMESTAMP WITH TIME ZONE,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES users (id),
+        FOREIGN KEY(module_id) REFERENCES leadership_modules (id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_user_module_progress_id ON user_module_progress (id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS development_plans (
+        id VARCHAR NOT NULL,
+        user_id VARCHAR NOT NULL,
+        user_answers_record_id VARCHAR,
+        goal VARCHAR NOT NULL,
+        description VARCHAR,
+        start_date TIMESTAMP WITH TIME ZONE NOT NULL,
+        end_date TIMESTAMP WITH TIME ZONE NOT NULL,
+        status VARCHAR NOT NULL,
+        progress INTEGER NOT NULL,
+        resources VARCHAR,
+        challenges VARCHAR,
+        next_steps VARCHAR,
+        action_items VARCHAR NOT NULL,
+        plan_markdown TEXT NOT NULL,
+        target_date TIMESTAMP WITH TIME ZONE NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES users (id),
+        FOREIGN KEY(user_answers_record_id) REFERENCES user_answers (id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_development_plans_id ON development_plans (id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_development_plans_user_answers_record_id ON development_plans (user_answers_record_id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_results (
+        user_answers_record_id VARCHAR NOT NULL,
+        user_id VARCHAR NOT NULL,
+        questionnaire_id VARCHAR NOT NULL,
+        results JSONB NOT NULL,
+        is_stale BOOLEAN NOT NULL,
+        industry VARCHAR,
+        role VARCHAR,
+        experience_band VARCHAR,
+        completed_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        computed_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (user_answers_record_id),
+        FOREIGN KEY(user_answers_record_id) REFERENCES user_answers (id) ON DELETE CASCADE,
+        FOREIGN KEY(user_id) REFERENCES users (id),
+        FOREIGN KEY(questionnaire_id) REFERENCES questionnaires (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS development_plan_pdfs (
+        key VARCHAR NOT NULL,
+        development_plan_id VARCHAR NOT NULL,
+        content BYTEA NOT NULL,
+        size INTEGER NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (key),
+        FOREIGN KEY(development_plan_id) REFERENCES development_plans (id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_development_plan_pdfs_development_plan_id ON development_plan_pdfs (development_plan_id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS plan_generation_jobs (
+        id VARCHAR NOT NULL,
+        user_id VARCHAR NOT NULL,
+        user_answers_record_id VARCHAR NOT NULL,
+        request JSONB NOT NULL,
+        status VARCHAR NOT NULL,
+        attempts INTEGER NOT NULL,
+        development_plan_id VARCHAR,
+        error TEXT,
+        lease_expires_at TIMESTAMP WITH TIME ZONE,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        started_at TIMESTAMP WITH TIME ZONE,
+        finished_at TIMESTAMP WITH TIME ZONE,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES users (id),
+        FOREIGN KEY(user_answers_record_id) REFERENCES user_answers (id) ON DELETE CASCADE,
+        FOREIGN KEY(development_plan_id) REFERENCES development_plans (id) ON DELETE SET NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_plan_generation_jobs_id ON plan_generation_jobs (id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_plan_generation_jobs_status_created_at ON plan_generation_jobs (status, created_at)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_plan_generation_jobs_user_answers_record_id ON plan_generation_jobs (user_answers_record_id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_plan_generation_jobs_user_id ON plan_generation_jobs (user_id)
+    """,
+)
+
+
+def _create_tables(conn: Connection) -> None:
+    for statement in _BASELINE_SCHEMA:
+        conn.exec_driver_sql(statement)
+
+
+def _add_development_plan_markdown(conn: Connection) -> None:
+    conn.exec_driver_sql(
+        """
+        ALTER TABLE development_plans
+        ADD COLUMN IF NOT EXISTS user_answers_record_id VARCHAR(32)
+        """
+    )
+    conn.exec_driver_sql(
+        """
+        ALTER TABLE development_plans
+        ADD COLUMN IF NOT EXISTS plan_markdown TEXT
+        """
+    )
+    conn.exec_driver_sql(
+        """
+        ALTER TABLE development_plans
+        ALTER COLUMN plan_markdown SET DEFAULT ''
+        """
+    )
+    conn.exec_driver_sql(
+        """
+        UPDATE development_plans
+        SET plan_markdown = ''
+        WHERE plan_markdown IS NULL
+        """
+    )
+    conn.exec_driver_sql(
+        """
+        ALTER TABLE development_plans
+        ALTER COLUMN plan_markdown SET NOT NULL
+        """
+    )
+    conn.exec_driver_sql(
+        """
+        CREATE INDEX IF NOT EXISTS ix_development_plans_user_answers_record_id
+        ON development_plans (user_answers_record_id)
+        """
+    )
+    conn.exec_driver_sql(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1
+                FROM information_schema.table_constraints
+                WHERE constraint_name = 'development_plans_user_answers_record_id_fkey'
+                  AND table_name = 'development_plans'
+            ) THEN
+                ALTER TABLE development_plans
+                ADD CONSTRAINT development_plans_user_answers_record_id_fkey
+                FOREIGN KEY (user_answers_record_id)
+                REFERENCES user_answers(id)
+                ON DELETE SET NULL;
+            END IF;
+        END;
+        $$
+        """
+    )
+
+
+def _add_user_results_cohort(conn: Connection) -> None:
+    for column in ("industry", "role", "experience_band"):
+        conn.exec_driver_sql(
+            f"""
+            ALTER TABLE user_results
+            ADD COLUMN IF NOT EXISTS {column} VARCHAR
+            """
+        )
+
+
+def _create_index_concurrently(conn: Connection, name: str, table: str, columns: str) -> None:
+    # A failed concurrent build leaves an INVALID index behind that IF NOT EXISTS would keep
+    invalid = conn.execute(
+        text(
+            """
+            SELECT 1 FROM pg_index
+            WHERE indexrelid = to_regclass(:name) AND NOT indisvalid
+            """
+        ),
+        {"name": name},
+    ).first()
+    if invalid:
+        conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    conn.exec_driver_sql(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def _index_hot_filters(conn: Connection) -> None:
+    _create_index_concurrently(
+        conn,
+        "ix_user_answers_user_questionnaire_completed_at",
+        "user_answers",
+        "user_id, questionnaire_id, completed_at",
+    )
+    _create_index_concurrently(
+        conn, "ix_development_plans_user_id_created_at", "development_plans", "user_id, created_at"
+    )
+    _create_index_concurrently(conn, "ix_answers_question_id", "answers", "question_id")
+
+
+def _add_user_answers_revision(conn: Connection) -> None:
+    # A constant default is stored in the catalog; existing rows are not rewritten
+    conn.exec_driver_sql(
+        """
+        ALTER TABLE user_answers
+        ADD COLUMN IF NOT EXISTS revision INTEGER NOT NULL DEFAULT 0
+        """
+    )
+
+
+def _add_user_answers_autosave_seq(conn: Connection) -> None:
+    conn.exec_driver_sql(
+        """
+        ALTER TABLE user_answers
+        ADD COLUMN IF NOT EXISTS autosave_seq BIGINT NOT NULL DEFAULT 0
+        """
+    )
+
+
+def _add_questionnaire_versions(conn: Connection) -> None:
+    conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS questionnaire_versions (
+            content_hash VARCHAR PRIMARY KEY,
+            questionnaire_id VARCHAR NOT NULL REFERENCES questionnaires (id) ON DELETE CASCADE,
+            version INTEGER NOT NULL,
+            content JSONB NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            CONSTRAINT uq_questionnaire_versions_questionnaire_version UNIQUE (questionnaire_id, version)
+        )
+        """
+    )
+    # Nullable and without a default: records that predate versions keep NULL, no rewrite
+    conn.exec_driver_sql(
+        """
+        ALTER TABLE user_answers
+        ADD COLUMN IF NOT EXISTS questionnaire_version_id VARCHAR
+        REFERENCES questionnaire_versions (content_hash)
+        """
+    )
+
+
+def _add_user_answers_autosave_client_seqs(conn: Connection) -> None:
+    conn.exec_driver_sql(
+        """
+        ALTER TABLE user_answers
+        ADD COLUMN IF NOT EXISTS autosave_seqs JSONB NOT NULL DEFAULT '{}'
+        """
+    )
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(1, "Create tables", _create_tables),
+    Migration(2, "Link development plans to user answers and store their markdown", _add_development_plan_markdown),
+    Migration(3, "Snapshot the cohort on user results", _add_user_results_cohort),
+    Migration(4, "Index user answers, development plan and answer lookups", _index_hot_filters, transactional=False),
+    Migration(5, "Add a revision counter to user answers", _add_user_answers_revision),
+    Migration(6, "Track the last applied autosave batch of user answers", _add_user_answers_autosave_seq),
+    Migration(7, "Publish immutable questionnaire versions referenced by user answers", _add_questionnaire_versions),
+    Migration(8, "Track the last applied autosave batch of user answers per client", _add_user_answers_autosave_client_seqs),
+]
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def _ensure_version_table(conn: Connection) -> None:
+    conn.exec_driver_sql(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """
+    )
+
+
+def _applied_versions(conn: Connection) -> set[int]:
+    return set(conn.execute(text("SELECT version FROM schema_version")).scalars())
+
+
+def _record_version(conn: Connection, migration: Migration) -> None:
+    conn.execute(
+        text("INSERT INTO schema_version (version, description) VALUES (:version, :description)"),
+        {"version": migration.version, "description": migration.description},
+    )
+
+
+def _read_applied_versions() -> set[int] | None:
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT to_regclass('schema_version')")).scalar() is None:
+            return None
+        return _applied_versions(conn)
+
+
+def get_schema_version() -> int | None:
+    """
+    Return the highest applied migration version, or None if migrations never ran.
+    """
+    applied = _read_applied_versions()
+    return max(applied) if applied else None
+
+
+def get_pending_migrations() -> list[Migration]:
+    """
+    Return the migrations not yet applied, oldest first.
+    """
+    applied = _read_applied_versions() or set()
+    return [m for m in MIGRATIONS if m.version not in applied]
+
+
+def run_migrations(target: int | None = None) -> list[Migration]:
+    """
+    Apply pending migrations up to `target` (the latest by default) under the advisory lock.
+    Returns the migrations applied by this call.
+    """
+    applied_now: list[Migration] = []
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+        conn.commit()  # The session-level lock outlives this transaction
+        try:
+            with conn.begin():
+                _ensure_version_table(conn)
+                # Read after taking the lock: another run may have just finished
+                applied = _applied_versions(conn)
+            for migration in MIGRATIONS:
+                if migration.version in applied or (target is not None and migration.version > target):
+                    continue
+                logger.info(f"Applying migration {migration.version}: {migration.description}")
+                if migration.transactional:
+                    with conn.begin():
+                        conn.exec_driver_sql(f"SET LOCAL lock_timeout = '{MIGRATION_LOCK_TIMEOUT}'")
+                        migration.apply(conn)
+                        _record_version(conn, migration)
+                else:
+                    conn.execution_options(isolation_level="AUTOCOMMIT")
+                    try:
+                        conn.exec_driver_sql(f"SET lock_timeout = '{MIGRATION_LOCK_TIMEOUT}'")
+                        migration.apply(conn)
+                    finally:
+                        conn.exec_driver_sql("RESET lock_timeout")
+                        conn.commit()  # Ends the autobegun no-op transaction
+                        conn.execution_options(isolation_level=conn.default_isolation_level)
+                    with conn.begin():
+                        _record_version(conn, migration)
+                applied.add(migration.version)
+                applied_now.append(migration)
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+            conn.commit()
+    logger.info(f"Database schema at version {max(applied, default=0)} ({len(applied_now)} migrations applied)")
+    return applied_now
+
+
+def verify_schema_version() -> None:
+    """
+    Fail startup when the database is behind the migrations this code expects.
+    A newer schema is allowed so old processes keep serving during a rolling deploy.
+    """
+    version = get_schema_version()
+    if version is None or version < LATEST_SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema is at version {version or 0}, expected {LATEST_SCHEMA_VERSION}; "
+            "run `python -m helpers.migrate` first"
+        )
+    if version > LATEST_SCHEMA_VERSION:
+        logger.warning(
+            f"Database schema version {version} is newer than this code ({LATEST_SCHEMA_VERSION})"
+        )
+    logger.info(f"Database schema version {version} verified")
@@ -0,0 +1,68 @@
+"""
+Keyset (cursor) pagination for listing endpoints.
+
+Listings order by a timestamp plus the primary key as tie-breaker and resume
+after the last row of the previous page with a row comparison on that pair,
+so every page costs the same index range scan however deep it is, unlike
+OFFSET. The cursor handed to clients is an opaque URL-safe token encoding
+that last (timestamp, id) pair.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(sort_value: datetime, row_id: str) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+    """
+    raw = json.dumps([sort_value.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decode a cursor from `encode_cursor`. Raises 400 for malformed cursors.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), str(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(stmt, sort_column, id_column, cursor: str | None, limit: int, descending: bool = True):
+    """
+    Order `stmt` by (sort_column, id_column), start after `cursor` and fetch
+    one row more than `limit` so `page_rows` can tell whether a next page exists.
+    """
+    if cursor:
+        key = tuple_(sort_column, id_column)
+        after = tuple_(*decode_cursor(cursor))
+        stmt = stmt.where(key < after if descending else key > after)
+    if descending:
+        stmt = stmt.order_by(sort_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(sort_column.asc(), id_column.asc())
+    return stmt.limit(limit + 1)
+
+
+def page_rows(rows, limit: int, cursor_key) -> tuple[list, str | None]:
+    """
+    Split the rows fetched by a `paginate` query into the page and the cursor
+    of the next page (None on the last page). `cursor_key(row)` returns the
+    row's (sort value, id).
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*cursor_key(rows[-1]))
@@ -0,0 +1,225 @@
+"""
+Read-replica routing for read-only endpoints.
+
+`READ_REPLICA_URLS` lists (comma-separated) streaming replicas of
+DATABASE_URL. GET endpoints that only read depend on `get_read_session` /
+`get_async_read_session` instead of the primary dependencies; those open the
+session on the next healthy replica (round-robin) and fall back to the primary
+when no replica is configured or healthy, for other methods, and for requests
+that must see their own writes.
+
+Read-your-writes: `ReadYourWritesMiddleware` gives every successful write
+request a `read_primary` cookie lasting `READ_YOUR_WRITES_SECONDS`, and reads
+carrying it stay on the primary, e.g. the results page loaded right after
+`PATCH /user_answers` completes a questionnaire. Being a cookie, the pin holds
+whichever API process serves the next request.
+
+A background thread pings every replica each `READ_REPLICA_HEALTH_CHECK_SECONDS`;
+a replica only receives reads after its last ping succeeded, and is taken out
+as soon as a request on it fails to reach the database.
+"""
+
+import itertools
+import logging
+import threading
+from dataclasses import dataclass
+
+from fastapi import Depends, Request
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.datastructures import MutableHeaders
+
+from config import settings
+
+from .core import (
+    async_engine,
+    create_async_database_engine,
+    create_database_engine,
+    get_async_session,
+    get_session,
+    to_async_database_url,
+)
+
+logger = logging.getLogger(__name__)
+
+READ_PRIMARY_COOKIE = "read_primary"
+_READ_METHODS = ("GET", "HEAD")
+_SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+@dataclass
+class _Replica:
+    name: str  # URL without the password, for logs
+    engine: Engine
+    async_engine: AsyncEngine
+    healthy: bool = False
+
+
+def _create_replica(url: str, index: int) -> _Replica:
+    return _Replica(
+        name=make_url(url).render_as_string(hide_password=True),
+        engine=create_database_engine(url, name=f"replica{index}"),
+        async_engine=create_async_database_engine(to_async_database_url(url), name=f"replica{index}_async"),
+    )
+
+
+_replicas = [
+    _create_replica(url, index)
+    for index, url in enumerate(
+        (url.strip() for url in settings.READ_REPLICA_URLS.split(",") if url.strip()), start=1
+    )
+]
+_next_replica = itertools.count()
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+
+
+def _mark_unhealthy(replica: _Replica, error: Exception) -> None:
+    if replica.healthy:
+        logger.warning(f"Read replica {replica.name} marked unhealthy: {error}")
+    replica.healthy = False
+
+
+def _pick_replica(request: Request) -> _Replica | None:
+    if request.method not in _READ_METHODS or READ_PRIMARY_COOKIE in request.cookies:
+        return None
+    healthy = [replica for replica in _replicas if replica.healthy]
+    if not healthy:
+        return None
+    return healthy[next(_next_replica) % len(healthy)]
+
+
+def get_async_read_engine() -> AsyncEngine:
+    """
+    Return the async engine of the next healthy replica, or the primary's when
+    none is; for long reads that manage their own connection (exports).
+    """
+    healthy = [replica for replica in _replicas if replica.healthy]
+    if not healthy:
+        return async_engine
+    return healthy[next(_next_replica) % len(healthy)].async_engine
+
+
+def get_read_session(request: Request):
+    """
+    FastAPI dependency yielding a SQLModel Session on a healthy read replica,
+    or the primary session from `get_session` when the request must not use one.
+    """
+    replica = _pick_replica(request)
+    if replica is None:
+        yield from get_session()
+        return
+    with Session(replica.engine) as session:
+        try:
+            yield session
+        except (OperationalError, OSError) as e:
+            _mark_unhealthy(replica, e)
+            raise
+
+
+async def get_async_read_session(
+    request: Request,
+    primary: AsyncSession = Depends(get_async_session),
+):
+    """
+    FastAPI dependency yielding an AsyncSession on a healthy read replica, or
+    the request's primary session (shared with `get_async_session`) otherwise.
+    """
+    replica = _pick_replica(request)
+    if replica is None:
+        yield primary
+        return
+    async with AsyncSession(replica.async_engine, expire_on_commit=False) as session:
+        try:
+            yield session
+        except (OperationalError, OSError) as e:
+            _mark_unhealthy(replica, e)
+            raise
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin the client's reads to the primary for READ_YOUR_WRITES_SECONDS after
+    each successful write request. Does nothing when no replica is configured.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        cookie = (
+            f"{READ_PRIMARY_COOKIE}=1; Max-Age={settings.READ_YOUR_WRITES_SECONDS}; "
+            "Path=/; HttpOnly; SameSite=lax"
+        )
+        if settings.ENVIRONMENT == "production":
+            cookie += "; Secure"
+        self.cookie = cookie
+
+    async def __call__(self, scope, receive, send):
+        if not _replicas or scope["type"] != "http" or scope["method"] in _SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append("set-cookie", self.cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def check_replicas() -> None:
+    """
+    Ping every replica once and update which ones receive reads.
+    """
+    for replica in _replicas:
+        try:
+            with replica.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except Exception as e:
+            _mark_unhealthy(replica, e)
+            continue
+        if not replica.healthy:
+            logger.info(f"Read replica {replica.name} is healthy")
+        replica.healthy = True
+
+
+def get_replica_status() -> dict[str, bool]:
+    """
+    Return whether each configured replica currently receives reads.
+    """
+    return {replica.name: replica.healthy for replica in _replicas}
+
+
+def _health_check_loop() -> None:
+    while not _stop.is_set():
+        check_replicas()
+        _stop.wait(settings.READ_REPLICA_HEALTH_CHECK_SECONDS)
+
+
+def start_replica_health_checks() -> None:
+    """
+    Start the background thread pinging the replicas; reads stay on the primary until a ping succeeds.
+    """
+    global _thread
+    if _thread is not None or not _replicas:
+        return
+    _stop.clear()
+    _thread = threading.Thread(
+        target=_health_check_loop, name="read-replica-health", daemon=True
+    )
+    _thread.start()
+    logger.info(f"Routing reads to {len(_replicas)} read replicas")
+
+
+def stop_replica_health_checks(timeout: float = 5.0) -> None:
+    """
+    Stop the health check thread.
+    """
+    global _thread
+    if _thread is None:
+        return
+    _stop.set()
+    _thread.join(timeout)
+    _thread = None
@@ -1,9 +1,15 @@
 from .answers import Answer
+from .competency_score_buckets import CompetencyScoreBucket
+from .development_plan_pdfs import DevelopmentPlanPdf
 from .development_plans import DevelopmentPlan
 from .leadership_assessments import LeadershipAssessment
 from .leadership_modules import LeadershipModule
+from .plan_generation_jobs import PlanGenerationJob
+from .questionnaire_versions import QuestionnaireVersion
 from .questionnaires import Questionnaire
 from .questions import Question
+from .url_statuses import UrlStatus
 from .user_answers import UserAnswer
 from .user_module_progress import UserModuleProgress
+from .user_results import UserResult
 from .users import User
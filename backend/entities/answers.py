@@ -14,7 +14,7 @@ class Answer(SQLModel, table=True):
 
     __tablename__ = "answers"
     id: str = Field(default_factory=lambda: uuid4().hex, primary_key=True, index=True)
-    question_id: str = Field(sa_column=Column(String, ForeignKey("questions.id"), nullable=False))
+    question_id: str = Field(sa_column=Column(String, ForeignKey("questions.id"), nullable=False, index=True))
     answer_text: str = Field(sa_column=Column(String, nullable=False))  # The text of the answer
     score_value: int = Field(sa_column=Column(Integer, nullable=False))  # Score value for the answer
     created_at: datetime = Field(
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlmodel import Field, SQLModel
+
+
+class CompetencyScoreBucket(SQLModel, table=True):
+    """
+    CompetencyScoreBucket model holding pre-aggregated competency score counts.
+    Each row counts completed records of one cohort (questionnaire, industry,
+    role, experience band) that scored `score` percent in `competency`.
+    """
+
+    __tablename__ = "competency_score_buckets"
+    questionnaire_id: str = Field(
+        sa_column=Column(
+            String, ForeignKey("questionnaires.id"), primary_key=True
+        )
+    )
+    industry: str = Field(sa_column=Column(String, primary_key=True))
+    role: str = Field(sa_column=Column(String, primary_key=True))
+    experience_band: str = Field(
+        sa_column=Column(String, primary_key=True)
+    )  # e.g: "0-2", "3-5", "6-10", "11-20", "21+"
+    competency: str = Field(sa_column=Column(String, primary_key=True))
+    score: int = Field(
+        sa_column=Column(Integer, primary_key=True)
+    )  # Whole percentage (0-100)
+    count: int = Field(
+        default=0, sa_column=Column(Integer, nullable=False, default=0)
+    )  # Number of completed records with this score
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False),
+    )
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    String,
+)
+from sqlmodel import Field, SQLModel
+
+
+class DevelopmentPlanPdf(SQLModel, table=True):
+    """
+    DevelopmentPlanPdf model storing a rendered development plan PDF.
+    Rows are content-addressed: the key hashes everything the rendering depends on.
+    """
+
+    __tablename__ = "development_plan_pdfs"
+    key: str = Field(sa_column=Column(String, primary_key=True))  # sha256 of the render inputs
+    development_plan_id: str = Field(
+        sa_column=Column(
+            String,
+            ForeignKey("development_plans.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        )
+    )
+    content: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    size: int = Field(sa_column=Column(Integer, nullable=False))  # Size of content in bytes
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False),
+    )
@@ -1,7 +1,15 @@
 from datetime import datetime, timezone
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlmodel import Field, SQLModel
 
 
@@ -12,6 +20,10 @@ class DevelopmentPlan(SQLModel, table=True):
     """
 
     __tablename__ = "development_plans"
+    __table_args__ = (
+        # Plan history lists a user's plans newest first
+        Index("ix_development_plans_user_id_created_at", "user_id", "created_at"),
+    )
     id: str = Field(default_factory=lambda: uuid4().hex, primary_key=True, index=True)
     user_id: str = Field(
         sa_column=Column(String, ForeignKey("users.id"), nullable=False)
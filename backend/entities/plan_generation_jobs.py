@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+
+class PlanGenerationJob(SQLModel, table=True):
+    """
+    PlanGenerationJob model tracking an AI development plan generation request.
+    Jobs are queued by the API and claimed by background workers, so they survive restarts.
+    """
+
+    __tablename__ = "plan_generation_jobs"
+    __table_args__ = (
+        Index("ix_plan_generation_jobs_status_created_at", "status", "created_at"),
+    )
+    id: str = Field(default_factory=lambda: uuid4().hex, primary_key=True, index=True)
+    user_id: str = Field(
+        sa_column=Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    )
+    user_answers_record_id: str = Field(
+        sa_column=Column(
+            String,
+            ForeignKey("user_answers.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        )
+    )
+    request: dict = Field(
+        sa_column=Column(JSONB, nullable=False)
+    )  # The GeneratePlanRequest payload
+    status: str = Field(
+        default="queued", sa_column=Column(String, nullable=False, default="queued")
+    )  # e.g: "queued", "running", "succeeded", "failed"
+    attempts: int = Field(
+        default=0, sa_column=Column(Integer, nullable=False, default=0)
+    )  # Number of times a worker has claimed the job
+    development_plan_id: str | None = Field(
+        default=None,
+        sa_column=Column(
+            String,
+            ForeignKey("development_plans.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )  # The generated plan once the job succeeded
+    error: str | None = Field(
+        default=None, sa_column=Column(Text, nullable=True)
+    )  # Failure reason once the job failed
+    lease_expires_at: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )  # A running job whose lease expired is reclaimed by another worker
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False),
+    )
+    started_at: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    finished_at: datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True),
+            default=lambda: datetime.now(timezone.utc),
+            onupdate=lambda: datetime.now(timezone.utc),
+            nullable=False,
+        ),
+    )
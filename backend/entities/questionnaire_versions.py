@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+
+class QuestionnaireVersion(SQLModel, table=True):
+    """
+    QuestionnaireVersion model storing an immutable published snapshot of a questionnaire:
+    its ordered questions with their answers and scores.
+    Rows are content-addressed by a hash of the snapshot and never updated.
+    """
+
+    __tablename__ = "questionnaire_versions"
+    __table_args__ = (
+        UniqueConstraint("questionnaire_id", "version", name="uq_questionnaire_versions_questionnaire_version"),
+    )
+    content_hash: str = Field(sa_column=Column(String, primary_key=True))  # sha256 of the snapshot
+    questionnaire_id: str = Field(
+        sa_column=Column(
+            String,
+            ForeignKey("questionnaires.id", ondelete="CASCADE"),
+            nullable=False,
+        )
+    )
+    version: int = Field(sa_column=Column(Integer, nullable=False))  # 1, 2, ... per questionnaire
+    content: dict = Field(sa_column=Column(JSONB, nullable=False))  # The snapshot itself
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False),
+    )
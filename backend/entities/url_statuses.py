@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlmodel import Field, SQLModel
+
+
+class UrlStatus(SQLModel, table=True):
+    """
+    UrlStatus model caching the outcome of checking a resource link.
+    Lets plans that cite the same book or course skip re-checking it until the entry expires.
+    """
+
+    __tablename__ = "url_statuses"
+    url: str = Field(sa_column=Column(String, primary_key=True))  # Sanitized URL that was checked
+    ok: bool = Field(sa_column=Column(Boolean, nullable=False))
+    final_url: str | None = Field(
+        default=None, sa_column=Column(String, nullable=True)
+    )  # URL after following redirects
+    status_code: int | None = Field(
+        default=None, sa_column=Column(Integer, nullable=True)
+    )  # None when the request itself failed (timeout, DNS, TLS...)
+    checked_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False),
+    )
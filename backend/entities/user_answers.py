@@ -2,7 +2,16 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import uuid4
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
@@ -16,6 +25,10 @@ class UserAnswer(SQLModel, table=True):
     """
 
     __tablename__ = "user_answers"
+    __table_args__ = (
+        # Latest/recent/completed lookups filter on user and questionnaire, newest completion first
+        Index("ix_user_answers_user_questionnaire_completed_at", "user_id", "questionnaire_id", "completed_at"),
+    )
     id: str = Field(default_factory=lambda: uuid4().hex, primary_key=True, index=True)
     user_id: str = Field(
         sa_column=Column(ForeignKey("users.id"), nullable=False)
@@ -23,6 +36,10 @@ class UserAnswer(SQLModel, table=True):
     questionnaire_id: str = Field(
         sa_column=Column(ForeignKey("questionnaires.id"), nullable=False)
     )  # The ID of the questionnaire being answered
+    questionnaire_version_id: Optional[str] = Field(
+        default=None,
+        sa_column=Column(ForeignKey("questionnaire_versions.content_hash"), nullable=True),
+    )  # Content hash of the published questionnaire version answered; None for records that predate versions
     answers: dict[str, str] = Field(
         sa_column=Column(JSONB, nullable=False, default=dict)
     )  # List of answers provided by the user
@@ -38,6 +55,18 @@ class UserAnswer(SQLModel, table=True):
         default=None,
         sa_column=Column(DateTime(timezone=True), default=None, nullable=True),
     )  # Optional completion date if the questionnaire is completed
+    revision: int = Field(
+        default=0,
+        sa_column=Column(Integer, nullable=False, default=0, server_default="0"),
+    )  # Incremented by every update; clients send it back to detect stale writes
+    autosave_seq: int = Field(
+        default=0,
+        sa_column=Column(BigInteger, nullable=False, default=0, server_default="0"),
+    )  # Highest client sequence number applied by the batched autosave endpoint, from any client
+    autosave_seqs: dict = Field(
+        default_factory=dict,
+        sa_column=Column(JSONB, nullable=False, default=dict, server_default="{}"),
+    )  # Client ID -> highest sequence number applied from that client (tab)
 
     
 
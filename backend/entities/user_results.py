@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+
+class UserResult(SQLModel, table=True):
+    """
+    UserResult model storing the competency scores of a completed UserAnswer record.
+    Rows are written once when the record is completed and served directly on reads.
+    """
+
+    __tablename__ = "user_results"
+    user_answers_record_id: str = Field(
+        sa_column=Column(
+            String,
+            ForeignKey("user_answers.id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    user_id: str = Field(
+        sa_column=Column(String, ForeignKey("users.id"), nullable=False)
+    )
+    questionnaire_id: str = Field(
+        sa_column=Column(String, ForeignKey("questionnaires.id"), nullable=False)
+    )
+    results: dict[str, float] = Field(
+        sa_column=Column(JSONB, nullable=False, default=dict)
+    )  # Mapping of competency -> percentage (0-100)
+    is_stale: bool = Field(
+        default=False, sa_column=Column(Boolean, nullable=False, default=False)
+    )  # Set when scoring content changed after the scores were computed
+    industry: str | None = Field(
+        default=None, sa_column=Column(String, nullable=True)
+    )  # Cohort snapshot of the user's industry at completion
+    role: str | None = Field(
+        default=None, sa_column=Column(String, nullable=True)
+    )  # Cohort snapshot of the user's role at completion
+    experience_band: str | None = Field(
+        default=None, sa_column=Column(String, nullable=True)
+    )  # Cohort snapshot of the user's experience band at completion
+    completed_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )  # Completion date of the underlying UserAnswer record
+    computed_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False),
+    )
@@ -1,9 +1,10 @@
 import logging
 
 from fastapi import APIRouter, Depends, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from database.core import get_session
+from database.core import get_async_session
+from database.replicas import get_async_read_session
 from entities.users import User
 
 from .models import AnswerCreate, AnswerRead, AnswerUpdate
@@ -20,45 +21,45 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/answers", tags=["answers"])
 
 @router.post("/", response_model=AnswerRead, summary="Create Answer")
-def create_answer(answer: AnswerCreate, session: Session = Depends(get_session)) -> AnswerRead:
+async def create_answer(answer: AnswerCreate, session: AsyncSession = Depends(get_async_session)) -> AnswerRead:
     """
     Create a new answer in the system.
     """
-    return service_create_answer(answer, session)
+    return await service_create_answer(answer, session)
 
 
 @router.get("/{answer_id}", response_model=AnswerRead, summary="Get Answer by ID")
-def get_answer(answer_id: str, session: Session = Depends(get_session)) -> AnswerRead:
+async def get_answer(answer_id: str, session: AsyncSession = Depends(get_async_read_session)) -> AnswerRead:
     """
     Retrieve an answer by its ID.
     """
-    return service_get_answer_by_id(answer_id, session)
+    return await service_get_answer_by_id(answer_id, session)
 
 
 @router.patch("/{answer_id}", response_model=AnswerRead, summary="Update Answer")
-def update_answer(
-    answer_update: AnswerUpdate, answer_id: str, session: Session = Depends(get_session)
+async def update_answer(
+    answer_update: AnswerUpdate, answer_id: str, session: AsyncSession = Depends(get_async_session)
 ) -> AnswerRead:
     """
     Update an existing answer's information.
     """
-    return service_update_answer(answer_update, answer_id, session) 
+    return await service_update_answer(answer_update, answer_id, session) 
 
 
 @router.delete("/{answer_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete Answer")
-def delete_answer(answer_id: str, session: Session = Depends(get_session)):
+async def delete_answer(answer_id: str, session: AsyncSession = Depends(get_async_session)):
     """
     Delete an answer by its ID.
     """
-    return service_delete_answer(answer_id, session)
+    return await service_delete_answer(answer_id, session)
 
 
 @router.get("/list/{question_id}", response_model=list[AnswerRead], summary="List Answers")
-def list_answers(question_id: str, session: Session = Depends(get_session)) -> list[AnswerRead]:
+async def list_answers(question_id: str, session: AsyncSession = Depends(get_async_read_session)) -> list[AnswerRead]:
     """
     List all answers for a specific question.
     """
-    return service_list_answers(question_id, session)
+    return await service_list_answers(question_id, session)
      
 
     
\ No newline at end of file
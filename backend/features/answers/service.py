@@ -2,16 +2,19 @@ import logging
 
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from entities.answers import Answer
+from features.results.answer_key import invalidate_answer_key
+from features.results.scoring import mark_user_results_stale
 
 from .models import AnswerCreate, AnswerRead, AnswerUpdate
 
 logger = logging.getLogger(__name__)
 
 
-def create_answer(answer: AnswerCreate, session: Session) -> AnswerRead:
+async def create_answer(answer: AnswerCreate, session: AsyncSession) -> AnswerRead:
     """
     Create a new answer in the system.
     """
@@ -21,18 +24,20 @@ def create_answer(answer: AnswerCreate, session: Session) -> AnswerRead:
         score_value=answer.score_value
     )
     session.add(new_answer)
-    session.commit()
-    session.refresh(new_answer)
+    await session.run_sync(lambda sync_session: mark_user_results_stale(sync_session, [answer.question_id]))
+    await session.commit()
+    invalidate_answer_key()
+    await session.refresh(new_answer)
     logger.info(f"Answer created: {new_answer.id}")
     return AnswerRead.model_validate(new_answer)
 
 
-def get_answer_by_id(answer_id: str, session: Session) -> AnswerRead:
+async def get_answer_by_id(answer_id: str, session: AsyncSession) -> AnswerRead:
     """
     Retrieve an answer by its ID.
     """
     statement = select(Answer).where(Answer.id == answer_id)
-    answer = session.exec(statement).first()
+    answer = (await session.exec(statement)).first()
     if not answer:
         logger.error(f"Answer with ID {answer_id} not found")
         raise HTTPException(status_code=404, detail="Answer not found")
@@ -40,12 +45,12 @@ def get_answer_by_id(answer_id: str, session: Session) -> AnswerRead:
     return AnswerRead.model_validate(answer)
 
 
-def update_answer(answer_update: AnswerUpdate, answer_id: str, session: Session) -> AnswerRead:
+async def update_answer(answer_update: AnswerUpdate, answer_id: str, session: AsyncSession) -> AnswerRead:
     """
     Update an existing answer's information.
     """
     statement = select(Answer).where(Answer.id == answer_id)
-    answer = session.exec(statement).first()
+    answer = (await session.exec(statement)).first()
     
     if not answer:
         logger.error(f"Answer with ID {answer_id} not found")
@@ -55,35 +60,39 @@ def update_answer(answer_update: AnswerUpdate, answer_id: str, session: Session)
         setattr(answer, key, value)
     
     session.add(answer)
-    session.commit()
-    session.refresh(answer)
+    await session.run_sync(lambda sync_session: mark_user_results_stale(sync_session, [answer.question_id]))
+    await session.commit()
+    invalidate_answer_key()
+    await session.refresh(answer)
     logger.info(f"Answer updated: {answer.id}")
     return AnswerRead.model_validate(answer)
 
 
-def delete_answer(answer_id: str, session: Session):
+async def delete_answer(answer_id: str, session: AsyncSession):
     """
     Delete an answer by its ID.
     """
     statement = select(Answer).where(Answer.id == answer_id)
-    answer = session.exec(statement).first()
+    answer = (await session.exec(statement)).first()
     
     if not answer:
         logger.error(f"Answer with ID {answer_id} not found")
         raise HTTPException(status_code=404, detail="Answer not found")
     
-    session.delete(answer)
-    session.commit()
+    await session.delete(answer)
+    await session.run_sync(lambda sync_session: mark_user_results_stale(sync_session, [answer.question_id]))
+    await session.commit()
+    invalidate_answer_key()
     logger.info(f"Answer deleted: {answer.id}")
     return {"detail": "Answer deleted successfully"}
 
 
-def list_answers(question_id: str, session: Session) -> list[AnswerRead]:
+async def list_answers(question_id: str, session: AsyncSession) -> list[AnswerRead]:
     """
     List all answers for a specific question.
     """
     statement = select(Answer).where(Answer.question_id == question_id)
-    answers = session.exec(statement).all()
+    answers = (await session.exec(statement)).all()
     
     if not answers:
         logger.warning(f"No answers found for question ID {question_id}")
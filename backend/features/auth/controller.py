@@ -15,10 +15,10 @@ secure token storage, preventing XSS attacks while maintaining usability.
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config import settings
-from database.core import get_session
+from database.core import get_async_session
 from entities import User
 
 from ..users.models import UserCreate
@@ -62,16 +62,16 @@ def _create_auth_response(content: dict, token: str) -> JSONResponse:
 
 
 @router.post("/signup")
-def signup(
+async def signup(
     user_in: UserCreate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """
     Register a new user and create an authentication session.
     This endpoint creates a new user account and immediately generates
     a session token for the user, allowing them to be logged in right after registration.
     """
-    user_read = create_user_account(user_in, session)  # returns UserRead
+    user_read = await create_user_account(user_in, session)  # returns UserRead
     access_token = create_session_token(user_read.id)
 
     return _create_auth_response(
@@ -84,15 +84,15 @@ def signup(
 
 
 @router.post("/login")
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ):
     """
     Authenticate user and create session token.
     """
     # Authenticate user
-    user = authenticate_user(form_data.username, form_data.password, session)
+    user = await authenticate_user(form_data.username, form_data.password, session)
 
     # Create session token
     access_token = create_session_token(user.id)
@@ -105,7 +105,7 @@ def login(
 
 
 @router.post("/refresh")
-def refresh_session(
+async def refresh_session(
     current_user: User = Depends(get_current_user),
 ):
     """
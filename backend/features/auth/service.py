@@ -15,24 +15,38 @@ Security considerations:
 - Race conditions handled during user registration
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from fastapi import Cookie, Depends, Header, HTTPException, status
 from jose import ExpiredSignatureError, JWTError, jwt
+from sqlalchemy import update
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config import settings
-from database.core import get_session
+from database.core import async_engine
+from database.replicas import get_async_read_session
 from entities import User
-from utils.security import get_password_hash, verify_password
+from utils.password_pool import check_password_and_update, hash_password
 
 from ..users.models import UserCreate, UserRead
+from .user_cache import (
+    cache_user,
+    get_cached_user,
+    invalidate_cached_user,
+    publish_user_invalidation,
+    user_cache_version,
+)
 
 logger = logging.getLogger(__name__)
 
+# Rehash tasks in flight; the event loop only keeps weak references to tasks
+_rehash_tasks: set[asyncio.Task] = set()
+
 
 def create_access_token(subject: str, expires_delta: timedelta) -> str:
     """
@@ -56,7 +70,7 @@ def create_access_token(subject: str, expires_delta: timedelta) -> str:
     return token
 
 
-def create_user_account(user_in: UserCreate, session: Session) -> UserRead:
+async def create_user_account(user_in: UserCreate, session: AsyncSession) -> UserRead:
     """
     Create a new user account with hashed password.
 
@@ -72,19 +86,22 @@ def create_user_account(user_in: UserCreate, session: Session) -> UserRead:
     """
     print("We are in create_user_account")
     # Check if email already exists to prevent duplicates
-    existing = session.exec(select(User).where(User.email == user_in.email)).first()
+    existing = (
+        await session.exec(select(User).where(User.email == user_in.email))
+    ).first()
 
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
-    # Create user with hashed password for security
+    # Create user with hashed password for security; bcrypt runs in the password pool
+    hashed_password = await hash_password(user_in.password)
     user = User(
         first_name=user_in.first_name,
         last_name=user_in.last_name,
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         role=user_in.role,
         industry=user_in.industry,
         years_experience=user_in.years_experience
@@ -92,11 +109,11 @@ def create_user_account(user_in: UserCreate, session: Session) -> UserRead:
 
     session.add(user)
     try:
-        session.commit()
-        session.refresh(user)  # Get the generated ID
+        await session.commit()
+        await session.refresh(user)  # Get the generated ID
     except IntegrityError:
         # Handle race condition where email was registered between our check and insert
-        session.rollback()
+        await session.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
@@ -105,7 +122,7 @@ def create_user_account(user_in: UserCreate, session: Session) -> UserRead:
     return UserRead.model_validate(user)
 
 
-def authenticate_user(email: str, password: str, session: Session) -> UserRead:
+async def authenticate_user(email: str, password: str, session: AsyncSession) -> UserRead:
     """
     Authenticate user by verifying email and password.
 
@@ -118,19 +135,52 @@ def authenticate_user(email: str, password: str, session: Session) -> UserRead:
         UserRead model with authenticated user data
 
     Raises:
-        HTTPException: If credentials are invalid
+        HTTPException: If credentials are invalid, 503 if password checks are saturated
     """
-    user = session.exec(select(User).where(User.email == email)).first()
+    user = (await session.exec(select(User).where(User.email == email))).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
+        )
 
-    if not user or not verify_password(password, user.hashed_password):
+    verified, new_hash = await check_password_and_update(password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials"
         )
 
+    if new_hash:
+        # The stored hash uses a deprecated scheme or cost; upgrade it after responding
+        task = asyncio.create_task(_store_rehashed_password(user.id, user.hashed_password, new_hash))
+        _rehash_tasks.add(task)
+        task.add_done_callback(_rehash_tasks.discard)
+
     logger.info(f"User {user.id} authenticated successfully")
     return UserRead.model_validate(user)
 
 
+async def _store_rehashed_password(user_id: str, old_hash: str, new_hash: str) -> None:
+    """
+    Replace a user's outdated password hash, unless it changed since it was verified.
+    """
+    try:
+        async with AsyncSession(async_engine) as session:
+            result = await session.execute(
+                update(User)
+                .where(User.id == user_id, User.hashed_password == old_hash)
+                .values(hashed_password=new_hash)
+            )
+            if result.rowcount:
+                await publish_user_invalidation(session, user_id)
+            await session.commit()
+        if result.rowcount:
+            invalidate_cached_user(user_id)
+            logger.info(f"Upgraded password hash of user {user_id}")
+    except Exception as e:
+        # The old hash still verifies; the upgrade is retried on the next login
+        logger.warning(f"Could not upgrade password hash of user {user_id}: {e}")
+
+
 def create_session_token(user_id: str) -> str:
     """
     Create a new session token for authenticated user.
@@ -204,16 +254,18 @@ def get_token_from_cookie_or_header(
     )
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(get_token_from_cookie_or_header),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_read_session),
 ) -> User:
     """
     Validate token and retrieve authenticated user.
 
     This dependency is injected into protected endpoints to ensure
     only authenticated users can access them. Validates token signature,
-    expiration, and user existence.
+    expiration, and user existence. Recently authenticated tokens are served
+    from the user cache without decoding or querying (see `user_cache`); the
+    returned User may then be detached, so reload it before writing to it.
 
     Args:
         token: JWT token from cookie or header
@@ -225,6 +277,10 @@ def get_current_user(
     Raises:
         HTTPException: 401 for any authentication failure
     """
+    cached = get_cached_user(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = jwt.decode(
             token,
@@ -245,12 +301,14 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
 
-    user = session.get(User, user_id)
+    cache_version = user_cache_version()
+    user = await session.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
         )
 
+    cache_user(token, user, cache_version, payload.get("exp"))
     return user
 
 
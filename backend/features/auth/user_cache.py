@@ -0,0 +1,207 @@
+"""
+In-process cache of authenticated users, keyed by access token.
+
+`get_current_user` serves hot sessions from here instead of decoding the JWT
+and loading the user on every request. An entry lives for
+`AUTH_USER_CACHE_TTL_SECONDS` at most, never past the token's own expiry, and
+the least recently used one is evicted beyond `AUTH_USER_CACHE_MAX_ENTRIES`.
+Cached users are detached snapshots: every hit returns a new `User` instance,
+so requests never share (or write through) one object.
+
+Invalidation: code that changes or deletes a user calls
+`publish_user_invalidation` in its transaction and `invalidate_cached_user`
+after committing. The former sends a Postgres NOTIFY, delivered on commit to
+the listener thread of every API process (`start_user_cache_listener`), which
+drops that user's entries; if the listener loses its connection it clears the
+whole cache, since notifications may have been missed. The TTL bounds
+staleness should the listener be disabled.
+"""
+
+import logging
+import select
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config import settings
+from entities.users import User
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "user_cache_invalidation"
+_LISTEN_POLL_SECONDS = 5.0
+
+
+_lock = threading.Lock()
+# token -> (expires at (monotonic), user id, column snapshot)
+_entries: "OrderedDict[str, tuple[float, str, dict]]" = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+_version = 0  # Bumped by every invalidation
+
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+
+
+def _enabled() -> bool:
+    return settings.AUTH_USER_CACHE_TTL_SECONDS > 0 and settings.AUTH_USER_CACHE_MAX_ENTRIES > 0
+
+
+def get_cached_user(token: str) -> User | None:
+    """
+    Return a fresh User built from the entry cached for `token`, or None.
+    """
+    if not _enabled():
+        return None
+    with _lock:
+        entry = _entries.get(token)
+        if entry is not None and time.monotonic() >= entry[0]:
+            del _entries[token]
+            entry = None
+        if entry is None:
+            _stats["misses"] += 1
+            return None
+        _entries.move_to_end(token)
+        _stats["hits"] += 1
+    return User(**entry[2])
+
+
+def user_cache_version() -> int:
+    """
+    Return the invalidation counter; read it before loading a user to pass to `cache_user`.
+    """
+    return _version
+
+
+def cache_user(token: str, user: User, loaded_at_version: int, token_expires_at: float | None = None) -> None:
+    """
+    Cache a snapshot of `user` for `token`. `token_expires_at` is the token's
+    `exp` claim (Unix time); the entry never outlives it. Nothing is cached if
+    an invalidation happened since `loaded_at_version`, as `user` may predate it.
+    """
+    if not _enabled():
+        return
+    ttl = settings.AUTH_USER_CACHE_TTL_SECONDS
+    if token_expires_at is not None:
+        ttl = min(ttl, token_expires_at - time.time())
+    if ttl <= 0:
+        return
+    snapshot = {column: getattr(user, column) for column in User.__table__.columns.keys()}
+    with _lock:
+        if _version != loaded_at_version:
+            return
+        _entries[token] = (time.monotonic() + ttl, user.id, snapshot)
+        _entries.move_to_end(token)
+        while len(_entries) > settings.AUTH_USER_CACHE_MAX_ENTRIES:
+            _entries.popitem(last=False)
+            _stats["evictions"] += 1
+
+
+def invalidate_cached_user(user_id: str) -> None:
+    """
+    Drop every cached token of a user in this process.
+    """
+    global _version
+    with _lock:
+        _version += 1
+        tokens = [token for token, entry in _entries.items() if entry[1] == user_id]
+        for token in tokens:
+            del _entries[token]
+        _stats["invalidations"] += 1
+
+
+def clear_user_cache() -> None:
+    """
+    Drop every cached user in this process.
+    """
+    global _version
+    with _lock:
+        _version += 1
+        _entries.clear()
+
+
+async def publish_user_invalidation(session: AsyncSession, user_id: str) -> None:
+    """
+    Tell every API process to drop `user_id` from its cache once the session's
+    transaction commits (nothing is sent if it rolls back).
+    """
+    await session.exec(
+        text("SELECT pg_notify(:channel, :user_id)").bindparams(
+            channel=INVALIDATION_CHANNEL, user_id=user_id
+        )
+    )
+
+
+def get_user_cache_stats() -> dict[str, float]:
+    """
+    Return cache counters, the current size and the hit rate.
+    """
+    with _lock:
+        stats: dict[str, float] = dict(_stats)
+        stats["size"] = len(_entries)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def _listen_once(engine) -> None:
+    connection = engine.raw_connection()
+    try:
+        dbapi_connection = connection.driver_connection
+        dbapi_connection.autocommit = True
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {INVALIDATION_CHANNEL}")
+        # Entries cached before LISTEN took effect may have missed a notification
+        clear_user_cache()
+        logger.info(f"Listening for user cache invalidations on {INVALIDATION_CHANNEL}")
+        while not _stop.is_set():
+            readable, _, _ = select.select([dbapi_connection], [], [], _LISTEN_POLL_SECONDS)
+            if not readable:
+                continue
+            dbapi_connection.poll()
+            while dbapi_connection.notifies:
+                notification = dbapi_connection.notifies.pop(0)
+                invalidate_cached_user(notification.payload)
+    finally:
+        connection.close()
+
+
+def _listen_loop() -> None:
+    # A dedicated connection, outside the request pools
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    while not _stop.is_set():
+        try:
+            _listen_once(engine)
+        except Exception as e:
+            logger.warning(f"User cache invalidation listener failed, clearing the cache: {e}")
+            clear_user_cache()
+            _stop.wait(_LISTEN_POLL_SECONDS)
+    engine.dispose()
+
+
+def start_user_cache_listener() -> None:
+    """
+    Start the background thread applying invalidations published by other processes.
+    """
+    global _thread
+    if _thread is not None or not _enabled() or not settings.AUTH_USER_CACHE_LISTEN:
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_listen_loop, name="user-cache-listener", daemon=True)
+    _thread.start()
+
+
+def stop_user_cache_listener(timeout: float = 5.0) -> None:
+    """
+    Stop the invalidation listener thread.
+    """
+    global _thread
+    if _thread is None:
+        return
+    _stop.set()
+    _thread.join(timeout)
+    _thread = None
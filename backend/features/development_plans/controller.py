@@ -1,36 +1,58 @@
 import logging
+import math
 from io import BytesIO
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
 from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 
+from config import settings
 from database.core import get_session
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from database.replicas import get_read_session
 from entities.development_plans import DevelopmentPlan
 from entities.users import User
 from features.auth.service import get_current_user
 
+from .jobs import (
+    ACTIVE_JOB_STATUSES,
+    enqueue_plan_generation as service_enqueue_plan_generation,
+    get_plan_generation_job as service_get_plan_generation_job,
+)
 from .models import (
     DevelopmentPlanCreate,
     DevelopmentPlanRead,
-    DevelopmentPlanSummaryRead,
+    DevelopmentPlanSummaryPage,
     GeneratePlanRequest,
     GeneratePlanResponse,
+    PlanGenerationJobRead,
 )
 from .service import (
+    build_plan_user_context as service_build_plan_user_context,
     create_development_plan as service_create_development_plan,
     delete_development_plan as service_delete_development_plan,
-    generate_development_plan_from_ai as service_generate_plan,
     get_development_plan_by_id as service_get_development_plan_by_id,
     get_development_plan_for_user_answers as service_get_development_plan_for_user_answers,
     get_development_plan_pdf_for_user_answers as service_get_development_plan_pdf_for_user_answers,
     list_development_plans_for_user as service_list_plans_for_user,
+    stream_development_plan_from_ai as service_stream_plan,
 )
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/devplans", tags=["development_plans"])
 
+# PDFs are private; let the browser keep a copy but revalidate it via ETag
+PDF_CACHE_CONTROL = "private, no-cache"
+
 @router.post("/", response_model=DevelopmentPlanRead, summary="Create Development Plan")
 def create_development_plan(
     development_plan: DevelopmentPlanCreate,
@@ -53,7 +75,7 @@ def create_development_plan(
 def get_development_plan(
     development_plan_id: str,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
 ) -> DevelopmentPlanRead:
     """Retrieve a Development Plan by its ID for the authenticated user."""
     plan = service_get_development_plan_by_id(development_plan_id, session)
@@ -93,13 +115,80 @@ def delete_development_plan(
     return None
 
 
-@router.post("/generate", response_model=GeneratePlanResponse, summary="Generate a Development Plan using AI")
+@router.post(
+    "/generate",
+    response_model=PlanGenerationJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue AI generation of a Development Plan",
+)
 def generate_development_plan(
     payload: GeneratePlanRequest,
+    response: Response,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
-) -> GeneratePlanResponse:
-    return service_generate_plan(payload, current_user, session)
+) -> PlanGenerationJobRead:
+    """Queue plan generation; poll the returned job until it succeeded or failed."""
+    job = service_enqueue_plan_generation(payload, current_user, session)
+    response.headers["Location"] = f"{router.prefix}/jobs/{job.id}"
+    response.headers["Retry-After"] = str(math.ceil(settings.PLAN_GENERATION_POLL_SECONDS))
+    return job
+
+
+@router.get(
+    "/generate/stream",
+    response_class=StreamingResponse,
+    summary="Generate a Development Plan using AI, streaming its markdown over Server-Sent Events",
+)
+def stream_development_plan(
+    user_answers_record_id: str,
+    duration_days: int,
+    role: str,
+    industry: str,
+    years_experience: int,
+    focus_areas: list[str] = Query(...),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> StreamingResponse:
+    """
+    Stream `delta` events with plan markdown as the model writes it, then a `done` event
+    with the saved plan (same shape as the generate job result), or an `error` event.
+    """
+    payload = GeneratePlanRequest(
+        user_id=current_user.id,
+        user_answers_record_id=user_answers_record_id,
+        focus_areas=focus_areas,
+        duration_days=duration_days,
+        role=role,
+        industry=industry,
+        years_experience=years_experience,
+    )
+    user_context = service_build_plan_user_context(payload, current_user, session)
+    headers = {
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # Stop reverse proxies from buffering the stream
+    }
+    return StreamingResponse(
+        service_stream_plan(payload, user_context),
+        media_type="text/event-stream",
+        headers=headers,
+    )
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=PlanGenerationJobRead,
+    summary="Get the status of a plan generation job",
+)
+def get_plan_generation_job(
+    job_id: str,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+) -> PlanGenerationJobRead:
+    job = service_get_plan_generation_job(job_id, current_user, session)
+    if job.status in ACTIVE_JOB_STATUSES:
+        response.headers["Retry-After"] = str(math.ceil(settings.PLAN_GENERATION_POLL_SECONDS))
+    return job
 
 
 @router.get(
@@ -110,7 +199,7 @@ def generate_development_plan(
 def get_plan_for_user_answers(
     user_answers_record_id: str,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
 ) -> GeneratePlanResponse:
     return service_get_development_plan_for_user_answers(
         user_answers_record_id, current_user, session
@@ -124,25 +213,38 @@ def get_plan_for_user_answers(
 )
 def download_plan_pdf(
     user_answers_record_id: str,
+    if_none_match: str | None = Header(None),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
-) -> StreamingResponse:
-    pdf_bytes, filename = service_get_development_plan_pdf_for_user_answers(
-        user_answers_record_id, current_user, session
+) -> Response:
+    """
+    Stream the stored PDF rendering. Supports conditional GET through the ETag /
+    If-None-Match headers.
+    """
+    cached_etags = [tag.strip() for tag in if_none_match.split(",")] if if_none_match else None
+    pdf_bytes, filename, etag = service_get_development_plan_pdf_for_user_answers(
+        user_answers_record_id, current_user, session, cached_etags
     )
     headers = {
-        "Content-Disposition": f'attachment; filename="{filename}"',
+        "ETag": etag,
+        "Cache-Control": PDF_CACHE_CONTROL,
     }
+    if pdf_bytes is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    headers["Content-Length"] = str(len(pdf_bytes))
     return StreamingResponse(BytesIO(pdf_bytes), media_type="application/pdf", headers=headers)
 
 
 @router.get(
     "/",
-    response_model=list[DevelopmentPlanSummaryRead],
+    response_model=DevelopmentPlanSummaryPage,
     summary="List development plans for the authenticated user",
 )
 def list_user_development_plans(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
-) -> list[DevelopmentPlanSummaryRead]:
-    return service_list_plans_for_user(current_user, session)
+    session: Session = Depends(get_read_session),
+) -> DevelopmentPlanSummaryPage:
+    return service_list_plans_for_user(current_user, session, limit=limit, cursor=cursor)
@@ -0,0 +1,312 @@
+"""
+Background queue for AI development plan generation.
+
+`POST /devplans/generate` only stores a `plan_generation_jobs` row and returns
+its id; worker threads claim queued jobs, call the LLM without holding a
+database connection, and save the plan. Because the queue is the table, jobs
+queued or running when a process stops are picked up again after a restart:
+queued jobs as-is, running jobs once their lease expires.
+
+Claims take a transaction-scoped advisory lock and count running jobs, so at
+most `PLAN_GENERATION_MAX_CONCURRENCY` generations (and OpenAI calls) run at
+once across every process, whatever the number of worker threads.
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, or_
+from sqlmodel import Session, select, text
+
+from config import settings
+from database.core import engine
+from entities.plan_generation_jobs import PlanGenerationJob
+from entities.users import User
+from features.results.service import get_user_results_by_record_id
+
+from .models import (
+    GeneratePlanRequest,
+    GeneratePlanResponse,
+    PlanGenerationJobRead,
+)
+from .service import (
+    build_plan_user_context,
+    get_development_plan_by_id,
+    request_generated_plan,
+    save_generated_plan,
+)
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+ACTIVE_JOB_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+_CLAIM_LOCK_KEY = 0x706C616E  # Advisory lock serializing job claims across processes
+
+_stop = threading.Event()
+_wake = threading.Event()
+_threads: list[threading.Thread] = []
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _to_read(job: PlanGenerationJob, session: Session) -> PlanGenerationJobRead:
+    job_read = PlanGenerationJobRead.model_validate(job)
+    if job.status == JOB_SUCCEEDED and job.development_plan_id:
+        plan = get_development_plan_by_id(job.development_plan_id, session)
+        job_read.result = GeneratePlanResponse(plan=plan, plan_markdown=plan.plan_markdown)
+    return job_read
+
+
+def enqueue_plan_generation(
+    payload: GeneratePlanRequest,
+    current_user: User,
+    session: Session,
+) -> PlanGenerationJobRead:
+    """
+    Queue a development plan generation for the authenticated user.
+    Returns the already active job for the same user answers record instead of queueing twice.
+    """
+    if payload.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized Access")
+    # Fail fast on unknown or foreign records instead of inside the worker
+    get_user_results_by_record_id(payload.user_answers_record_id, current_user, session)
+
+    statement = select(PlanGenerationJob).where(
+        (PlanGenerationJob.user_id == current_user.id)
+        & (PlanGenerationJob.user_answers_record_id == payload.user_answers_record_id)
+        & (PlanGenerationJob.status.in_(ACTIVE_JOB_STATUSES))
+    )
+    existing = session.exec(statement).first()
+    if existing:
+        logger.info(f"Plan generation job {existing.id} already active for {payload.user_answers_record_id}")
+        return PlanGenerationJobRead.model_validate(existing)
+
+    job = PlanGenerationJob(
+        user_id=current_user.id,
+        user_answers_record_id=payload.user_answers_record_id,
+        request=payload.model_dump(mode="json"),
+    )
+    session.add(job)
+    session.commit()
+    session.refresh(job)
+    _wake.set()
+    logger.info(f"Plan generation job queued: {job.id}")
+    return PlanGenerationJobRead.model_validate(job)
+
+
+def get_plan_generation_job(
+    job_id: str,
+    current_user: User,
+    session: Session,
+) -> PlanGenerationJobRead:
+    """
+    Retrieve a plan generation job of the authenticated user, with the plan once it succeeded.
+    """
+    job = session.get(PlanGenerationJob, job_id)
+    if not job:
+        logger.error(f"Plan generation job with ID {job_id} not found")
+        raise HTTPException(status_code=404, detail="Plan generation job not found")
+    if job.user_id != current_user.id:
+        logger.warning(
+            f"User {current_user.id} attempted to access plan generation job {job_id} belonging to {job.user_id}"
+        )
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized Access")
+    return _to_read(job, session)
+
+
+def _claim_next_job(session: Session) -> tuple[str, int] | None:
+    """
+    Claim the oldest runnable job if the global concurrency cap allows it.
+    Returns (job id, attempt number) and commits the claim.
+    """
+    now = _utcnow()
+    session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _CLAIM_LOCK_KEY})
+    running = session.exec(
+        select(func.count())
+        .select_from(PlanGenerationJob)
+        .where(
+            (PlanGenerationJob.status == JOB_RUNNING)
+            & (PlanGenerationJob.lease_expires_at > now)
+        )
+    ).one()
+    if running >= settings.PLAN_GENERATION_MAX_CONCURRENCY:
+        session.rollback()
+        return None
+
+    statement = (
+        select(PlanGenerationJob)
+        .where(
+            or_(
+                PlanGenerationJob.status == JOB_QUEUED,
+                and_(
+                    PlanGenerationJob.status == JOB_RUNNING,
+                    PlanGenerationJob.lease_expires_at <= now,
+                ),
+            )
+        )
+        .order_by(PlanGenerationJob.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = session.exec(statement).first()
+    if job is None:
+        session.rollback()
+        return None
+
+    if job.attempts >= settings.PLAN_GENERATION_MAX_ATTEMPTS:
+        # Its last worker died mid-generation; do not retry forever
+        job.status = JOB_FAILED
+        job.error = f"Generation did not finish after {job.attempts} attempts"
+        job.finished_at = now
+        job.lease_expires_at = None
+        session.commit()
+        logger.error(f"Plan generation job {job.id} failed: {job.error}")
+        return None
+
+    job.status = JOB_RUNNING
+    job.attempts += 1
+    job.started_at = now
+    job.lease_expires_at = now + timedelta(seconds=settings.PLAN_GENERATION_LEASE_SECONDS)
+    job.error = None
+    claim = (job.id, job.attempts)
+    session.commit()
+    logger.info(f"Plan generation job {claim[0]} claimed (attempt {claim[1]})")
+    return claim
+
+
+def _set_job_outcome(
+    job: PlanGenerationJob,
+    status_: str,
+    development_plan_id: str | None = None,
+    error: str | None = None,
+) -> None:
+    job.status = status_
+    job.error = error
+    job.lease_expires_at = None
+    if development_plan_id:
+        job.development_plan_id = development_plan_id
+    if status_ == JOB_QUEUED:
+        job.started_at = None
+    else:
+        job.finished_at = _utcnow()
+
+
+def _finish_job(
+    job_id: str,
+    attempt: int,
+    session: Session,
+    status_: str,
+    error: str | None = None,
+) -> None:
+    job = session.get(PlanGenerationJob, job_id)
+    if job is None or job.status != JOB_RUNNING or job.attempts != attempt:
+        logger.warning(f"Plan generation job {job_id} is no longer owned by attempt {attempt}")
+        return
+    _set_job_outcome(job, status_, error=error)
+    session.commit()
+
+
+def run_plan_generation_job(job_id: str, attempt: int) -> None:
+    """
+    Generate and save the plan of a claimed job, recording the outcome on the job row.
+    Request errors (HTTPException) fail the job; other errors are retried until
+    PLAN_GENERATION_MAX_ATTEMPTS is reached.
+    """
+    with Session(engine) as session:
+        job = session.get(PlanGenerationJob, job_id)
+        if job is None:
+            return
+        try:
+            payload = GeneratePlanRequest.model_validate(job.request)
+            user = session.get(User, job.user_id)
+            if user is None:
+                raise HTTPException(status_code=404, detail="User not found")
+            user_context = build_plan_user_context(payload, user, session)
+            session.commit()  # Release the connection while the LLM call runs
+
+            generated = request_generated_plan(user_context)
+
+            # Lock the job row so it cannot be reclaimed while the plan is saved, and
+            # mark it succeeded in the plan's transaction: a crash before the commit
+            # leaves neither, and a retry never saves a second plan
+            job = session.get(PlanGenerationJob, job_id, with_for_update=True, populate_existing=True)
+            if job is None or job.status != JOB_RUNNING or job.attempts != attempt:
+                session.rollback()
+                logger.warning(f"Plan generation job {job_id} was reclaimed; dropping attempt {attempt}")
+                return
+            saved = save_generated_plan(
+                payload,
+                generated,
+                session,
+                before_commit=lambda plan: _set_job_outcome(
+                    job, JOB_SUCCEEDED, development_plan_id=plan.id
+                ),
+            )
+        except HTTPException as e:
+            session.rollback()
+            logger.error(f"Plan generation job {job_id} failed: {e.detail}")
+            _finish_job(job_id, attempt, session, JOB_FAILED, error=str(e.detail))
+        except Exception as e:
+            session.rollback()
+            logger.exception(f"Plan generation job {job_id} attempt {attempt} errored")
+            if attempt >= settings.PLAN_GENERATION_MAX_ATTEMPTS:
+                _finish_job(job_id, attempt, session, JOB_FAILED, error=str(e) or type(e).__name__)
+            else:
+                _finish_job(job_id, attempt, session, JOB_QUEUED, error=str(e) or type(e).__name__)
+                _wake.set()
+        else:
+            logger.info(f"Plan generation job {job_id} succeeded: plan {saved.plan.id}")
+
+
+def _worker_loop() -> None:
+    while not _stop.is_set():
+        try:
+            with Session(engine) as session:
+                claim = _claim_next_job(session)
+        except Exception as e:
+            logger.error(f"Failed to claim plan generation job: {e}")
+            claim = None
+        if claim is None:
+            # Sleep until a local enqueue or the poll interval (jobs queued by other processes)
+            _wake.wait(settings.PLAN_GENERATION_POLL_SECONDS)
+            _wake.clear()
+            continue
+        run_plan_generation_job(*claim)
+
+
+def start_plan_generation_workers(worker_count: int | None = None) -> None:
+    """
+    Start the background worker threads of this process (PLAN_GENERATION_WORKERS by default).
+    """
+    count = settings.PLAN_GENERATION_WORKERS if worker_count is None else worker_count
+    if _threads or count <= 0:
+        return
+    _stop.clear()
+    for i in range(count):
+        thread = threading.Thread(
+            target=_worker_loop, name=f"plan-generation-worker-{i}", daemon=True
+        )
+        thread.start()
+        _threads.append(thread)
+    logger.info(f"Started {count} plan generation workers")
+
+
+def stop_plan_generation_workers(timeout: float = 5.0) -> None:
+    """
+    Ask the worker threads to stop after their current job and wait briefly for them.
+    Jobs still running are reclaimed by the next worker once their lease expires.
+    """
+    _stop.set()
+    _wake.set()
+    for thread in _threads:
+        thread.join(timeout)
+    _threads.clear()
+    logger.info("Stopped plan generation workers")
@@ -0,0 +1,208 @@
+"""
+Concurrent, cached verification of resource links in generated plans.
+
+Links are checked on one background asyncio loop that owns a shared `httpx`
+connection pool, so every caller (request threads, plan workers) reuses the
+same connections. A semaphore bounds the number of checks in flight and
+requests to the same host are spaced by `LINK_CHECK_PER_HOST_INTERVAL_SECONDS`.
+Each link gets a HEAD request, falling back to a one-byte ranged GET for
+servers that reject or mishandle HEAD.
+
+Outcomes are stored in `url_statuses`, so links cited by many plans are only
+re-checked after `LINK_CHECK_TTL_SECONDS` (`LINK_CHECK_FAILURE_TTL_SECONDS`
+for failures). A cache that cannot be read or written is skipped, never fatal.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+import httpx
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from config import settings
+from database.core import engine
+from entities.url_statuses import UrlStatus
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (compatible)"
+# HEAD answers that prove the page is missing; final, not retried with GET
+_NOT_FOUND_STATUSES = (404, 410)
+
+
+@dataclass(frozen=True)
+class LinkStatus:
+    ok: bool
+    final_url: str | None = None
+    status_code: int | None = None
+
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+# Only touched from the background loop
+_client: httpx.AsyncClient | None = None
+_semaphore: asyncio.Semaphore | None = None
+_host_locks: dict[str, asyncio.Lock] = {}
+_host_next_at: dict[str, float] = {}
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="link-verifier", daemon=True
+            ).start()
+            _loop = loop
+    return _loop
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client, _semaphore
+    if _client is None:
+        _client = httpx.AsyncClient(
+            headers={"User-Agent": USER_AGENT},
+            timeout=settings.LINK_CHECK_TIMEOUT_SECONDS,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=settings.LINK_CHECK_CONCURRENCY,
+                max_keepalive_connections=settings.LINK_CHECK_CONCURRENCY,
+            ),
+        )
+        _semaphore = asyncio.Semaphore(settings.LINK_CHECK_CONCURRENCY)
+    return _client
+
+
+async def _wait_for_host(host: str) -> None:
+    loop = asyncio.get_running_loop()
+    lock = _host_locks.setdefault(host, asyncio.Lock())
+    async with lock:
+        delay = _host_next_at.get(host, 0.0) - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        _host_next_at[host] = loop.time() + settings.LINK_CHECK_PER_HOST_INTERVAL_SECONDS
+
+
+async def _check_url(url: str) -> LinkStatus:
+    try:
+        return await _probe_url(url)
+    except Exception as e:
+        # Malformed URLs (httpx.InvalidURL) and anything else unexpected fail
+        # this link only, not the whole batch
+        logger.warning(f"Link check failed for {url}: {e!r}")
+        return LinkStatus(False)
+
+
+async def _probe_url(url: str) -> LinkStatus:
+    client = _get_client()
+    host = urlparse(url).netloc.lower()
+    async with _semaphore:  # type: ignore[union-attr]
+        try:
+            await _wait_for_host(host)
+            response = await client.head(url)
+            if response.status_code < 400 or response.status_code in _NOT_FOUND_STATUSES:
+                return LinkStatus(response.status_code < 400, str(response.url), response.status_code)
+        except httpx.TimeoutException:
+            return LinkStatus(False)
+        except httpx.HTTPError:
+            pass  # Some servers drop HEAD requests; try GET
+
+        try:
+            await _wait_for_host(host)
+            async with client.stream("GET", url, headers={"Range": "bytes=0-0"}) as response:
+                # 416: the range is unsatisfiable, but the resource exists
+                ok = response.status_code < 400 or response.status_code == 416
+                return LinkStatus(ok, str(response.url), response.status_code)
+        except httpx.HTTPError:
+            return LinkStatus(False)
+
+
+async def _check_urls(urls: list[str]) -> list[LinkStatus]:
+    return await asyncio.gather(*(_check_url(url) for url in urls))
+
+
+def _load_cached(urls: list[str]) -> dict[str, LinkStatus]:
+    now = datetime.now(timezone.utc)
+    ok_since = now - timedelta(seconds=settings.LINK_CHECK_TTL_SECONDS)
+    failed_since = now - timedelta(seconds=settings.LINK_CHECK_FAILURE_TTL_SECONDS)
+    try:
+        with Session(engine) as session:
+            rows = session.exec(select(UrlStatus).where(UrlStatus.url.in_(urls))).all()
+    except Exception as e:
+        logger.warning(f"URL status cache unavailable: {e}")
+        return {}
+    return {
+        row.url: LinkStatus(row.ok, row.final_url, row.status_code)
+        for row in rows
+        if row.checked_at >= (ok_since if row.ok else failed_since)
+    }
+
+
+def _store(statuses: dict[str, LinkStatus]) -> None:
+    rows = [
+        {
+            "url": url,
+            "ok": status.ok,
+            "final_url": status.final_url,
+            "status_code": status.status_code,
+            "checked_at": datetime.now(timezone.utc),
+        }
+        for url, status in statuses.items()
+    ]
+    table = UrlStatus.__table__
+    stmt = insert(table).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.url],
+        set_={
+            "ok": stmt.excluded.ok,
+            "final_url": stmt.excluded.final_url,
+            "status_code": stmt.excluded.status_code,
+            "checked_at": stmt.excluded.checked_at,
+        },
+    )
+    try:
+        with Session(engine) as session:
+            session.execute(stmt)
+            session.commit()
+    except Exception as e:
+        logger.warning(f"Failed to store URL statuses: {e}")
+
+
+def verify_urls(urls: list[str]) -> dict[str, LinkStatus]:
+    """
+    Check many URLs concurrently, serving recent outcomes from the URL status cache.
+    A URL is valid when it answers 2xx/3xx (after redirects). Blocks the calling thread
+    until every check finished, at most LINK_CHECK_TOTAL_TIMEOUT_SECONDS, so call it from
+    sync code, not from a running event loop. URLs still unchecked by then count as
+    invalid and are not cached.
+    """
+    unique = list(dict.fromkeys(urls))
+    if not unique:
+        return {}
+    statuses = _load_cached(unique)
+    missing = [url for url in unique if url not in statuses]
+    if missing:
+        future = asyncio.run_coroutine_threadsafe(_check_urls(missing), _get_loop())
+        try:
+            checked = dict(
+                zip(missing, future.result(timeout=settings.LINK_CHECK_TOTAL_TIMEOUT_SECONDS))
+            )
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning(f"Link checks of {len(missing)} URLs did not finish in time")
+            statuses.update((url, LinkStatus(False)) for url in missing)
+        else:
+            _store(checked)
+            statuses.update(checked)
+    logger.info(
+        f"Verified {len(unique)} URLs ({len(unique) - len(missing)} from cache, "
+        f"{sum(not statuses[url].ok for url in unique)} invalid)"
+    )
+    return statuses
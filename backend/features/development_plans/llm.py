@@ -0,0 +1,142 @@
+"""
+LLM client selection for development plan generation.
+
+`LLM_PROVIDER=openai` (the default) returns the real OpenAI client.
+`LLM_PROVIDER=fake` returns `FakeLLMClient`, which answers `responses.parse`
+and `responses.stream` calls with a deterministic plan built from the prompt
+context, so generation, the job queue, streaming and everything downstream can
+run offline and without an API key.
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+from fastapi import HTTPException
+
+from config import settings
+
+from .models import GeneratedPlanPayload, Milestone
+
+logger = logging.getLogger(__name__)
+
+_CONTEXT_MARKER = "Context (JSON):\n"
+_FAKE_CHUNK_SIZE = 16
+
+
+def _context_from_input(messages: list[dict[str, str]]) -> dict[str, Any]:
+    for message in reversed(messages):
+        content = message.get("content", "")
+        if message.get("role") == "user" and _CONTEXT_MARKER in content:
+            try:
+                return json.loads(content.split(_CONTEXT_MARKER, 1)[1])
+            except ValueError:
+                break
+    return {}
+
+
+def _fake_plan(context: dict[str, Any]) -> GeneratedPlanPayload:
+    focus_areas = context.get("focus_areas") or ["Leadership"]
+    duration_days = context.get("duration_days") or 90
+    role = context.get("role") or "leader"
+    goal = f"Strengthen {', '.join(focus_areas)} over {duration_days} days"
+    action_items = [f"Practice {area} in one real situation every week" for area in focus_areas]
+    next_steps = [f"Book a 30 minute reflection on {focus_areas[0]} this week"]
+    resources = [f"Book: Leading with {area} — practical exercises" for area in focus_areas]
+    challenges = ["Finding time alongside day-to-day work"]
+    milestones = [
+        Milestone(
+            title=f"{area} module complete",
+            summary=f"Applied {area} with the team",
+            timeframe=f"Weeks {i * 4 + 1}-{i * 4 + 4}",
+            key_actions=[action_items[i]],
+            success_metric="Feedback from two colleagues",
+        )
+        for i, area in enumerate(focus_areas)
+    ]
+    plan_markdown = "\n".join(
+        [
+            "## Overview",
+            "",
+            f"- **Goal:** {goal}",
+            f"- **Role:** {role}",
+            "",
+            "## Action Items",
+            "",
+            *(f"- {item}" for item in action_items),
+            "",
+            "## Resources",
+            "",
+            *(f"- {item}" for item in resources),
+        ]
+    )
+    return GeneratedPlanPayload(
+        goal=goal,
+        description=f"Offline plan for a {role} focusing on {', '.join(focus_areas)}.",
+        action_items=action_items,
+        next_steps=next_steps,
+        resources=resources,
+        challenges=challenges,
+        milestones=milestones,
+        plan_markdown=plan_markdown,
+    )
+
+
+class _FakeStream:
+    def __init__(self, plan: GeneratedPlanPayload) -> None:
+        self._plan = plan
+
+    def __iter__(self) -> Iterator[SimpleNamespace]:
+        text = self._plan.model_dump_json()
+        chunks = [text[i : i + _FAKE_CHUNK_SIZE] for i in range(0, len(text), _FAKE_CHUNK_SIZE)]
+        for chunk in chunks:
+            if settings.FAKE_LLM_LATENCY_SECONDS > 0:
+                time.sleep(settings.FAKE_LLM_LATENCY_SECONDS / len(chunks))
+            yield SimpleNamespace(type="response.output_text.delta", delta=chunk)
+
+    def get_final_response(self) -> SimpleNamespace:
+        return SimpleNamespace(output_parsed=self._plan, output_text=self._plan.model_dump_json())
+
+
+class _FakeResponses:
+    def parse(self, *, input: list[dict[str, str]], text_format: Any = None, **kwargs: Any) -> SimpleNamespace:
+        if settings.FAKE_LLM_LATENCY_SECONDS > 0:
+            time.sleep(settings.FAKE_LLM_LATENCY_SECONDS)
+        plan = _fake_plan(_context_from_input(input))
+        return SimpleNamespace(output_parsed=plan, output_text=plan.model_dump_json())
+
+    @contextmanager
+    def stream(self, *, input: list[dict[str, str]], text_format: Any = None, **kwargs: Any) -> Iterator[_FakeStream]:
+        yield _FakeStream(_fake_plan(_context_from_input(input)))
+
+
+class FakeLLMClient:
+    """
+    Offline stand-in for the OpenAI client exposing the `responses` calls the service uses.
+    """
+
+    def __init__(self) -> None:
+        self.responses = _FakeResponses()
+
+
+def get_llm_client() -> Any:
+    """
+    Return the LLM client for the configured provider.
+    Raises 503 if OpenAI is selected but the SDK is missing or the API key is not configured.
+    """
+    if settings.LLM_PROVIDER == "fake":
+        logger.info("Using the fake LLM client")
+        return FakeLLMClient()
+
+    if not settings.OPENAI_API_KEY:
+        raise HTTPException(status_code=503, detail="OPENAI_API_KEY not configured")
+    try:
+        # Import lazily to avoid hard dependency at startup
+        from openai import OpenAI
+    except Exception:
+        raise HTTPException(status_code=503, detail="OpenAI SDK not installed. Please install 'openai'.")
+
+    return OpenAI(api_key=settings.OPENAI_API_KEY)
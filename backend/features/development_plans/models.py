@@ -88,6 +88,8 @@ class Milestone(BaseModel):
 
 
 class GeneratedPlanPayload(BaseModel):
+    # plan_markdown comes first so streamed structured output starts with displayable text
+    plan_markdown: str
     goal: str
     description: str
     action_items: List[str]
@@ -95,7 +97,6 @@ class GeneratedPlanPayload(BaseModel):
     resources: List[str]
     challenges: List[str]
     milestones: List[Milestone]
-    plan_markdown: str
 
 
 class GeneratePlanResponse(BaseModel):
@@ -109,3 +110,22 @@ class DevelopmentPlanSummaryRead(BaseModel):
     questionnaire_id: str
     questionnaire_title: str
     created_at: datetime
+
+
+class DevelopmentPlanSummaryPage(BaseModel):
+    items: List[DevelopmentPlanSummaryRead]
+    next_cursor: Optional[str] = None  # Pass as `cursor` to fetch the next page; None on the last page
+
+
+class PlanGenerationJobRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: str
+    status: str  # "queued", "running", "succeeded" or "failed"
+    user_answers_record_id: str
+    development_plan_id: Optional[str] = None
+    error: Optional[str] = None
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[GeneratePlanResponse] = None  # Set once the job succeeded
@@ -0,0 +1,98 @@
+"""
+Content-addressed store of rendered development plan PDFs.
+
+A PDF is keyed by a hash of the plan id, its `updated_at`, the PDF template
+version and the name printed on it, so any change to those yields a new key
+and stale renders are never served. The key doubles as the download's ETag.
+
+Renders run on a small thread pool (`PDF_RENDER_WORKERS`) right after a plan
+is created, so downloads usually stream stored bytes instead of running
+WeasyPrint on the request thread.
+"""
+
+import hashlib
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from config import settings
+from entities.development_plan_pdfs import DevelopmentPlanPdf
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.PDF_RENDER_WORKERS), thread_name_prefix="pdf-render"
+)
+
+
+def pdf_cache_key(
+    development_plan_id: str,
+    updated_at: datetime,
+    template_version: str,
+    user_display_name: str,
+) -> str:
+    """
+    Return the content address of a plan PDF rendering.
+    """
+    parts = [development_plan_id, updated_at.isoformat(), template_version, user_display_name]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def load_plan_pdf(key: str, session: Session) -> bytes | None:
+    """
+    Return the stored PDF bytes for a key, if rendered.
+    """
+    return session.exec(
+        select(DevelopmentPlanPdf.content).where(DevelopmentPlanPdf.key == key)
+    ).first()
+
+
+def has_plan_pdf(key: str, session: Session) -> bool:
+    """
+    Return whether a PDF is stored for a key, without loading its bytes.
+    """
+    return session.exec(
+        select(DevelopmentPlanPdf.key).where(DevelopmentPlanPdf.key == key)
+    ).first() is not None
+
+
+def store_plan_pdf(key: str, development_plan_id: str, content: bytes, session: Session) -> None:
+    """
+    Store a rendered PDF and drop older renders of the same plan. Commits.
+    """
+    table = DevelopmentPlanPdf.__table__
+    session.execute(
+        insert(table)
+        .values(
+            key=key,
+            development_plan_id=development_plan_id,
+            content=content,
+            size=len(content),
+        )
+        .on_conflict_do_nothing(index_elements=[table.c.key])
+    )
+    session.execute(
+        delete(table).where(
+            (table.c.development_plan_id == development_plan_id) & (table.c.key != key)
+        )
+    )
+    session.commit()
+    logger.info(f"Stored PDF {key[:12]} for development plan {development_plan_id} ({len(content)} bytes)")
+
+
+def _log_failure(future: Future) -> None:
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Background PDF render failed: {error}")
+
+
+def submit_pdf_render(render: Callable[..., Any], *args: Any) -> None:
+    """
+    Run a PDF render in the background render pool.
+    """
+    _executor.submit(render, *args).add_done_callback(_log_failure)
@@ -0,0 +1,169 @@
+"""
+In-process, content-addressed cache of AI-generated development plans.
+
+A generation is fully determined by the prompt version and the `user_context`
+sent to the model (role, industry, experience, duration, focus areas and
+baseline results), so the canonical JSON hash of both is used as the key.
+Entries expire after `PLAN_CACHE_TTL_SECONDS` and the least recently used one
+is evicted beyond `PLAN_CACHE_MAX_ENTRIES`.
+
+Concurrent misses for the same key are coalesced: the first caller generates,
+the others wait for its result (or its error) instead of calling the model too.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from config import settings
+
+from .models import GeneratedPlanPayload
+
+logger = logging.getLogger(__name__)
+
+
+class _InFlight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: GeneratedPlanPayload | None = None
+        self.error: BaseException | None = None
+
+
+_lock = threading.Lock()
+_entries: "OrderedDict[str, tuple[float, GeneratedPlanPayload]]" = OrderedDict()
+_inflight: dict[str, _InFlight] = {}
+_stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+
+def plan_cache_key(prompt_version: str, user_context: dict[str, Any]) -> str:
+    """
+    Return the canonical sha256 key of a prompt version and user context.
+    """
+    canonical = json.dumps(
+        {"prompt_version": prompt_version, "user_context": user_context},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _lookup(key: str) -> GeneratedPlanPayload | None:
+    # Caller holds _lock
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    stored_at, plan = entry
+    if time.monotonic() - stored_at >= settings.PLAN_CACHE_TTL_SECONDS:
+        del _entries[key]
+        return None
+    _entries.move_to_end(key)
+    return plan
+
+
+def _store(key: str, plan: GeneratedPlanPayload) -> None:
+    # Caller holds _lock
+    _entries[key] = (time.monotonic(), plan)
+    _entries.move_to_end(key)
+    while len(_entries) > settings.PLAN_CACHE_MAX_ENTRIES:
+        _entries.popitem(last=False)
+        _stats["evictions"] += 1
+
+
+def _log_lookup(outcome: str, key: str) -> None:
+    stats = get_plan_cache_stats()
+    logger.info(
+        f"Plan cache {outcome} for {key[:12]} (hit rate {stats['hit_rate']:.0%}, {stats['size']} entries)"
+    )
+
+
+def get_cached_plan(key: str) -> GeneratedPlanPayload | None:
+    """
+    Return the cached plan for a key, counting the lookup as a hit or a miss.
+    """
+    with _lock:
+        plan = _lookup(key)
+        _stats["hits" if plan is not None else "misses"] += 1
+    _log_lookup("hit" if plan is not None else "miss", key)
+    return plan
+
+
+def store_plan(key: str, plan: GeneratedPlanPayload) -> None:
+    """
+    Cache a generated plan under a key.
+    """
+    with _lock:
+        _store(key, plan)
+
+
+def get_or_generate_plan(
+    key: str, generate: Callable[[], GeneratedPlanPayload]
+) -> GeneratedPlanPayload:
+    """
+    Return the cached plan for a key, or call `generate` once and cache its result.
+    Concurrent callers with the same key share that single call; errors are not cached.
+    """
+    with _lock:
+        plan = _lookup(key)
+        if plan is not None:
+            _stats["hits"] += 1
+            outcome = "hit"
+        elif key in _inflight:
+            inflight = _inflight[key]
+            _stats["coalesced"] += 1
+            outcome = "coalesced"
+        else:
+            inflight = _InFlight()
+            _inflight[key] = inflight
+            _stats["misses"] += 1
+            outcome = "miss"
+    _log_lookup(outcome, key)
+    if plan is not None:
+        return plan
+
+    if outcome == "coalesced":
+        inflight.done.wait()
+        if inflight.error is not None:
+            raise inflight.error
+        return inflight.result  # type: ignore[return-value]
+
+    try:
+        plan = generate()
+        inflight.result = plan
+        with _lock:
+            _store(key, plan)
+        return plan
+    except BaseException as e:
+        inflight.error = e
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+        inflight.done.set()
+
+
+def get_plan_cache_stats() -> dict[str, float]:
+    """
+    Return cache counters, the current size and the hit rate (coalesced calls count as hits).
+    """
+    with _lock:
+        stats: dict[str, float] = dict(_stats)
+        stats["size"] = len(_entries)
+        stats["in_flight"] = len(_inflight)
+    served = stats["hits"] + stats["coalesced"]
+    lookups = served + stats["misses"]
+    stats["hit_rate"] = served / lookups if lookups else 0.0
+    return stats
+
+
+def clear_plan_cache() -> None:
+    """
+    Drop every cached plan, e.g. after changing the prompt without bumping its version.
+    """
+    with _lock:
+        _entries.clear()
+    logger.info("Plan cache cleared")
@@ -3,8 +3,7 @@ import json
 import logging
 import re
 from html import escape as html_escape
-from typing import Any, Callable, Optional, Tuple
-from urllib import request as urlrequest
+from typing import Any, Callable, Iterator, Optional, Tuple
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 from fastapi import HTTPException, status
@@ -12,7 +11,8 @@ from openai import OpenAI
 from pydantic import AnyUrl, BaseModel
 from sqlmodel import Session, select
 
-from config import settings
+from database.core import engine
+from database.pagination import DEFAULT_PAGE_SIZE, page_rows, paginate
 
 # from sqlalchemy.exc import IntegrityError
 from entities.development_plans import DevelopmentPlan
@@ -20,15 +20,32 @@ from entities.questionnaires import Questionnaire
 from entities.user_answers import UserAnswer
 from entities.users import User
 from features.results.service import get_user_results_by_record_id
+from metrics import PDF_RENDER_DURATION, record_llm_usage, time_llm_call
 
+from .link_verifier import verify_urls
+from .llm import get_llm_client
 from .models import (
     DevelopmentPlanCreate,
     DevelopmentPlanRead,
+    DevelopmentPlanSummaryPage,
     DevelopmentPlanSummaryRead,
     GeneratedPlanPayload,
     GeneratePlanRequest,
     GeneratePlanResponse,
 )
+from .pdf_store import (
+    has_plan_pdf,
+    load_plan_pdf,
+    pdf_cache_key,
+    store_plan_pdf,
+    submit_pdf_render,
+)
+from .plan_cache import (
+    get_cached_plan,
+    get_or_generate_plan,
+    plan_cache_key,
+    store_plan,
+)
 
 try:
     from markdown import markdown as _md_render
@@ -43,9 +60,14 @@ except ImportError:  # pragma: no cover - optional dependency
 logger = logging.getLogger(__name__)
 
 # def create_assessment(assessment: DevelopmentPlanCreate, session: Session, current_user: User) -> DevelopmentPlanRead:
-def create_development_plan(development_plan: DevelopmentPlanCreate, session: Session) -> DevelopmentPlanRead:
+def create_development_plan(
+    development_plan: DevelopmentPlanCreate,
+    session: Session,
+    before_commit: Optional[Callable[[DevelopmentPlan], None]] = None,
+) -> DevelopmentPlanRead:
     """
     Create a new Development Plan in the database.
+    `before_commit` is called with the flushed plan so related changes commit with it.
     """
     new_development_plan = DevelopmentPlan(
         user_id=development_plan.user_id,
@@ -64,9 +86,13 @@ def create_development_plan(development_plan: DevelopmentPlanCreate, session: Se
         plan_markdown=development_plan.plan_markdown,
     )
     session.add(new_development_plan)
+    if before_commit is not None:
+        session.flush()
+        before_commit(new_development_plan)
     session.commit()
     session.refresh(new_development_plan)
     logger.info(f"Develpment Plan: {new_development_plan.id}")
+    submit_pdf_render(prerender_development_plan_pdf, new_development_plan.id)
     # return new_development_plan
     return DevelopmentPlanRead.model_validate(new_development_plan)
 
@@ -105,16 +131,13 @@ def _format_list(items: list[str]) -> str:
     return "\n".join(f"- {it}" for it in items)
 
 
-def generate_development_plan_from_ai(
+def build_plan_user_context(
     payload: GeneratePlanRequest,
     current_user: User,
     session: Session,
-) -> GeneratePlanResponse:
+) -> dict[str, Any]:
     """
-    Generate a development plan using OpenAI, persist a DevelopmentPlan record, and
-    return the saved plan together with a nicely formatted markdown version.
-
-    Falls back gracefully with 503 if the OpenAI SDK is missing or the API key is not configured.
+    Authorize a generation request and build the context the model is prompted with.
     """
     # Authorization: must be the same user
     if payload.user_id != current_user.id:
@@ -125,17 +148,24 @@ def generate_development_plan_from_ai(
         payload.user_answers_record_id, current_user, session
     )
 
-    # Prepare AI call
-    if not settings.OPENAI_API_KEY:
-        raise HTTPException(status_code=503, detail="OPENAI_API_KEY not configured")
-    try:
-        # Import lazily to avoid hard dependency at startup
-        from openai import OpenAI
-    except Exception:
-        raise HTTPException(status_code=503, detail="OpenAI SDK not installed. Please install 'openai'.")
+    return {
+        "role": payload.role,
+        "industry": payload.industry,
+        "years_experience": payload.years_experience,
+        "duration_days": payload.duration_days,
+        "focus_areas": payload.focus_areas,
+        "baseline_results": results.results,
+    }
 
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
 
+# Part of the plan cache key: bump whenever the prompt, model or output schema changes
+PLAN_PROMPT_VERSION = "1"
+
+
+def _plan_request_args(user_context: dict[str, Any]) -> dict[str, Any]:
+    """
+    Build the Responses API arguments (model, prompt, output format, tools) for a plan.
+    """
     # Build structured system/user prompt
     system_prompt = """
 You are a Top Leadership Development Expert and coach. Create a practical, time-bound leadership development plan that is specific, measurable, and aligned to the user's focus areas, role, industry, and experience level. Include a concrete timeline with measurable milestones and concrete, actionable steps they need to take. Create several progressive modules.
@@ -272,15 +302,6 @@ Example JSON structure:
 }
 """
 
-    user_context = {
-        "role": payload.role,
-        "industry": payload.industry,
-        "years_experience": payload.years_experience,
-        "duration_days": payload.duration_days,
-        "focus_areas": payload.focus_areas,
-        "baseline_results": results.results,
-    }
-
     # We ask the model for structured fields + a plan_markdown for display
     json_schema_hint = {
         "type": "object",
@@ -315,7 +336,7 @@ Example JSON structure:
     
 
     # Responses API with typed parsing; FOR GPT-5 MINI
-    response = client.responses.parse(
+    plan_request_args = dict(
         model="gpt-5-mini",
         input=[{"role": "system", "content": system_prompt}, {"role": "user", "content": input}],
         text_format=GeneratedPlanPayload,
@@ -325,7 +346,6 @@ Example JSON structure:
         max_output_tokens=50000,
         reasoning={"effort": "low"}
     )
-    generated = response.output_parsed  # type: ignore[attr-defined]
 
     # ------------------------------------------------------------------------------
     # ALTERNATIVE: Use GPT-4o Mini with typed parsing if available, else fallback to
@@ -418,13 +438,122 @@ Example JSON structure:
 
 
 
+    return plan_request_args
+
+
+def _parse_generated_plan(user_context: dict[str, Any]) -> GeneratedPlanPayload:
+    client = get_llm_client()
+    with time_llm_call("parse"):
+        response = client.responses.parse(**_plan_request_args(user_context))
+    record_llm_usage("parse", response)
+    return response.output_parsed  # type: ignore[attr-defined]
+
+
+def request_generated_plan(user_context: dict[str, Any]) -> GeneratedPlanPayload:
+    """
+    Ask the configured LLM for a structured development plan, served from the plan cache
+    when the same prompt version and context were generated recently.
+    Does not touch the database, so callers should not hold a session open across it.
+    """
+    key = plan_cache_key(PLAN_PROMPT_VERSION, user_context)
+    return get_or_generate_plan(key, lambda: _parse_generated_plan(user_context))
+
+
+_MARKDOWN_FIELD_RE = re.compile(r'"plan_markdown"\s*:\s*"')
+
+
+class _MarkdownDeltaExtractor:
+    """
+    Incrementally decode the `plan_markdown` string out of streamed structured-output JSON.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._started = False
+        self._done = False
+
+    def feed(self, chunk: str) -> str:
+        """
+        Consume the next JSON text delta and return any newly decoded markdown.
+        """
+        if self._done:
+            return ""
+        self._buffer += chunk
+        if not self._started:
+            match = _MARKDOWN_FIELD_RE.search(self._buffer)
+            if not match:
+                self._buffer = self._buffer[-64:]  # The key may be split across deltas
+                return ""
+            self._started = True
+            self._buffer = self._buffer[match.end():]
+
+        raw = self._buffer
+        i = 0
+        while i < len(raw):
+            char = raw[i]
+            if char == '"':
+                self._done = True
+                break
+            if char != "\\":
+                i += 1
+                continue
+            # Only decode complete escapes; keep surrogate pairs together
+            width = 6 if raw[i + 1 : i + 2] == "u" else 2
+            if raw[i + 1 : i + 2] == "u" and raw[i + 2 : i + 4].lower() in ("d8", "d9", "da", "db"):
+                width = 12
+            if i + width > len(raw):
+                break
+            i += width
+        self._buffer = raw[i:]
+        return json.loads(f'"{raw[:i]}"')
+
+
+def stream_generated_plan(user_context: dict[str, Any]) -> Iterator[tuple[str, Any]]:
+    """
+    Stream a structured development plan from the configured LLM.
+    Yields ("delta", markdown text) as `plan_markdown` tokens arrive, then ("plan", GeneratedPlanPayload).
+    """
+    key = plan_cache_key(PLAN_PROMPT_VERSION, user_context)
+    cached = get_cached_plan(key)
+    if cached is not None:
+        yield "delta", cached.plan_markdown
+        yield "plan", cached
+        return
+
+    client = get_llm_client()
+    extractor = _MarkdownDeltaExtractor()
+    # Covers the time the client spends consuming deltas too
+    with time_llm_call("stream"), client.responses.stream(**_plan_request_args(user_context)) as stream:
+        for event in stream:
+            if event.type == "response.output_text.delta":
+                text = extractor.feed(event.delta)
+                if text:
+                    yield "delta", text
+        response = stream.get_final_response()
+    record_llm_usage("stream", response)
+    generated = response.output_parsed  # type: ignore[attr-defined]
+    if generated is not None:
+        store_plan(key, generated)
+    yield "plan", generated
+
+
+def save_generated_plan(
+    payload: GeneratePlanRequest,
+    generated: GeneratedPlanPayload,
+    session: Session,
+    before_commit: Optional[Callable[[DevelopmentPlan], None]] = None,
+) -> GeneratePlanResponse:
+    """
+    Persist a generated plan as a DevelopmentPlan linked to the request's user answers record.
+    `before_commit` is passed on to `create_development_plan`.
+    """
     # Map to DevelopmentPlan fields
     from datetime import datetime, timedelta, timezone
     start_date = datetime.now(timezone.utc)
     end_date = start_date + timedelta(days=payload.duration_days)
 
     dp_create = DevelopmentPlanCreate(
-        user_id=current_user.id,
+        user_id=payload.user_id,
         user_answers_record_id=payload.user_answers_record_id,
         goal=generated.goal,
         description=generated.description,
@@ -441,11 +570,65 @@ Example JSON structure:
     )
 
     # Return model-generated markdown as-is to avoid replacing links with search pages
-    saved = create_development_plan(dp_create, session)
+    saved = create_development_plan(dp_create, session, before_commit)
     # return GeneratePlanResponse(plan=saved, plan_markdown=generated.plan_markdown)
     return GeneratePlanResponse(plan=saved, plan_markdown=saved.plan_markdown)
 
 
+def _sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_development_plan_from_ai(
+    payload: GeneratePlanRequest,
+    user_context: dict[str, Any],
+) -> Iterator[str]:
+    """
+    Yield Server-Sent Events for a plan generation: `delta` events with markdown text
+    as the model writes it, then `done` with the saved GeneratePlanResponse, or `error`.
+
+    Build `user_context` (and authorize) with `build_plan_user_context` first; the plan is
+    saved in a session of its own so no connection is held while the model streams.
+    """
+    try:
+        generated = None
+        for kind, value in stream_generated_plan(user_context):
+            if kind == "delta":
+                yield _sse_event("delta", {"text": value})
+            else:
+                generated = value
+        if generated is None:
+            raise HTTPException(status_code=502, detail="Model returned no plan")
+        with Session(engine) as session:
+            saved = save_generated_plan(payload, generated, session)
+    except HTTPException as e:
+        logger.error(f"Streaming plan generation failed: {e.detail}")
+        yield _sse_event("error", {"detail": e.detail})
+        return
+    except Exception:
+        logger.exception("Streaming plan generation failed")
+        yield _sse_event("error", {"detail": "Plan generation failed"})
+        return
+    logger.info(f"Streamed development plan saved: {saved.plan.id}")
+    yield _sse_event("done", saved.model_dump(mode="json"))
+
+
+def generate_development_plan_from_ai(
+    payload: GeneratePlanRequest,
+    current_user: User,
+    session: Session,
+) -> GeneratePlanResponse:
+    """
+    Generate a development plan using OpenAI, persist a DevelopmentPlan record, and
+    return the saved plan together with a nicely formatted markdown version.
+
+    Falls back gracefully with 503 if the OpenAI SDK is missing or the API key is not configured.
+    """
+    user_context = build_plan_user_context(payload, current_user, session)
+    generated = request_generated_plan(user_context)
+    return save_generated_plan(payload, generated, session)
+
+
 def get_development_plan_for_user_answers(
     user_answers_record_id: str,
     current_user: User,
@@ -510,6 +693,10 @@ def _format_iso_date(value: Optional[str]) -> str:
         return "—"
 
 
+# Part of the stored PDF key: bump whenever _build_plan_pdf_html output changes
+PDF_TEMPLATE_VERSION = "1"
+
+
 def _build_plan_pdf_html(
     plan: DevelopmentPlanRead,
     plan_markdown: str,
@@ -763,39 +950,87 @@ def _build_plan_pdf_html(
 
 
 
+def _user_display_name(user: User) -> str:
+    return " ".join(part for part in [user.first_name, user.last_name] if part).strip()
+
+
+def _render_plan_pdf(plan: DevelopmentPlanRead, user_display_name: str) -> bytes:
+    _, weasy_html = _require_pdf_dependencies()
+    html = _build_plan_pdf_html(plan, plan.plan_markdown or "", user_display_name)
+    with PDF_RENDER_DURATION.time():
+        return weasy_html(string=html).write_pdf()
+
+
+def prerender_development_plan_pdf(development_plan_id: str) -> None:
+    """
+    Render and store the PDF of a plan ahead of its first download.
+    Runs on the background render pool; skipped when the PDF dependencies are missing.
+    """
+    with Session(engine) as session:
+        plan = session.get(DevelopmentPlan, development_plan_id)
+        user = session.get(User, plan.user_id) if plan else None
+        if plan is None or user is None:
+            return
+        plan_read = DevelopmentPlanRead.model_validate(plan)
+        user_display_name = _user_display_name(user)
+        key = pdf_cache_key(plan_read.id, plan_read.updated_at, PDF_TEMPLATE_VERSION, user_display_name)
+        if has_plan_pdf(key, session):
+            return
+        session.commit()  # Release the connection while rendering
+        try:
+            pdf_bytes = _render_plan_pdf(plan_read, user_display_name)
+        except HTTPException as e:
+            logger.info(f"Skipping PDF pre-render for development plan {development_plan_id}: {e.detail}")
+            return
+        store_plan_pdf(key, plan_read.id, pdf_bytes, session)
+
+
 def get_development_plan_pdf_for_user_answers(
     user_answers_record_id: str,
     current_user: User,
     session: Session,
-) -> Tuple[bytes, str]:
-    _, weasy_html = _require_pdf_dependencies()
+    cached_etags: Optional[list[str]] = None,
+) -> Tuple[Optional[bytes], str, str]:
+    """
+    Return (pdf bytes, filename, ETag) for the plan of a user answers record.
+    Serves the stored rendering when there is one, rendering and storing it otherwise.
+    Bytes are None when the ETag is in `cached_etags` (the client's copy is current).
+    """
     response = get_development_plan_for_user_answers(user_answers_record_id, current_user, session)
     plan = response.plan
-    plan_markdown = response.plan_markdown or plan.plan_markdown or ""
+    filename = f"development-plan-{plan.id}.pdf"
 
-    user_display_name = " ".join(
-        part for part in [current_user.first_name, current_user.last_name] if part
-    ).strip()
+    user_display_name = _user_display_name(current_user)
+    key = pdf_cache_key(plan.id, plan.updated_at, PDF_TEMPLATE_VERSION, user_display_name)
+    etag = f'"{key}"'
+    if cached_etags and etag in cached_etags:
+        return None, filename, etag
 
-    html = _build_plan_pdf_html(plan, plan_markdown, user_display_name)
-    pdf_bytes = weasy_html(string=html).write_pdf()
-    filename = f"development-plan-{plan.id}.pdf"
+    pdf_bytes = load_plan_pdf(key, session)
+    if pdf_bytes is None:
+        logger.info(f"Rendering PDF for development plan {plan.id} on request")
+        pdf_bytes = _render_plan_pdf(plan, user_display_name)
+        store_plan_pdf(key, plan.id, pdf_bytes, session)
 
-    return pdf_bytes, filename
+    return pdf_bytes, filename, etag
 
 
 def list_development_plans_for_user(
     current_user: User,
     session: Session,
-) -> list[DevelopmentPlanSummaryRead]:
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+) -> DevelopmentPlanSummaryPage:
     stmt = (
         select(DevelopmentPlan, UserAnswer, Questionnaire)
         .join(UserAnswer, UserAnswer.id == DevelopmentPlan.user_answers_record_id)
         .join(Questionnaire, Questionnaire.id == UserAnswer.questionnaire_id)
         .where(DevelopmentPlan.user_id == current_user.id)
-        .order_by(DevelopmentPlan.created_at.desc())
     )
-    rows = session.exec(stmt).all()
+    stmt = paginate(stmt, DevelopmentPlan.created_at, DevelopmentPlan.id, cursor, limit)
+    rows, next_cursor = page_rows(
+        session.exec(stmt).all(), limit, lambda row: (row[0].created_at, row[0].id)
+    )
 
     summaries: list[DevelopmentPlanSummaryRead] = []
     for plan, ua, questionnaire in rows:
@@ -811,23 +1046,15 @@ def list_development_plans_for_user(
                 created_at=plan.created_at,
             )
         )
-    return summaries
+    return DevelopmentPlanSummaryPage(items=summaries, next_cursor=next_cursor)
 
 
-def _verify_url(url: str, timeout: float = 5.0) -> tuple[bool, Optional[str]]:
+def _verify_url(url: str) -> tuple[bool, Optional[str]]:
     """Return (is_valid, final_url). Consider valid for 2xx/3xx HTTP responses.
     Be non-destructive: failures upstream should not cause us to strip links.
     """
-    try:
-        req = urlrequest.Request(url, headers={"User-Agent": "Mozilla/5.0 (compatible)"})
-        with urlrequest.urlopen(req, timeout=timeout) as resp:
-            code = getattr(resp, 'status', None) or getattr(resp, 'code', None) or 0
-            final_url = getattr(resp, 'geturl', lambda: url)()
-            if 200 <= int(code) < 400:
-                return True, final_url
-            return False, final_url
-    except Exception:
-        return False, None
+    link_status = verify_urls([url])[url]
+    return link_status.ok, link_status.final_url
 
 DENY_DOMAINS = {
     "bit.ly", "t.co", "goo.gl", "tinyurl.com", "ow.ly", "t.ly", "shorturl.at", "rb.gy",
@@ -884,6 +1111,8 @@ def _find_authoritative_url(title: str, rtype: str) -> Optional[str]:
         return None
 
 
+MAX_RESOURCE_LINKS_TO_CHECK = 25
+
 _RES_LINE_RE = re.compile(
     r"^\-\s*(?P<type>Book|Course|Workshop|Webinar|Article|Podcast|Video|Toolkit)\s*:\s*"
     r"(?:(?P<link>\[(?P<title>[^\]]+)\]\((?P<url>https?://[^)]+)\))|(?P<title_nolink>[^—\n]+))\s*—\s*(?P<desc>.+)$"
@@ -894,42 +1123,46 @@ def _repair_resources_in_markdown(md: str) -> str:
     """Walk through markdown lines and for recognized resource bullets ensure links are valid.
     - If a link exists and is invalid, attempt to replace with an authoritative link via WebSearch.
     - If no link exists, attempt to find one. Keep the display format unchanged otherwise.
+    Links are verified concurrently (and from the URL status cache) before rewriting.
     """
     lines = md.splitlines()
-    fixed: list[str] = []
     # Limit processing to avoid long latency
-    processed = 0
-    max_to_check = 10
+    max_to_check = MAX_RESOURCE_LINKS_TO_CHECK
+    parsed: list[Optional[tuple[str, str, str, Optional[str]]]] = []
     for line in lines:
-        stripped = line.strip()
-        m = _RES_LINE_RE.match(stripped)
-        if not m or processed >= max_to_check:
-            fixed.append(line)
+        m = _RES_LINE_RE.match(line.strip())
+        if not m or len([p for p in parsed if p]) >= max_to_check:
+            parsed.append(None)
             continue
-        processed += 1
         rtype = m.group('type') or ''
         title = (m.group('title') or m.group('title_nolink') or '').strip()
         desc = (m.group('desc') or '').strip()
         url = (m.group('url') or '').strip() or None
+        sanitized = _sanitize_url(url) if url else None
+        parsed.append((rtype, title, desc, sanitized))
+
+    statuses = verify_urls([p[3] for p in parsed if p and p[3]])
 
+    fixed: list[str] = []
+    for line, resource in zip(lines, parsed):
+        if resource is None:
+            fixed.append(line)
+            continue
+        rtype, title, desc, sanitized = resource
         # Default to building a safe link or a search link
-        if url:
-            sanitized = _sanitize_url(url)
-            if sanitized is None:
-                search = _build_search_url(title, rtype)
-                fixed.append(f"- {rtype}: [{title}]({search}) — {desc}")
-            else:
-                ok, final = _verify_url(sanitized)
-                # Treat homepage (root path) as insufficiently specific
-                p = urlparse(final or sanitized)
-                is_root = (p.path or "/") in ("", "/")
-                if not ok or is_root:
-                    search = _build_search_url(title, rtype)
-                    fixed.append(f"- {rtype}: [{title}]({search}) — {desc}")
-                else:
-                    fixed.append(f"- {rtype}: [{title}]({final or sanitized}) — {desc}")
-        else:
+        if sanitized is None:
+            search = _build_search_url(title, rtype)
+            fixed.append(f"- {rtype}: [{title}]({search}) — {desc}")
+            continue
+        link_status = statuses[sanitized]
+        final = link_status.final_url
+        # Treat homepage (root path) as insufficiently specific
+        p = urlparse(final or sanitized)
+        is_root = (p.path or "/") in ("", "/")
+        if not link_status.ok or is_root:
             search = _build_search_url(title, rtype)
             fixed.append(f"- {rtype}: [{title}]({search}) — {desc}")
+        else:
+            fixed.append(f"- {rtype}: [{title}]({final or sanitized}) — {desc}")
 
     return "\n".join(fixed)
@@ -0,0 +1,48 @@
+import logging
+from datetime import datetime
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from database.replicas import get_async_read_engine
+
+from .models import ExportDataset, ExportFormat
+from .service import EXPORT_MEDIA_TYPES, require_export_key, stream_export
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+
+@router.get(
+    "/{dataset}",
+    response_class=StreamingResponse,
+    summary="Stream a dataset as NDJSON or CSV",
+    dependencies=[Depends(require_export_key)],
+)
+async def export_dataset(
+    dataset: ExportDataset,
+    format: ExportFormat = ExportFormat.NDJSON,
+    questionnaire_id: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    include_results: bool = False,
+) -> StreamingResponse:
+    """
+    Stream every user answers record, result or development plan matching the
+    filters, read from a replica when one is healthy. Requires the X-Export-Key header.
+    """
+    logger.info(f"Exporting {dataset.value} as {format.value} (questionnaire {questionnaire_id}, {since} - {until})")
+    return StreamingResponse(
+        stream_export(
+            dataset,
+            format,
+            questionnaire_id=questionnaire_id,
+            since=since,
+            until=until,
+            include_results=include_results,
+            engine=get_async_read_engine(),
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset.value}.{format.value}"'},
+    )
@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class ExportDataset(str, Enum):
+    USER_ANSWERS = "user_answers"
+    RESULTS = "results"
+    DEVELOPMENT_PLANS = "development_plans"
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
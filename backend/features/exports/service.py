@@ -0,0 +1,169 @@
+"""
+Streaming exports of answers, results and development plans.
+
+`stream_export` runs one query on a server-side cursor and yields the
+serialized output `EXPORT_BATCH_SIZE` rows at a time, so memory stays flat
+however many rows match: nothing but the current batch is held in Python, and
+the HTTP response or CLI writes each chunk out before the next one is fetched.
+Rows come in no particular order (sorting tens of millions of rows would cost
+the database more than the export itself).
+"""
+
+import csv
+import hmac
+import io
+import logging
+import time
+from datetime import datetime
+from typing import AsyncIterator
+
+from fastapi import Header, HTTPException, status
+from sqlalchemy import (
+    DateTime,
+    Select,
+    Text,
+    cast,
+    func,
+    literal_column,
+    select,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config import settings
+from database.core import async_engine
+from entities.development_plans import DevelopmentPlan
+from entities.user_answers import UserAnswer
+from entities.user_results import UserResult
+
+from .models import ExportDataset, ExportFormat
+
+logger = logging.getLogger(__name__)
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+_answers = UserAnswer.__table__
+_results = UserResult.__table__
+_plans = DevelopmentPlan.__table__
+
+
+def require_export_key(x_export_key: str | None = Header(None)) -> None:
+    """
+    FastAPI dependency admitting requests whose X-Export-Key header matches
+    EXPORT_API_KEY. Exports are disabled (404) while that setting is unset.
+    """
+    if not settings.EXPORT_API_KEY:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Exports are disabled")
+    if x_export_key is None or not hmac.compare_digest(
+        x_export_key.encode(), settings.EXPORT_API_KEY.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid export key")
+
+
+def build_export_query(
+    dataset: ExportDataset,
+    questionnaire_id: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    include_results: bool = False,
+) -> Select:
+    """
+    Return the SELECT for a dataset. `since` (inclusive) and `until` (exclusive)
+    bound the record creation time for answers and plans, and the completion
+    time for results. `include_results` adds the competency percentages of the
+    underlying completed record (null while there are none).
+    """
+    if dataset == ExportDataset.RESULTS:
+        stmt = select(_results)
+        timestamp = _results.c.completed_at
+        if questionnaire_id is not None:
+            stmt = stmt.where(_results.c.questionnaire_id == questionnaire_id)
+    elif dataset == ExportDataset.USER_ANSWERS:
+        stmt = select(_answers)
+        timestamp = _answers.c.created_at
+        if include_results:
+            stmt = stmt.add_columns(_results.c.results).outerjoin(
+                _results, _results.c.user_answers_record_id == _answers.c.id
+            )
+        if questionnaire_id is not None:
+            stmt = stmt.where(_answers.c.questionnaire_id == questionnaire_id)
+    else:
+        stmt = select(_plans)
+        timestamp = _plans.c.created_at
+        if include_results:
+            stmt = stmt.add_columns(_results.c.results).outerjoin(
+                _results, _results.c.user_answers_record_id == _plans.c.user_answers_record_id
+            )
+        if questionnaire_id is not None:
+            stmt = stmt.join(_answers, _answers.c.id == _plans.c.user_answers_record_id).where(
+                _answers.c.questionnaire_id == questionnaire_id
+            )
+    if since is not None:
+        stmt = stmt.where(timestamp >= since)
+    if until is not None:
+        stmt = stmt.where(timestamp < until)
+    return stmt
+
+
+def _csv_column(column):
+    if isinstance(column.type, JSONB):
+        return cast(column, Text).label(column.name)
+    if isinstance(column.type, DateTime):
+        # ISO 8601, as in the NDJSON output
+        return func.to_json(column).op("#>>")(literal_column("'{}'")).label(column.name)
+    return column
+
+
+def _serialized_query(stmt: Select, export_format: ExportFormat) -> Select:
+    # Postgres does the formatting: NDJSON lines come out of row_to_json ready to
+    # write, and CSV columns arrive as text the csv module writes unchanged, so
+    # no value is parsed or converted in Python
+    row = stmt.subquery("row")
+    if export_format == ExportFormat.NDJSON:
+        return select(cast(func.row_to_json(row.table_valued()), Text).label("line"))
+    return select(*(_csv_column(column) for column in row.c))
+
+
+def _format_batch(rows, export_format: ExportFormat) -> str:
+    if export_format == ExportFormat.NDJSON:
+        return "".join(f"{line}\n" for (line,) in rows)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_export(
+    dataset: ExportDataset,
+    export_format: ExportFormat,
+    questionnaire_id: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    include_results: bool = False,
+    engine: AsyncEngine | None = None,
+) -> AsyncIterator[str]:
+    """
+    Yield a dataset serialized as NDJSON lines or CSV (header first), one chunk
+    per batch of rows. Runs on its own connection of `engine` (the primary by
+    default), held until the generator finishes or is closed.
+    """
+    stmt = _serialized_query(
+        build_export_query(dataset, questionnaire_id, since, until, include_results), export_format
+    )
+    start = time.perf_counter()
+    exported = 0
+    async with (engine or async_engine).connect() as conn:
+        result = await conn.stream(
+            stmt, execution_options={"yield_per": settings.EXPORT_BATCH_SIZE}
+        )
+        if export_format == ExportFormat.CSV:
+            yield _format_batch([list(result.keys())], export_format)
+        async for rows in result.partitions():
+            exported += len(rows)
+            yield _format_batch(rows, export_format)
+    logger.info(
+        f"Exported {exported} {dataset.value} rows as {export_format.value} "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
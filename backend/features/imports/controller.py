@@ -0,0 +1,34 @@
+import logging
+
+from fastapi import APIRouter, Depends, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database.core import get_async_session
+
+from .models import ImportFormat, ImportReport
+from .service import import_user_answers, iter_lines, require_import_key
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+
+@router.post(
+    "/user_answers",
+    response_model=ImportReport,
+    summary="Bulk import completed historical assessments",
+    dependencies=[Depends(require_import_key)],
+)
+async def import_historical_user_answers(
+    request: Request,
+    format: ImportFormat = ImportFormat.NDJSON,
+    session: AsyncSession = Depends(get_async_session),
+) -> ImportReport:
+    """
+    Import the NDJSON or CSV request body (email, questionnaire_id and/or
+    questionnaire_version_id, answers, completed_at per row) as completed records
+    with their results, and report what was imported, skipped and rejected.
+    Requires the X-Import-Key header.
+    """
+    logger.info(f"Importing historical user answers as {format.value}")
+    return await import_user_answers(iter_lines(request.stream()), format, session)
@@ -0,0 +1,56 @@
+import json
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, field_validator, model_validator
+
+
+class ImportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class HistoricalAnswersRow(BaseModel):
+    email: str  # Email of an existing user
+    questionnaire_id: Optional[str] = None  # Scored against the questionnaire's current version
+    questionnaire_version_id: Optional[str] = None  # Content hash of the version the answers were given to
+    answers: dict[str, str]  # Mapping of question IDs to answer IDs; a JSON object in CSV files
+    completed_at: datetime  # When the assessment was completed; UTC if no offset is given
+
+    @field_validator("questionnaire_id", "questionnaire_version_id", mode="before")
+    @classmethod
+    def empty_as_none(cls, value):
+        return value or None
+
+    @field_validator("answers", mode="before")
+    @classmethod
+    def parse_answers(cls, value):
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+    @model_validator(mode="after")
+    def check_questionnaire(self):
+        if self.questionnaire_id is None and self.questionnaire_version_id is None:
+            raise ValueError("Give questionnaire_id or questionnaire_version_id")
+        if not self.answers:
+            raise ValueError("No answers")
+        if self.completed_at.tzinfo is None:
+            self.completed_at = self.completed_at.replace(tzinfo=timezone.utc)
+        return self
+
+
+class ImportRowError(BaseModel):
+    line: int  # 1-based line of the input file
+    detail: str
+
+
+class ImportReport(BaseModel):
+    rows: int  # Data rows read
+    imported: int  # Records (and their results) written
+    duplicates: int  # Rows already imported (same user, questionnaire version and completion time)
+    rejected: int  # Rows failing validation
+    errors: list[ImportRowError]  # The first rejected rows, with the reason
+    elapsed_seconds: float
+    rows_per_second: float
@@ -0,0 +1,339 @@
+"""
+Bulk import of historical assessments.
+
+Rows of (user email, questionnaire or questionnaire version, answers,
+completion time) are read as a stream and handled `IMPORT_BATCH_SIZE` at a
+time. Per batch:
+
+1. Rows are validated against the answer key of their questionnaire version
+   (cached per content hash) and their users are looked up in one query.
+2. Valid rows are scored with the vectorized batch scorer.
+3. Records and scores are COPYed into a temporary staging table, then one
+   statement inserts the `user_answers` rows, their `user_results` and the
+   cohort analytics counts from it, and the batch commits.
+
+Record IDs are derived from (user, questionnaire version, completion time),
+so importing a file again skips the rows already loaded rather than
+duplicating them. Rows without a version are scored against the
+questionnaire's current content, published as a version if new.
+"""
+
+import csv
+import hmac
+import json
+import logging
+import time
+from typing import AsyncIterator
+from uuid import NAMESPACE_URL, uuid5
+
+from fastapi import Header, HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config import settings
+from entities.questionnaire_versions import QuestionnaireVersion
+from entities.users import User
+from features.questionnaires.service import publish_questionnaire_version
+from features.results.analytics import cohort_of
+from features.results.answer_key import AnswerKey, get_version_answer_key
+from features.results.batch_scoring import score_answer_sets
+
+from .models import (
+    HistoricalAnswersRow,
+    ImportFormat,
+    ImportReport,
+    ImportRowError,
+)
+
+logger = logging.getLogger(__name__)
+
+IMPORT_MAX_REPORTED_ERRORS = 100
+_RECORD_ID_NAMESPACE = uuid5(NAMESPACE_URL, "leadership-coach/user-answers-import")
+
+_STAGING_TABLE = "user_answers_import"
+_STAGING_COLUMNS = (
+    "id",
+    "user_id",
+    "questionnaire_id",
+    "questionnaire_version_id",
+    "answers",
+    "completed_at",
+    "results",
+    "industry",
+    "role",
+    "experience_band",
+)
+_CREATE_STAGING = text(
+    f"""
+    CREATE TEMPORARY TABLE {_STAGING_TABLE} (
+        id text, user_id text, questionnaire_id text, questionnaire_version_id text,
+        answers text, completed_at timestamptz, results text,
+        industry text, role text, experience_band text
+    ) ON COMMIT DROP
+    """
+)
+# Records, their results and the cohort bucket counts in one statement;
+# records imported before are skipped along with their results
+_LOAD_STAGING = text(
+    f"""
+    WITH inserted AS (
+        INSERT INTO user_answers (
+            id, user_id, questionnaire_id, questionnaire_version_id, answers,
+            created_at, updated_at, completed_at, revision, autosave_seq
+        )
+        SELECT id, user_id, questionnaire_id, questionnaire_version_id, CAST(answers AS jsonb),
+               completed_at, completed_at, completed_at, 0, 0
+        FROM {_STAGING_TABLE}
+        ON CONFLICT (id) DO NOTHING
+        RETURNING id
+    ), scored AS (
+        INSERT INTO user_results (
+            user_answers_record_id, user_id, questionnaire_id, results, is_stale,
+            industry, role, experience_band, completed_at, computed_at
+        )
+        SELECT staged.id, staged.user_id, staged.questionnaire_id, CAST(staged.results AS jsonb), false,
+               staged.industry, staged.role, staged.experience_band, staged.completed_at, now()
+        FROM {_STAGING_TABLE} AS staged
+        JOIN inserted USING (id)
+        RETURNING questionnaire_id, industry, role, experience_band, results
+    ), counted AS (
+        INSERT INTO competency_score_buckets (
+            questionnaire_id, industry, role, experience_band, competency, score, count, updated_at
+        )
+        SELECT scored.questionnaire_id, scored.industry, scored.role, scored.experience_band,
+               score.key, CAST(round(CAST(score.value AS numeric)) AS integer), count(*), now()
+        FROM scored
+        CROSS JOIN LATERAL jsonb_each(scored.results) AS score
+        GROUP BY 1, 2, 3, 4, 5, 6
+        ON CONFLICT (questionnaire_id, industry, role, experience_band, competency, score)
+        DO UPDATE SET count = competency_score_buckets.count + excluded.count, updated_at = now()
+    )
+    SELECT count(*) FROM inserted
+    """
+)
+
+
+def require_import_key(x_import_key: str | None = Header(None)) -> None:
+    """
+    FastAPI dependency admitting requests whose X-Import-Key header matches
+    IMPORT_API_KEY. Imports are disabled (404) while that setting is unset.
+    """
+    if not settings.IMPORT_API_KEY:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Imports are disabled")
+    if x_import_key is None or not hmac.compare_digest(
+        x_import_key.encode(), settings.IMPORT_API_KEY.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid import key")
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of UTF-8 bytes (e.g. a request body) into lines.
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8").rstrip("\r")
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, item['loc'])) or 'row'}: {item['msg']}" for item in error.errors()
+    )
+
+
+async def _read_rows(
+    lines: AsyncIterator[str], import_format: ImportFormat
+) -> AsyncIterator[tuple[int, HistoricalAnswersRow | str]]:
+    # CSV records are one line each: the answers column holds a JSON object,
+    # which never needs a raw line break
+    header = None
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            if import_format == ImportFormat.NDJSON:
+                row = HistoricalAnswersRow.model_validate_json(line)
+            elif header is None:
+                header = next(csv.reader([line]))
+                missing = {"email", "answers", "completed_at"} - set(header)
+                if missing:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"CSV header lacks columns: {', '.join(sorted(missing))}",
+                    )
+                continue
+            else:
+                row = HistoricalAnswersRow.model_validate(dict(zip(header, next(csv.reader([line])))))
+        except ValidationError as e:
+            yield line_number, _validation_detail(e)
+            continue
+        yield line_number, row
+
+
+def _answers_error(answers: dict[str, str], answer_key: AnswerKey) -> str | None:
+    for question_id, answer_id in answers.items():
+        if question_id not in answer_key.questions:
+            return f"Question {question_id} is not part of this questionnaire version"
+        answer = answer_key.answers.get(answer_id)
+        if answer is None or answer[0] != question_id:
+            return f"Answer {answer_id} is not an answer of question {question_id}"
+    return None
+
+
+class _Importer:
+    """
+    State shared by the batches of one import: resolved users and versions,
+    counters and the reported errors.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.users: dict[str, tuple[str, tuple[str, str, str]] | None] = {}  # email -> (id, cohort)
+        # (questionnaire_id, version id) -> (questionnaire_id, content hash) or the reason it is unusable
+        self.versions: dict[tuple[str | None, str | None], tuple[str, str] | str] = {}
+        self.answer_keys: dict[str, AnswerKey] = {}
+        self.rows = self.imported = self.duplicates = self.rejected = 0
+        self.errors: list[ImportRowError] = []
+
+    def reject(self, line: int, detail: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append(ImportRowError(line=line, detail=detail))
+
+    async def _resolve_version(self, questionnaire_id: str | None, version_id: str | None) -> tuple[str, str] | str:
+        if version_id is None:
+            try:
+                version = await publish_questionnaire_version(questionnaire_id, self.session)
+            except HTTPException as e:
+                return f"Questionnaire {questionnaire_id}: {e.detail}"
+            return version.questionnaire_id, version.content_hash
+        version = await self.session.get(QuestionnaireVersion, version_id)
+        if version is None:
+            return f"Unknown questionnaire version {version_id}"
+        if questionnaire_id is not None and version.questionnaire_id != questionnaire_id:
+            return f"Version {version_id} is not a version of questionnaire {questionnaire_id}"
+        return version.questionnaire_id, version.content_hash
+
+    async def _resolve(self, rows: list[HistoricalAnswersRow]) -> None:
+        for row in rows:
+            key = (row.questionnaire_id, row.questionnaire_version_id)
+            if key not in self.versions:
+                self.versions[key] = await self._resolve_version(*key)
+                resolved = self.versions[key]
+                if not isinstance(resolved, str) and resolved[1] not in self.answer_keys:
+                    self.answer_keys[resolved[1]] = await self.session.run_sync(
+                        lambda sync_session: get_version_answer_key(resolved[1], sync_session)
+                    )
+
+        emails = {row.email for row in rows} - self.users.keys()
+        if emails:
+            found = await self.session.exec(
+                select(User.id, User.email, User.industry, User.role, User.years_experience).where(
+                    User.email.in_(emails)
+                )
+            )
+            for user in found:
+                self.users[user.email] = (user.id, cohort_of(user))
+            for email in emails:
+                self.users.setdefault(email, None)
+
+    async def load_batch(self, batch: list[tuple[int, HistoricalAnswersRow]]) -> None:
+        await self._resolve([row for _, row in batch])
+
+        valid: dict[str, list[tuple[str, tuple[str, str, str], HistoricalAnswersRow]]] = {}
+        for line, row in batch:
+            user = self.users[row.email]
+            resolved = self.versions[(row.questionnaire_id, row.questionnaire_version_id)]
+            if user is None:
+                self.reject(line, f"No user with email {row.email}")
+            elif isinstance(resolved, str):
+                self.reject(line, resolved)
+            elif error := _answers_error(row.answers, self.answer_keys[resolved[1]]):
+                self.reject(line, error)
+            else:
+                valid.setdefault(resolved[1], []).append((resolved[0], user, row))
+
+        records: dict[str, tuple] = {}
+        for content_hash, version_rows in valid.items():
+            scores = score_answer_sets([row.answers for _, _, row in version_rows], self.answer_keys[content_hash])
+            for (questionnaire_id, (user_id, cohort), row), results in zip(version_rows, scores):
+                record_id = uuid5(
+                    _RECORD_ID_NAMESPACE, f"{user_id}/{content_hash}/{row.completed_at.timestamp()}"
+                ).hex
+                if record_id in records:
+                    self.duplicates += 1
+                    continue
+                records[record_id] = (
+                    record_id,
+                    user_id,
+                    questionnaire_id,
+                    content_hash,
+                    json.dumps(row.answers),
+                    row.completed_at,
+                    json.dumps(results),
+                    *cohort,
+                )
+        if not records:
+            return
+
+        await self.session.exec(_CREATE_STAGING)
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            _STAGING_TABLE, records=records.values(), columns=_STAGING_COLUMNS
+        )
+        inserted = (await self.session.exec(_LOAD_STAGING)).scalar_one()
+        await self.session.commit()
+        self.imported += inserted
+        self.duplicates += len(records) - inserted
+
+
+async def import_user_answers(
+    lines: AsyncIterator[str], import_format: ImportFormat, session: AsyncSession
+) -> ImportReport:
+    """
+    Import completed historical assessments, with their results, from NDJSON
+    or CSV lines. Each batch of `IMPORT_BATCH_SIZE` rows commits on its own;
+    invalid rows are skipped and reported.
+    """
+    importer = _Importer(session)
+    start = time.perf_counter()
+    batch: list[tuple[int, HistoricalAnswersRow]] = []
+    async for line, row in _read_rows(lines, import_format):
+        importer.rows += 1
+        if isinstance(row, str):
+            importer.reject(line, row)
+            continue
+        batch.append((line, row))
+        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+            await importer.load_batch(batch)
+            batch = []
+            logger.info(f"Imported {importer.imported} of {importer.rows} rows so far")
+    if batch:
+        await importer.load_batch(batch)
+
+    elapsed = time.perf_counter() - start
+    report = ImportReport(
+        rows=importer.rows,
+        imported=importer.imported,
+        duplicates=importer.duplicates,
+        rejected=importer.rejected,
+        errors=sorted(importer.errors, key=lambda error: error.line),
+        elapsed_seconds=round(elapsed, 3),
+        rows_per_second=round(importer.rows / elapsed, 1) if elapsed > 0 else 0.0,
+    )
+    logger.info(
+        f"Import finished: {report.imported} imported, {report.duplicates} duplicates, "
+        f"{report.rejected} rejected of {report.rows} rows in {elapsed:.1f}s "
+        f"({report.rows_per_second:.0f} rows/s)"
+    )
+    return report
@@ -1,9 +1,10 @@
 import logging
 
 from fastapi import APIRouter, Depends, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from database.core import get_session
+from database.core import get_async_session
+from database.replicas import get_async_read_session
 from entities.leadership_assessments import LeadershipAssessment
 from entities.users import User
 
@@ -20,26 +21,26 @@ router = APIRouter(prefix="/assessements", tags=["assessements"])
 
 @router.post("/", response_model=LeadershipAssessmentRead, summary="Create Leadership Assessment")
 # def create_assessment(assessment: LeadershipAssessmentCreate, session: Session = Depends(get_session), current_user: User=Depends(get_current_user)) -> LeadershipAssessmentRead:
-def create_assessment(assessment: LeadershipAssessmentCreate, session: Session = Depends(get_session)) -> LeadershipAssessmentRead:
+async def create_assessment(assessment: LeadershipAssessmentCreate, session: AsyncSession = Depends(get_async_session)) -> LeadershipAssessmentRead:
 
     """
     Create a new Leadership Assessment in the system.
     """
-    return service_create_leadrship_assessment(assessment, session)
+    return await service_create_leadrship_assessment(assessment, session)
 
 
 @router.get("/{assessment_id}", response_model=LeadershipAssessmentRead, summary="Get Leadership Assessment by ID")
-def get_assessment(assessment_id: str, session: Session = Depends(get_session)) -> LeadershipAssessmentRead:
+async def get_assessment(assessment_id: str, session: AsyncSession = Depends(get_async_read_session)) -> LeadershipAssessmentRead:
     """
     Retrieve a Leadership Assessment by its ID.
     """
-    return service_get_leadrship_assessment_by_id(assessment_id, session)
+    return await service_get_leadrship_assessment_by_id(assessment_id, session)
 
 
 
 @router.delete("/{assessment_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete Leadership Assessment")
-def delete_assessment(assessment_id: str, session: Session = Depends(get_session)):
+async def delete_assessment(assessment_id: str, session: AsyncSession = Depends(get_async_session)):
     """
     Delete a Leadership Assessment by its ID.
     """
-    return service_delete_leadrship_assessment(assessment_id, session)
\ No newline at end of file
+    return await service_delete_leadrship_assessment(assessment_id, session)
\ No newline at end of file
@@ -2,7 +2,8 @@ import logging
 
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from entities.leadership_assessments import LeadershipAssessment
 from entities.users import User
@@ -12,7 +13,7 @@ from .models import LeadershipAssessmentCreate, LeadershipAssessmentRead
 logger = logging.getLogger(__name__)
 
 # def create_assessment(assessment: LeadershipAssessmentCreate, session: Session, current_user: User) -> LeadershipAssessmentRead:
-def create_assessment(assessment: LeadershipAssessmentCreate, session: Session) -> LeadershipAssessmentRead:
+async def create_assessment(assessment: LeadershipAssessmentCreate, session: AsyncSession) -> LeadershipAssessmentRead:
     """
     Create a new Leadership Assessment in the system.
     """
@@ -23,8 +24,8 @@ def create_assessment(assessment: LeadershipAssessmentCreate, session: Session)
         assessment_rating=assessment.assessment_rating
     )
     session.add(new_assessment)
-    session.commit()
-    session.refresh(new_assessment)
+    await session.commit()
+    await session.refresh(new_assessment)
     logger.info(f"Leadership Assessment created: {new_assessment.id}")
     return new_assessment
 
@@ -50,12 +51,12 @@ def create_assessment(assessment: LeadershipAssessmentCreate, session: Session)
     #     raise HTTPException(status_code=500, detail="Internal server error")
 
 
-def get_leadrship_assessment_by_id(assessment_id, session) -> LeadershipAssessmentRead:
+async def get_leadrship_assessment_by_id(assessment_id, session) -> LeadershipAssessmentRead:
     """
     Retrieve a Leadership Assessment by its ID.
     """
     statement = select(LeadershipAssessment).where(LeadershipAssessment.id == assessment_id)
-    assessment = session.exec(statement).first()
+    assessment = (await session.exec(statement)).first()
     if not assessment:
         logger.error(f"Leadership Assessment with ID {assessment_id} not found")
         raise HTTPException(status_code=404, detail="Leadership Assessment not found")
@@ -64,17 +65,17 @@ def get_leadrship_assessment_by_id(assessment_id, session) -> LeadershipAssessme
 
 
 
-def delete_leadrship_assessment(assessment_id, session) -> None:
+async def delete_leadrship_assessment(assessment_id, session) -> None:
     """
     Delete a Leadership Assessment by its ID.
     """
     statement = select(LeadershipAssessment).where(LeadershipAssessment.id == assessment_id)
-    assessment = session.exec(statement).first()
+    assessment = (await session.exec(statement)).first()
     if not assessment:
         logger.error(f"Leadership Assessment with ID {assessment_id} not found")
         raise HTTPException(status_code=404, detail="Leadership Assessment not found")
-    session.delete(assessment)
-    session.commit()
+    await session.delete(assessment)
+    await session.commit()
     logger.info(f"Leadership Assessment with ID {assessment_id} deleted successfully")
     return None
 
@@ -1,9 +1,10 @@
 import logging
 
 from fastapi import APIRouter, Depends, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from database.core import get_session
+from database.core import get_async_session
+from database.replicas import get_async_read_session
 from entities.leadership_modules import LeadershipModule
 from entities.users import User
 
@@ -20,26 +21,26 @@ router = APIRouter(prefix="/modules", tags=["modules"])
 
 @router.post("/", response_model=LeadershipModuleRead, summary="Create Leadership Module")
 # def create_module(module: LeadershipModuleCreate, session: Session = Depends(get_session), current_user: User=Depends(get_current_user)) -> LeadershipModuleRead:
-def create_module(module: LeadershipModuleCreate, session: Session = Depends(get_session)) -> LeadershipModuleRead:
+async def create_module(module: LeadershipModuleCreate, session: AsyncSession = Depends(get_async_session)) -> LeadershipModuleRead:
 
     """
     Create a new Leadership Module in the system.
     """
-    return service_create_module(module, session)
+    return await service_create_module(module, session)
 
 
 @router.get("/{module_id}", response_model=LeadershipModuleRead, summary="Get Leadership Module by ID")
-def get_module(module_id: str, session: Session = Depends(get_session)) -> LeadershipModuleRead:
+async def get_module(module_id: str, session: AsyncSession = Depends(get_async_read_session)) -> LeadershipModuleRead:
     """
     Retrieve a Leadership Module by its ID.
     """
-    return service_get_module_by_id(module_id, session)
+    return await service_get_module_by_id(module_id, session)
 
 
 @router.delete("/{module_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete Leadership Module")
-def delete_module(module_id: str, session: Session = Depends(get_session)):
+async def delete_module(module_id: str, session: AsyncSession = Depends(get_async_session)):
     """
     Delete a Leadership Module by its ID.
     """
-    return service_delete_module(module_id, session)
+    return await service_delete_module(module_id, session)
 
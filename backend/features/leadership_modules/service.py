@@ -2,7 +2,8 @@ import logging
 
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from entities.leadership_modules import LeadershipModule
 from entities.users import User
@@ -13,7 +14,7 @@ logger = logging.getLogger(__name__)
 
 
 # def create_module(module: LeadershipModuleCreate, session: Session, current_user: User) -> LeadershipModuleRead:
-def create_module(module: LeadershipModuleCreate, session: Session) -> LeadershipModuleRead:
+async def create_module(module: LeadershipModuleCreate, session: AsyncSession) -> LeadershipModuleRead:
     """
     Create a new Leadership Module in the system.
     """
@@ -34,18 +35,18 @@ def create_module(module: LeadershipModuleCreate, session: Session) -> Leadershi
     )
 
     session.add(new_module)
-    session.commit()
-    session.refresh(new_module)
+    await session.commit()
+    await session.refresh(new_module)
     logger.info(f"Leadership Module created: {new_module.id}")
     return new_module
 
 
-def get_module_by_id(module_id: str, session: Session) -> LeadershipModuleRead:
+async def get_module_by_id(module_id: str, session: AsyncSession) -> LeadershipModuleRead:
     """
     Retrieve a Leadership Module by its ID.
     """
     statement = select(LeadershipModule).where(LeadershipModule.id == module_id)
-    module = session.exec(statement).first()
+    module = (await session.exec(statement)).first()
     if not module:
         logger.error(f"Leadership Module with ID {module_id} not found")
         raise HTTPException(status_code=404, detail="Leadership Module not found")
@@ -53,17 +54,17 @@ def get_module_by_id(module_id: str, session: Session) -> LeadershipModuleRead:
     return LeadershipModuleRead.model_validate(module)  # Assuming LeadershipModuleRead has a model_validate method to convert the model 
 
 
-def delete_module(module_id: str, session: Session) -> None:
+async def delete_module(module_id: str, session: AsyncSession) -> None:
     """
     Delete a Leadership Module by its ID.
     """
     statement = select(LeadershipModule).where(LeadershipModule.id == module_id)
-    module = session.exec(statement).first()
+    module = (await session.exec(statement)).first()
     if not module:
         logger.error(f"Leadership Module with ID {module_id} not found")
         raise HTTPException(status_code=404, detail="Leadership Module not found")
-    session.delete(module)
-    session.commit()
+    await session.delete(module)
+    await session.commit()
     logger.info(f"Leadership Module with ID {module_id} deleted successfully")
     return None 
 
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from database.core import get_session
+from database.core import get_async_session
 
 from .models import QuestionWithAnswersCreate, QuestionWithAnswersRead
 from .service import (
@@ -13,19 +13,19 @@ router = APIRouter(prefix="/question_with_answers", tags=["question_with_answers
 
 
 @router.post("/", response_model=QuestionWithAnswersRead)
-def add_question_with_answers(
+async def add_question_with_answers(
     data: QuestionWithAnswersCreate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
-    return create_question_with_answers(data, session)
+    return await create_question_with_answers(data, session)
 
 
 @router.post("/add_list", response_model=list[QuestionWithAnswersRead])
-def add_questions_with_answers_list(
+async def add_questions_with_answers_list(
     data_list: list[QuestionWithAnswersCreate],
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Create multiple questions with answers in the system.
     """
-    return create_question_with_answers_list(data_list, session)
\ No newline at end of file
+    return await create_question_with_answers_list(data_list, session)
\ No newline at end of file
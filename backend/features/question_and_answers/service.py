@@ -1,55 +1,98 @@
 import logging
+from datetime import datetime, timezone
+from uuid import uuid4
 
-from sqlmodel import Session
+from sqlalchemy import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from entities.answers import Answer
 from entities.questions import Question
+from features.results.answer_key import invalidate_answer_key
 
 from .models import QuestionWithAnswersCreate, QuestionWithAnswersRead
 
 logger = logging.getLogger(__name__)
 
-def create_question_with_answers(data: QuestionWithAnswersCreate, session: Session) -> QuestionWithAnswersRead:
-    question = Question(
-        question_text=data.question_text,
-        competency=data.competency
-    )
-    session.add(question)
-    session.commit()
-    session.refresh(question)
+_questions = Question.__table__
+_answers = Answer.__table__
 
-    # Fetch ID of the newly created question
 
-    # Add answers to the database
-    for ans in data.answers:
-        answer = Answer(
-            question_id=question.id,
-            answer_text=ans.answer_text,
-            score_value=ans.score_value
-        )
-        session.add(answer)
-    session.commit()
+async def create_question_with_answers(data: QuestionWithAnswersCreate, session: AsyncSession) -> QuestionWithAnswersRead:
+    return (await create_question_with_answers_list([data], session))[0]
+
 
-    # Fetch the question and its answers from the database
-    db_question = session.get(Question, question.id)
-    from sqlmodel import select
-    db_answers = session.exec(select(Answer).where(Answer.question_id == question.id)).all()
+async def create_question_with_answers_list(data_list: list[QuestionWithAnswersCreate], session: AsyncSession) -> list[QuestionWithAnswersRead]:
+    """
+    Insert questions and their answers in one transaction and commit.
+
+    Each table gets one executemany INSERT ... RETURNING, which SQLAlchemy sends as
+    multi-row VALUES statements (1000 rows per statement), so the import costs a
+    handful of round trips whatever its size. The response is built from the returned rows.
+    """
+    if not data_list:
+        return []
+    now = datetime.now(timezone.utc)
+    question_rows = [
+        {
+            "id": uuid4().hex,
+            "question_text": data.question_text,
+            "competency": data.competency,
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for data in data_list
+    ]
+    answer_rows = [
+        {
+            "id": uuid4().hex,
+            "question_id": question_row["id"],
+            "answer_text": ans.answer_text,
+            "score_value": ans.score_value,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for question_row, data in zip(question_rows, data_list)
+        for ans in data.answers
+    ]
 
-    answers_data = [
-        {"id": a.id, "answer_text": a.answer_text, "score_value": a.score_value} for a in db_answers
+    questions = (
+        await session.execute(
+            insert(_questions).returning(
+                _questions.c.id,
+                _questions.c.question_text,
+                _questions.c.competency,
+                sort_by_parameter_order=True,
+            ),
+            question_rows,
+        )
+    ).all()
+    answers_by_question: dict[str, list[dict]] = {question.id: [] for question in questions}
+    if answer_rows:
+        answers = await session.execute(
+            insert(_answers).returning(
+                _answers.c.id,
+                _answers.c.question_id,
+                _answers.c.answer_text,
+                _answers.c.score_value,
+                sort_by_parameter_order=True,
+            ),
+            answer_rows,
+        )
+        for a in answers:
+            answers_by_question[a.question_id].append(
+                {"id": a.id, "answer_text": a.answer_text, "score_value": a.score_value}
+            )
+    await session.commit()
+    invalidate_answer_key()
+
+    logger.info(f"Questions and answers created: {len(questions)} questions, {len(answer_rows)} answers")
+    return [
+        QuestionWithAnswersRead(
+            question_id=question.id,
+            question_text=question.question_text,
+            competency=question.competency,
+            answers=answers_by_question[question.id],
+        )
+        for question in questions
     ]
-    logger.info(f"Question and answers created: {db_question.id}")
-    return QuestionWithAnswersRead(
-        question_id=db_question.id,
-        question_text=db_question.question_text,
-        competency=db_question.competency,  # Use 'competency' from the model
-        answers=answers_data
-    )
-
-
-def create_question_with_answers_list(data_list: list[QuestionWithAnswersCreate], session: Session) -> list[QuestionWithAnswersRead]:
-    results = []
-    for data in data_list:
-        result = create_question_with_answers(data, session)
-        results.append(result)
-    return results
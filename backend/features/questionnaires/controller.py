@@ -1,17 +1,30 @@
 import logging
 
-from fastapi import APIRouter, Depends, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from database.core import get_session
+from database.core import get_async_session
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from database.replicas import get_async_read_session
 from entities.questionnaires import Questionnaire
 
-from .models import QuestionnaireCreate, QuestionnaireRead, QuestionnaireUpdate
+from .models import (
+    QuestionnaireBundleRead,
+    QuestionnaireCreate,
+    QuestionnairePage,
+    QuestionnaireRead,
+    QuestionnaireUpdate,
+    QuestionnaireVersionRead,
+)
 from .service import (
     create_questionnaire as service_create_questionnaire,
     delete_questionnaire as service_delete_questionnaire,
+    get_questionnaire_bundle as service_get_questionnaire_bundle,
+    get_questionnaire_bundle_etag as service_get_questionnaire_bundle_etag,
     get_questionnaire_by_id as service_get_questionnaire_by_id,
+    get_questionnaire_version as service_get_questionnaire_version,
     list_questionnaires as service_list_questionnaires,
+    publish_questionnaire_version as service_publish_questionnaire_version,
     update_questionnaire as service_update_questionnaire,
 )
 
@@ -19,51 +32,119 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/questionnaires", tags=["questionnaires"])
 
+# Questionnaire content only changes on admin edits; let browsers/CDNs reuse it
+# briefly and revalidate cheaply via ETag afterwards.
+BUNDLE_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=60"
+# A published version never changes; its URL contains its content hash
+VERSION_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
 
 @router.post("/", response_model=QuestionnaireRead, summary="Create Questionnaire")
-def create_questionnaire(
-    questionnaire: QuestionnaireCreate, session: Session = Depends(get_session)
+async def create_questionnaire(
+    questionnaire: QuestionnaireCreate, session: AsyncSession = Depends(get_async_session)
 ) -> QuestionnaireRead:
     """
     Create a new questionnaire in the system.
     """
-    return service_create_questionnaire(questionnaire, session)
+    return await service_create_questionnaire(questionnaire, session)
 
 
 @router.get("/{questionnaire_id}", response_model=QuestionnaireRead, summary="Get Questionnaire by ID")
-def get_questionnaire(  
-    questionnaire_id: str, session: Session = Depends(get_session)
+async def get_questionnaire(  
+    questionnaire_id: str, session: AsyncSession = Depends(get_async_read_session)
 ) -> QuestionnaireRead:
     """
     Retrieve a questionnaire by its ID.
     """
-    return service_get_questionnaire_by_id(questionnaire_id, session)
+    return await service_get_questionnaire_by_id(questionnaire_id, session)
+
+
+@router.get(
+    "/{questionnaire_id}/bundle",
+    response_model=QuestionnaireBundleRead,
+    summary="Get Questionnaire with Questions and Answers",
+)
+async def get_questionnaire_bundle(
+    questionnaire_id: str,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    session: AsyncSession = Depends(get_async_read_session),
+) -> QuestionnaireBundleRead:
+    """
+    Retrieve a questionnaire with its ordered questions and their answers in one request.
+    Supports conditional GET through the ETag / If-None-Match headers.
+    """
+    bundle = await service_get_questionnaire_bundle(questionnaire_id, session)
+    etag = service_get_questionnaire_bundle_etag(bundle)
+    headers = {"ETag": etag, "Cache-Control": BUNDLE_CACHE_CONTROL}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return bundle
+
+
+@router.post(
+    "/{questionnaire_id}/versions",
+    response_model=QuestionnaireVersionRead,
+    summary="Publish Questionnaire Version",
+)
+async def publish_questionnaire_version(
+    questionnaire_id: str, session: AsyncSession = Depends(get_async_session)
+) -> QuestionnaireVersionRead:
+    """
+    Snapshot the questionnaire's current questions, answers and scores as an immutable version.
+    Returns the existing version when the content has not changed since it was published.
+    """
+    return await service_publish_questionnaire_version(questionnaire_id, session)
+
+
+@router.get(
+    "/versions/{content_hash}",
+    response_model=QuestionnaireVersionRead,
+    summary="Get Questionnaire Version",
+)
+async def get_questionnaire_version(
+    content_hash: str,
+    response: Response,
+    session: AsyncSession = Depends(get_async_read_session),
+) -> QuestionnaireVersionRead:
+    """
+    Retrieve a published questionnaire version. Versions are immutable, so browsers
+    and CDNs may cache the response indefinitely.
+    """
+    version = await service_get_questionnaire_version(content_hash, session)
+    response.headers.update({"ETag": f'"{content_hash}"', "Cache-Control": VERSION_CACHE_CONTROL})
+    return version
 
 
 @router.patch("/{questionnaire_id}", response_model=QuestionnaireRead, summary="Update Questionnaire")
-def update_questionnaire(
-    questionnaire_update: QuestionnaireUpdate, questionnaire_id: str, session: Session = Depends(get_session)
+async def update_questionnaire(
+    questionnaire_update: QuestionnaireUpdate, questionnaire_id: str, session: AsyncSession = Depends(get_async_session)
 ) -> QuestionnaireRead:
     """
     Update an existing questionnaire's information.
     """
-    return service_update_questionnaire(questionnaire_update, questionnaire_id, session)
+    return await service_update_questionnaire(questionnaire_update, questionnaire_id, session)
 
 
 @router.delete("/{questionnaire_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete Questionnaire")
-def delete_questionnaire(questionnaire_id: str, session: Session = Depends(get_session)):
+async def delete_questionnaire(questionnaire_id: str, session: AsyncSession = Depends(get_async_session)):
     """
     Delete a questionnaire by its ID.
     """
-    return service_delete_questionnaire(questionnaire_id, session)
+    return await service_delete_questionnaire(questionnaire_id, session)
 
 
 
-@router.get("/", response_model=list[QuestionnaireRead], summary="List All Questionnaires")
-def list_questionnaires(session: Session = Depends(get_session)) -> list[QuestionnaireRead]:
+@router.get("/", response_model=QuestionnairePage, summary="List All Questionnaires")
+async def list_questionnaires(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_async_read_session),
+) -> QuestionnairePage:
     """
-    List all questionnaires in the system.
+    List the questionnaires in the system, a page at a time.
     """
-    return service_list_questionnaires(session)
+    return await service_list_questionnaires(session, limit=limit, cursor=cursor)
 
 
@@ -3,6 +3,9 @@ from typing import Optional
 
 from pydantic import BaseModel, ConfigDict
 
+from features.answers.models import AnswerRead
+from features.questions.models import QuestionRead
+
 
 class QuestionnaireCreate(BaseModel):
     title: str  # Title of the questionnaire
@@ -22,6 +25,11 @@ class QuestionnaireRead(BaseModel):
     updated_at: datetime  # Timestamp when the questionnaire was last updated
 
 
+class QuestionnairePage(BaseModel):
+    items: list[QuestionnaireRead]  # Questionnaires in creation order
+    next_cursor: Optional[str] = None  # Pass as `cursor` to fetch the next page; None on the last page
+
+
 class QuestionnaireUpdate(BaseModel):
     title: Optional[str] = None  # Title of the questionnaire
     description: Optional[str] = None  # Optional description of the questionnaire
@@ -29,3 +37,42 @@ class QuestionnaireUpdate(BaseModel):
     is_active: Optional[bool] = None  # Whether the questionnaire is active or not
 
 
+class BundledQuestionRead(QuestionRead):
+    answers: list[AnswerRead]  # Answers available for the question
+
+
+class QuestionnaireBundleRead(BaseModel):
+    questionnaire: QuestionnaireRead  # The questionnaire itself
+    questions: list[BundledQuestionRead]  # Questions in questionnaire order
+
+
+
+
+class VersionedAnswerRead(BaseModel):
+    id: str  # Unique identifier for the answer
+    answer_text: str  # The text of the answer
+    score_value: int  # Score value for the answer
+
+
+class VersionedQuestionRead(BaseModel):
+    id: str  # Unique identifier for the question
+    question_text: str  # The text of the question
+    competency: Optional[str] = None  # Competency the question scores
+    explanation: Optional[str] = None  # Optional explanation or context for the question
+    answers: list[VersionedAnswerRead]  # Answers available for the question
+
+
+class QuestionnaireSnapshot(BaseModel):
+    questionnaire_id: str  # The questionnaire this is a version of
+    title: str  # Title of the questionnaire
+    description: Optional[str] = None  # Optional description of the questionnaire
+    questions: list[VersionedQuestionRead]  # Questions in questionnaire order
+
+
+class QuestionnaireVersionRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    content_hash: str  # sha256 of the snapshot; identifies the version
+    questionnaire_id: str  # The questionnaire this is a version of
+    version: int  # 1, 2, ... per questionnaire
+    content: QuestionnaireSnapshot  # The immutable snapshot
+    created_at: datetime  # Timestamp when the version was published
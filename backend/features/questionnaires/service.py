@@ -1,17 +1,34 @@
+import hashlib
 import logging
 
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from database.pagination import DEFAULT_PAGE_SIZE, page_rows, paginate
+from entities.answers import Answer
+from entities.questionnaire_versions import QuestionnaireVersion
 from entities.questionnaires import Questionnaire
+from entities.questions import Question
+from features.answers.models import AnswerRead
+from features.results.answer_key import invalidate_answer_key
 
-from .models import QuestionnaireCreate, QuestionnaireRead, QuestionnaireUpdate
+from .models import (
+    BundledQuestionRead,
+    QuestionnaireBundleRead,
+    QuestionnaireCreate,
+    QuestionnairePage,
+    QuestionnaireRead,
+    QuestionnaireSnapshot,
+    QuestionnaireUpdate,
+    QuestionnaireVersionRead,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def create_questionnaire(question: QuestionnaireCreate, session: Session) -> QuestionnaireRead:
+async def create_questionnaire(question: QuestionnaireCreate, session: AsyncSession) -> QuestionnaireRead:
     """
     Create a new questionnaire in the system.
     """
@@ -22,18 +39,20 @@ def create_questionnaire(question: QuestionnaireCreate, session: Session) -> Que
         is_active=question.is_active
     )
     session.add(new_questionnaire)
-    session.commit()
-    session.refresh(new_questionnaire)
+    await session.commit()
+    invalidate_answer_key()
+    await session.refresh(new_questionnaire)
     logger.info(f"Questionnaire created: {new_questionnaire.id}")
+    await publish_questionnaire_version(new_questionnaire.id, session)
     return QuestionnaireRead.model_validate(new_questionnaire)
 
 
-def get_questionnaire_by_id(questionnaire_id: str, session: Session) -> QuestionnaireRead:
+async def get_questionnaire_by_id(questionnaire_id: str, session: AsyncSession) -> QuestionnaireRead:
     """
     Retrieve a questionnaire by its ID.
     """
     statement = select(Questionnaire).where(Questionnaire.id == questionnaire_id)
-    questionnaire = session.exec(statement).first()
+    questionnaire = (await session.exec(statement)).first()
     if not questionnaire:
         logger.error(f"Questionnaire with ID {questionnaire_id} not found")
         raise HTTPException(status_code=404, detail="Questionnaire not found")
@@ -41,12 +60,12 @@ def get_questionnaire_by_id(questionnaire_id: str, session: Session) -> Question
     return QuestionnaireRead.model_validate(questionnaire)
 
 
-def update_questionnaire(questionnaire_update: QuestionnaireUpdate, questionnaire_id: str, session: Session) -> QuestionnaireRead:
+async def update_questionnaire(questionnaire_update: QuestionnaireUpdate, questionnaire_id: str, session: AsyncSession) -> QuestionnaireRead:
     """
     Update an existing questionnaire's information.
     """
     statement = select(Questionnaire).where(Questionnaire.id == questionnaire_id)
-    questionnaire = session.exec(statement).first()
+    questionnaire = (await session.exec(statement)).first()
     if not questionnaire:
         logger.error(f"Questionnaire with ID {questionnaire_id} not found")
         raise HTTPException(status_code=404, detail="Questionnaire not found")
@@ -55,43 +74,201 @@ def update_questionnaire(questionnaire_update: QuestionnaireUpdate, questionnair
         setattr(questionnaire, key, value)
 
     session.add(questionnaire)
-    session.commit()
-    session.refresh(questionnaire)
+    await session.commit()
+    invalidate_answer_key()
+    await session.refresh(questionnaire)
     logger.info(f"Questionnaire updated: {questionnaire.id}")
+    await publish_questionnaire_version(questionnaire.id, session)
     return QuestionnaireRead.model_validate(questionnaire)
 
 
-def delete_questionnaire(questionnaire_id: str, session: Session):
+async def delete_questionnaire(questionnaire_id: str, session: AsyncSession):
     """
     Delete a questionnaire by its ID.
     """
     statement = select(Questionnaire).where(Questionnaire.id == questionnaire_id)
-    questionnaire = session.exec(statement).first()
+    questionnaire = (await session.exec(statement)).first()
     if not questionnaire:
         logger.error(f"Questionnaire with ID {questionnaire_id} not found")
         raise HTTPException(status_code=404, detail="Questionnaire not found")
 
-    session.delete(questionnaire)
-    session.commit()
+    await session.delete(questionnaire)
+    await session.commit()
+    invalidate_answer_key()
     logger.info(f"Questionnaire deleted: {questionnaire.id}")
     return {"detail": "Questionnaire deleted successfully"}
 
 
-def list_questionnaires(session: Session) -> list[QuestionnaireRead]:
+async def list_questionnaires(
+    session: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None
+) -> QuestionnairePage:
     """
-    List all questionnaires in the system.
+    List a page of the questionnaires in the system, oldest first.
     """
-    statement = select(Questionnaire)
-    questionnaires = session.exec(statement).all()
+    statement = paginate(
+        select(Questionnaire), Questionnaire.created_at, Questionnaire.id, cursor, limit, descending=False
+    )
+    questionnaires, next_cursor = page_rows(
+        (await session.exec(statement)).all(),
+        limit,
+        lambda questionnaire: (questionnaire.created_at, questionnaire.id),
+    )
     if not questionnaires:
         logger.info("No questionnaires found")
-        return []
-    
-    logger.info(f"Retrieved {len(questionnaires)} questionnaires")
-    return [QuestionnaireRead.model_validate(questionnaire) for questionnaire in questionnaires]
+    else:
+        logger.info(f"Retrieved {len(questionnaires)} questionnaires")
+    return QuestionnairePage(
+        items=[QuestionnaireRead.model_validate(questionnaire) for questionnaire in questionnaires],
+        next_cursor=next_cursor,
+    )
+
+
+async def get_questionnaire_bundle(questionnaire_id: str, session: AsyncSession) -> QuestionnaireBundleRead:
+    """
+    Retrieve a questionnaire together with its ordered questions and their answers.
+    Uses one query for the questions and one for the answers instead of one per question.
+    """
+    questionnaire = await get_questionnaire_by_id(questionnaire_id, session)
+    question_ids = questionnaire.questions
+    if not question_ids:
+        return QuestionnaireBundleRead(questionnaire=questionnaire, questions=[])
+
+    questions = (
+        await session.exec(select(Question).where(Question.id.in_(question_ids)))
+    ).all()
+    answers = (
+        await session.exec(
+            select(Answer)
+            .where(Answer.question_id.in_(question_ids))
+            .order_by(Answer.created_at, Answer.id)
+        )
+    ).all()
+
+    answers_by_qid: dict[str, list[AnswerRead]] = {}
+    for answer in answers:
+        answers_by_qid.setdefault(answer.question_id, []).append(
+            AnswerRead.model_validate(answer)
+        )
 
+    question_by_id = {question.id: question for question in questions}
+    bundled_questions: list[BundledQuestionRead] = []
+    for question_id in question_ids:
+        question = question_by_id.get(question_id)
+        if not question:
+            logger.warning(
+                f"Question with ID {question_id} referenced by questionnaire {questionnaire.id} not found"
+            )
+            continue
+        bundled_questions.append(
+            BundledQuestionRead.model_validate(
+                {
+                    **question.model_dump(),
+                    "answers": answers_by_qid.get(question_id, []),
+                }
+            )
+        )
 
+    logger.info(
+        f"Questionnaire bundle retrieved: {questionnaire.id} ({len(bundled_questions)} questions)"
+    )
+    return QuestionnaireBundleRead(questionnaire=questionnaire, questions=bundled_questions)
+
+
+def get_questionnaire_bundle_etag(bundle: QuestionnaireBundleRead) -> str:
+    """
+    Build a strong ETag from the serialized bundle so any content edit changes it.
+    """
+    digest = hashlib.sha256(bundle.model_dump_json().encode("utf-8")).hexdigest()
+    return f'"{digest}"'
 
 
 
+def build_questionnaire_snapshot(bundle: QuestionnaireBundleRead) -> QuestionnaireSnapshot:
+    """
+    Keep only the content a version is defined by: texts, order, competencies and scores
+    (no timestamps or flags, so an edit that changes nothing yields the same hash).
+    """
+    return QuestionnaireSnapshot.model_validate(
+        {
+            "questionnaire_id": bundle.questionnaire.id,
+            "title": bundle.questionnaire.title,
+            "description": bundle.questionnaire.description,
+            "questions": [
+                {
+                    **question.model_dump(include={"id", "question_text", "competency", "explanation"}),
+                    "answers": [
+                        answer.model_dump(include={"id", "answer_text", "score_value"})
+                        for answer in question.answers
+                    ],
+                }
+                for question in bundle.questions
+            ],
+        }
+    )
+
 
+def get_snapshot_hash(snapshot: QuestionnaireSnapshot) -> str:
+    return hashlib.sha256(snapshot.model_dump_json().encode("utf-8")).hexdigest()
+
+
+async def publish_questionnaire_version(questionnaire_id: str, session: AsyncSession) -> QuestionnaireVersionRead:
+    """
+    Snapshot the questionnaire's current content as an immutable version and commit.
+
+    Idempotent: when the content matches an existing version (same hash) that version
+    is returned, so this can be called whenever the current version is needed.
+    """
+    snapshot = build_questionnaire_snapshot(await get_questionnaire_bundle(questionnaire_id, session))
+    content_hash = get_snapshot_hash(snapshot)
+    for _ in range(3):
+        existing = await session.get(QuestionnaireVersion, content_hash)
+        if existing:
+            return QuestionnaireVersionRead.model_validate(existing)
+
+        latest = await get_latest_questionnaire_version(questionnaire_id, session)
+        version = QuestionnaireVersion(
+            content_hash=content_hash,
+            questionnaire_id=questionnaire_id,
+            version=(latest.version if latest else 0) + 1,
+            content=snapshot.model_dump(mode="json"),
+        )
+        version_read = QuestionnaireVersionRead.model_validate(version)
+        session.add(version)
+        try:
+            await session.commit()
+        except IntegrityError:
+            # Another publisher took this version number (or this very content); look again
+            await session.rollback()
+            continue
+        logger.info(f"Questionnaire {questionnaire_id} version {version_read.version} published: {content_hash}")
+        return version_read
+
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT, detail="Questionnaire is being published concurrently, retry"
+    )
+
+
+async def get_latest_questionnaire_version(
+    questionnaire_id: str, session: AsyncSession
+) -> QuestionnaireVersion | None:
+    """
+    Return the highest published version of a questionnaire, if any.
+    """
+    statement = (
+        select(QuestionnaireVersion)
+        .where(QuestionnaireVersion.questionnaire_id == questionnaire_id)
+        .order_by(QuestionnaireVersion.version.desc())
+        .limit(1)
+    )
+    return (await session.exec(statement)).first()
+
+
+async def get_questionnaire_version(content_hash: str, session: AsyncSession) -> QuestionnaireVersionRead:
+    """
+    Retrieve a published questionnaire version by its content hash.
+    """
+    version = await session.get(QuestionnaireVersion, content_hash)
+    if not version:
+        logger.error(f"Questionnaire version {content_hash} not found")
+        raise HTTPException(status_code=404, detail="Questionnaire version not found")
+    return QuestionnaireVersionRead.model_validate(version)
@@ -1,12 +1,14 @@
 import logging
 
-from fastapi import APIRouter, Depends, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, Query, status
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from database.core import get_session
+from database.core import get_async_session
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from database.replicas import get_async_read_session
 from entities.questions import Question
 
-from .models import QuestionCreate, QuestionRead, QuestionUpdate
+from .models import QuestionCreate, QuestionPage, QuestionRead, QuestionUpdate
 from .service import (
     create_question as service_create_question,
     delete_question as service_delete_question,
@@ -20,42 +22,46 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/questions", tags=["questions"])
 
 @router.post("/", response_model=QuestionRead, summary="Create Question")
-def create_question(question: QuestionCreate, session: Session = Depends(get_session)) -> QuestionRead:
+async def create_question(question: QuestionCreate, session: AsyncSession = Depends(get_async_session)) -> QuestionRead:
     """
     Create a new question in the system.
     """
-    return service_create_question(question, session)
+    return await service_create_question(question, session)
 
 
 @router.get("/{question_id}", response_model=QuestionRead, summary="Get Question by ID")
-def get_question(question_id: str, session: Session = Depends(get_session)) -> QuestionRead:
+async def get_question(question_id: str, session: AsyncSession = Depends(get_async_read_session)) -> QuestionRead:
     """
     Retrieve a question by its ID.
     """
-    return service_get_question_by_id(question_id, session)
+    return await service_get_question_by_id(question_id, session)
 
 
 @router.patch("/{question_id}", response_model=QuestionRead, summary="Update Question")
-def update_question(
-    question_update: QuestionUpdate, question_id: str, session: Session = Depends(get_session)
+async def update_question(
+    question_update: QuestionUpdate, question_id: str, session: AsyncSession = Depends(get_async_session)
 ) -> QuestionRead:
     """
     Update an existing question's information.
     """
-    return service_update_question(question_update, question_id, session)
+    return await service_update_question(question_update, question_id, session)
 
 
 @router.delete("/{question_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete Question")
-def delete_question(question_id: str, session: Session = Depends(get_session)):
+async def delete_question(question_id: str, session: AsyncSession = Depends(get_async_session)):
     """
     Delete a question by its ID.
     """
-    return service_delete_question(question_id, session)
+    return await service_delete_question(question_id, session)
 
 
-@router.get("/", response_model=list[QuestionRead], summary="List All Questions")
-def list_questions(session: Session = Depends(get_session)) -> list[QuestionRead]:
+@router.get("/", response_model=QuestionPage, summary="List All Questions")
+async def list_questions(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_async_read_session),
+) -> QuestionPage:
     """
-    List all questions in the system.
+    List the questions in the system, a page at a time.
     """
-    return service_list_questions(session)
\ No newline at end of file
+    return await service_list_questions(session, limit=limit, cursor=cursor)
\ No newline at end of file
@@ -21,6 +21,11 @@ class QuestionRead(BaseModel):
     updated_at: datetime  # Timestamp when the question was last updated
 
 
+class QuestionPage(BaseModel):
+    items: list[QuestionRead]  # Questions in creation order
+    next_cursor: Optional[str] = None  # Pass as `cursor` to fetch the next page; None on the last page
+
+
 class QuestionUpdate(BaseModel):
     question_text: Optional[str] = None  # The text of the question
     competency: Optional[str] = None  # Optional competency of the question
@@ -2,16 +2,20 @@ import logging
 
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from database.pagination import DEFAULT_PAGE_SIZE, page_rows, paginate
 from entities.questions import Question
+from features.results.answer_key import invalidate_answer_key
+from features.results.scoring import mark_user_results_stale
 
-from .models import QuestionCreate, QuestionRead, QuestionUpdate
+from .models import QuestionCreate, QuestionPage, QuestionRead, QuestionUpdate
 
 logger = logging.getLogger(__name__)
 
 
-def create_question(question: QuestionCreate, session: Session) -> QuestionRead:
+async def create_question(question: QuestionCreate, session: AsyncSession) -> QuestionRead:
     """
     Create a new question in the system.
     """
@@ -21,18 +25,19 @@ def create_question(question: QuestionCreate, session: Session) -> QuestionRead:
         explanation=question.explanation
     )
     session.add(new_question)
-    session.commit()
-    session.refresh(new_question)
+    await session.commit()
+    invalidate_answer_key()
+    await session.refresh(new_question)
     logger.info(f"Question created: {new_question.id}")
     return QuestionRead.model_validate(new_question)
 
 
-def get_question_by_id(question_id: str, session: Session) -> QuestionRead:
+async def get_question_by_id(question_id: str, session: AsyncSession) -> QuestionRead:
     """
     Retrieve a question by its ID.
     """
     statement = select(Question).where(Question.id == question_id)
-    question = session.exec(statement).first()
+    question = (await session.exec(statement)).first()
     if not question:
         logger.error(f"Question with ID {question_id} not found")
         raise HTTPException(status_code=404, detail="Question not found")
@@ -40,12 +45,12 @@ def get_question_by_id(question_id: str, session: Session) -> QuestionRead:
     return QuestionRead.model_validate(question)
 
 
-def update_question(question_update: QuestionUpdate, question_id: str, session: Session) -> QuestionRead:
+async def update_question(question_update: QuestionUpdate, question_id: str, session: AsyncSession) -> QuestionRead:
     """
     Update an existing question's information.
     """
     statement = select(Question).where(Question.id == question_id)
-    question = session.exec(statement).first()
+    question = (await session.exec(statement)).first()
     if not question:
         logger.error(f"Question with ID {question_id} not found")
         raise HTTPException(status_code=404, detail="Question not found")
@@ -54,40 +59,50 @@ def update_question(question_update: QuestionUpdate, question_id: str, session:
         setattr(question, key, value)
 
     session.add(question)
-    session.commit()
-    session.refresh(question)
+    await session.run_sync(lambda sync_session: mark_user_results_stale(sync_session, [question_id]))
+    await session.commit()
+    invalidate_answer_key()
+    await session.refresh(question)
     logger.info(f"Question updated: {question.id}")
     return QuestionRead.model_validate(question)
 
 
-def delete_question(question_id: str, session: Session):
+async def delete_question(question_id: str, session: AsyncSession):
     """
     Delete a question by its ID.
     """
     statement = select(Question).where(Question.id == question_id)
-    question = session.exec(statement).first()
+    question = (await session.exec(statement)).first()
     if not question:
         logger.error(f"Question with ID {question_id} not found")
         raise HTTPException(status_code=404, detail="Question not found")
 
-    session.delete(question)
-    session.commit()
+    await session.delete(question)
+    await session.run_sync(lambda sync_session: mark_user_results_stale(sync_session, [question_id]))
+    await session.commit()
+    invalidate_answer_key()
     logger.info(f"Question deleted: {question.id}")
     return {"detail": "Question deleted successfully"}
 
 
-def list_questions(session: Session) -> list[QuestionRead]:
+async def list_questions(
+    session: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None
+) -> QuestionPage:
     """
-    List all questions in the system.
+    List a page of the questions in the system, oldest first.
     """
-    statement = select(Question)
-    questions = session.exec(statement).all()
+    statement = paginate(select(Question), Question.created_at, Question.id, cursor, limit, descending=False)
+    questions, next_cursor = page_rows(
+        (await session.exec(statement)).all(), limit, lambda question: (question.created_at, question.id)
+    )
     if not questions:
         logger.info("No questions found")
-        return []
-    
-    logger.info(f"Retrieved {len(questions)} questions")
-    return [QuestionRead.model_validate(question) for question in questions]
+    else:
+        logger.info(f"Retrieved {len(questions)} questions")
+    return QuestionPage(
+        items=[QuestionRead.model_validate(question) for question in questions],
+        next_cursor=next_cursor,
+    )
 
 
 
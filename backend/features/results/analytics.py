@@ -0,0 +1,255 @@
+"""
+Cohort competency analytics served from pre-aggregated score buckets.
+
+Percentages are whole numbers (0-100), so a cohort's distribution is fully
+described by how many completed records landed on each score. Those counts
+live in `competency_score_buckets` and are adjusted incrementally whenever a
+result is materialized or a completed record is deleted, so reads never scan
+`user_answers` or `user_results`.
+"""
+
+import hmac
+import logging
+import math
+
+from fastapi import Header, HTTPException, status
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from config import settings
+from entities.competency_score_buckets import CompetencyScoreBucket
+from entities.users import User
+
+from .models import CompetencyDistributionRead, HistogramBucketRead
+
+logger = logging.getLogger(__name__)
+
+# (lower bound, upper bound or None, label) in years of experience
+EXPERIENCE_BANDS: list[tuple[int, int | None, str]] = [
+    (0, 2, "0-2"),
+    (3, 5, "3-5"),
+    (6, 10, "6-10"),
+    (11, 20, "11-20"),
+    (21, None, "21+"),
+]
+
+HISTOGRAM_BUCKET_WIDTH = 10
+PERCENTILES = (25, 50, 75, 90)
+
+
+def require_analytics_key(x_analytics_key: str | None = Header(None)) -> None:
+    """
+    FastAPI dependency admitting requests whose X-Analytics-Key header matches
+    ANALYTICS_API_KEY. Analytics are disabled (404) while that setting is unset.
+    """
+    if not settings.ANALYTICS_API_KEY:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Analytics are disabled")
+    if x_analytics_key is None or not hmac.compare_digest(
+        x_analytics_key.encode(), settings.ANALYTICS_API_KEY.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid analytics key")
+
+
+def experience_band(years_experience: int | None) -> str:
+    """
+    Map years of experience to its cohort band label.
+    """
+    years = max(0, years_experience or 0)
+    for lower, upper, label in EXPERIENCE_BANDS:
+        if years >= lower and (upper is None or years <= upper):
+            return label
+    return EXPERIENCE_BANDS[-1][2]
+
+
+def cohort_of(user: User) -> tuple[str, str, str]:
+    """
+    Return the (industry, role, experience band) cohort of a user.
+    """
+    role = getattr(user.role, "value", user.role)
+    return (
+        user.industry or "Unknown",
+        role or "Unknown",
+        experience_band(user.years_experience),
+    )
+
+
+def apply_competency_distribution(
+    questionnaire_id: str,
+    cohort: tuple[str, str, str],
+    results: dict[str, float],
+    delta: int,
+    session: Session,
+) -> None:
+    """
+    Add (delta=1) or remove (delta=-1) one record's scores to its cohort buckets.
+    Does not commit; call inside the transaction that stores or deletes the result.
+    """
+    if not results:
+        return
+    industry, role, band = cohort
+    rows = [
+        {
+            "questionnaire_id": questionnaire_id,
+            "industry": industry,
+            "role": role,
+            "experience_band": band,
+            "competency": competency,
+            "score": int(round(score)),
+            "count": max(delta, 0),
+        }
+        for competency, score in results.items()
+    ]
+    table = CompetencyScoreBucket.__table__
+    stmt = insert(table).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            table.c.questionnaire_id,
+            table.c.industry,
+            table.c.role,
+            table.c.experience_band,
+            table.c.competency,
+            table.c.score,
+        ],
+        set_={
+            "count": table.c.count + delta,
+            "updated_at": func.now(),
+        },
+    )
+    session.execute(stmt)
+
+
+def _percentile(histogram: list[int], total: int, percentile: int) -> float:
+    """
+    Nearest-rank percentile of a 0-100 score histogram.
+    """
+    rank = max(1, math.ceil(percentile / 100 * total))
+    running = 0
+    for score, count in enumerate(histogram):
+        running += count
+        if running >= rank:
+            return float(score)
+    return 100.0
+
+
+def get_competency_distributions(
+    questionnaire_id: str,
+    session: Session,
+    industry: str | None = None,
+    role: str | None = None,
+    experience_band: str | None = None,
+) -> list[CompetencyDistributionRead]:
+    """
+    Return per-competency score distributions for a questionnaire cohort.
+    Competencies scored by fewer than ANALYTICS_MIN_COHORT_SIZE records are
+    left out, so a narrow filter cannot reveal an individual's scores.
+    """
+    stmt = (
+        select(
+            CompetencyScoreBucket.competency,
+            CompetencyScoreBucket.score,
+            func.sum(CompetencyScoreBucket.count),
+        )
+        .where(
+            (CompetencyScoreBucket.questionnaire_id == questionnaire_id)
+            & (CompetencyScoreBucket.count > 0)
+        )
+        .group_by(CompetencyScoreBucket.competency, CompetencyScoreBucket.score)
+    )
+    if industry:
+        stmt = stmt.where(CompetencyScoreBucket.industry == industry)
+    if role:
+        stmt = stmt.where(CompetencyScoreBucket.role == role)
+    if experience_band:
+        stmt = stmt.where(CompetencyScoreBucket.experience_band == experience_band)
+
+    histograms: dict[str, list[int]] = {}
+    for competency, score, count in session.exec(stmt).all():
+        histogram = histograms.setdefault(competency, [0] * 101)
+        histogram[min(100, max(0, score))] += int(count)
+
+    distributions: list[CompetencyDistributionRead] = []
+    for competency in sorted(histograms):
+        histogram = histograms[competency]
+        total = sum(histogram)
+        if total == 0 or total < settings.ANALYTICS_MIN_COHORT_SIZE:
+            continue
+        mean = sum(score * count for score, count in enumerate(histogram)) / total
+        buckets = []
+        for start in range(0, 100, HISTOGRAM_BUCKET_WIDTH):
+            end = start + HISTOGRAM_BUCKET_WIDTH - 1
+            if end + 1 >= 100:
+                end = 100  # Last bucket includes a perfect score
+            buckets.append(
+                HistogramBucketRead(
+                    range_start=start,
+                    range_end=end,
+                    count=sum(histogram[start : end + 1]),
+                )
+            )
+        percentiles = {p: _percentile(histogram, total, p) for p in PERCENTILES}
+        distributions.append(
+            CompetencyDistributionRead(
+                competency=competency,
+                count=total,
+                mean=round(mean, 1),
+                p25=percentiles[25],
+                p50=percentiles[50],
+                p75=percentiles[75],
+                p90=percentiles[90],
+                histogram=buckets,
+            )
+        )
+    logger.info(
+        f"Competency distributions retrieved for questionnaire {questionnaire_id}: {len(distributions)} competencies"
+    )
+    return distributions
+
+
+def _experience_band_sql(column: str) -> str:
+    cases = []
+    for lower, upper, label in EXPERIENCE_BANDS:
+        if upper is None:
+            cases.append(f"WHEN {column} >= {lower} THEN '{label}'")
+        else:
+            cases.append(f"WHEN {column} <= {upper} THEN '{label}'")
+    return f"CASE {' '.join(cases)} ELSE '{EXPERIENCE_BANDS[-1][2]}' END"
+
+
+def rebuild_competency_distributions(session: Session) -> None:
+    """
+    Recompute every bucket from `user_results` in set-based statements and commit.
+    Fills missing cohort snapshots from the current user profile first.
+    """
+    session.execute(
+        text(
+            f"""
+            UPDATE user_results AS ur
+            SET industry = COALESCE(u.industry, 'Unknown'),
+                role = COALESCE(u.role, 'Unknown'),
+                experience_band = {_experience_band_sql("GREATEST(COALESCE(u.years_experience, 0), 0)")}
+            FROM users AS u
+            WHERE ur.user_id = u.id
+              AND ur.experience_band IS NULL
+            """
+        )
+    )
+    session.execute(text("DELETE FROM competency_score_buckets"))
+    session.execute(
+        text(
+            """
+            INSERT INTO competency_score_buckets
+                (questionnaire_id, industry, role, experience_band,
+                 competency, score, count, updated_at)
+            SELECT ur.questionnaire_id, ur.industry, ur.role, ur.experience_band,
+                   kv.key, ROUND((kv.value)::numeric)::int, COUNT(*), now()
+            FROM user_results AS ur
+            CROSS JOIN LATERAL jsonb_each(ur.results) AS kv
+            WHERE ur.experience_band IS NOT NULL
+            GROUP BY ur.questionnaire_id, ur.industry, ur.role,
+                     ur.experience_band, kv.key, ROUND((kv.value)::numeric)::int
+            """
+        )
+    )
+    session.commit()
+    logger.info("Competency distributions rebuilt from user_results")
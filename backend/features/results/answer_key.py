@@ -0,0 +1,144 @@
+"""
+In-process, versioned cache of the scoring answer key.
+
+Scoring needs, for every question, its competency and the highest score any
+of its answers can earn, and for every answer, the question it belongs to and
+its score. That content only changes when an admin edits questions, answers or
+questionnaires, so it is loaded once (two queries) and served from memory
+until one of those write paths calls `invalidate_answer_key()`.
+
+Each invalidation bumps a version number. A load that started before an
+invalidation is never stored, so a concurrent edit cannot be overwritten by a
+stale snapshot. A TTL bounds staleness in multi-worker deployments where the
+edit happened in another process.
+
+Records taken against a published questionnaire version are scored with that
+version's own key instead (`get_version_answer_key`): versions are immutable,
+so those keys are cached by content hash and never invalidated.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from sqlmodel import Session, select
+
+from config import settings
+from entities.answers import Answer
+from entities.questionnaire_versions import QuestionnaireVersion
+from entities.questions import Question
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    version: int
+    # question_id -> (competency, max score across the question's answers)
+    questions: dict[str, tuple[str, int]] = field(default_factory=dict)
+    # answer_id -> (question_id, score_value)
+    answers: dict[str, tuple[str, int]] = field(default_factory=dict)
+
+
+_lock = threading.Lock()
+_version = 0
+_cached: AnswerKey | None = None
+_cached_at = 0.0
+
+_VERSION_KEYS_MAX_ENTRIES = 256
+_version_keys: "OrderedDict[str, AnswerKey]" = OrderedDict()  # content hash -> key
+
+
+def _load_answer_key(version: int, session: Session) -> AnswerKey:
+    questions = session.exec(select(Question.id, Question.competency)).all()
+    answers = session.exec(
+        select(Answer.id, Answer.question_id, Answer.score_value)
+    ).all()
+
+    max_score_by_qid: dict[str, int] = {}
+    answer_map: dict[str, tuple[str, int]] = {}
+    for answer_id, question_id, score_value in answers:
+        answer_map[answer_id] = (question_id, score_value)
+        prev = max_score_by_qid.get(question_id)
+        if prev is None or score_value > prev:
+            max_score_by_qid[question_id] = score_value
+
+    question_map = {
+        question_id: (competency or "Unknown", max_score_by_qid.get(question_id, 0))
+        for question_id, competency in questions
+    }
+    return AnswerKey(version=version, questions=question_map, answers=answer_map)
+
+
+def get_answer_key(session: Session, fresh: bool = False) -> AnswerKey:
+    """
+    Return the cached answer key, loading it from the database on a miss.
+    With `fresh`, always load it (and refresh the cache): the cache may lag an
+    edit made by another process by up to the TTL, which is fine for display
+    but not for scores that get stored as current.
+    """
+    global _cached, _cached_at
+
+    with _lock:
+        version = _version
+        cached = _cached
+        recent = time.monotonic() - _cached_at < settings.ANSWER_KEY_CACHE_TTL_SECONDS
+    if not fresh and cached is not None and cached.version == version and recent:
+        return cached
+
+    answer_key = _load_answer_key(version, session)
+    with _lock:
+        if _version == version:
+            _cached = answer_key
+            _cached_at = time.monotonic()
+    logger.info(
+        f"Answer key loaded (version {version}): "
+        f"{len(answer_key.questions)} questions, {len(answer_key.answers)} answers"
+    )
+    return answer_key
+
+
+def invalidate_answer_key() -> None:
+    """
+    Drop the cached answer key. Call after committing any scoring content change.
+    """
+    global _version, _cached
+
+    with _lock:
+        _version += 1
+        _cached = None
+    logger.info(f"Answer key invalidated (version {_version})")
+
+
+def _version_answer_key(content: dict) -> AnswerKey:
+    question_map: dict[str, tuple[str, int]] = {}
+    answer_map: dict[str, tuple[str, int]] = {}
+    for question in content["questions"]:
+        scores = [answer["score_value"] for answer in question["answers"]]
+        question_map[question["id"]] = (question["competency"] or "Unknown", max(scores, default=0))
+        for answer in question["answers"]:
+            answer_map[answer["id"]] = (question["id"], answer["score_value"])
+    return AnswerKey(version=0, questions=question_map, answers=answer_map)
+
+
+def get_version_answer_key(content_hash: str, session: Session) -> AnswerKey:
+    """
+    Return the answer key of a published questionnaire version.
+    """
+    with _lock:
+        cached = _version_keys.get(content_hash)
+        if cached is not None:
+            _version_keys.move_to_end(content_hash)
+            return cached
+
+    version = session.get(QuestionnaireVersion, content_hash)
+    if version is None:
+        raise LookupError(f"Questionnaire version {content_hash} not found")
+    answer_key = _version_answer_key(version.content)
+    with _lock:
+        _version_keys[content_hash] = answer_key
+        while len(_version_keys) > _VERSION_KEYS_MAX_ENTRIES:
+            _version_keys.popitem(last=False)
+    return answer_key
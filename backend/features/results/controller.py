@@ -1,14 +1,18 @@
 import logging
 
 from fastapi import APIRouter, Depends, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from database.core import get_session
+from database.replicas import get_async_read_session
 from entities.user_answers import UserAnswer
 from entities.users import User
 from features.auth.service import get_current_user
 
-from .models import UserResultRead
+from .analytics import (
+    get_competency_distributions as service_get_competency_distributions,
+    require_analytics_key,
+)
+from .models import CompetencyDistributionRead, UserResultRead
 from .service import (
     get_user_results_by_record_id as service_get_user_results_by_record_id,
 )
@@ -22,14 +26,46 @@ router = APIRouter(prefix="/results", tags=["results"])
     response_model=UserResultRead,
     summary="Get computed results by user answers record ID",
 )
-def get_user_results_by_record_id(
+async def get_user_results_by_record_id(
     user_answers_record_id: str,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_read_session),
 ) -> UserResultRead:
     """
     Retrieve a user answers record by its ID.
     """
-    return service_get_user_results_by_record_id(
-        user_answers_record_id, current_user, session
+    return await session.run_sync(
+        lambda sync_session: service_get_user_results_by_record_id(
+            user_answers_record_id, current_user, sync_session
+        )
+    )
+
+
+@router.get(
+    "/analytics/{questionnaire_id}",
+    response_model=list[CompetencyDistributionRead],
+    summary="Get cohort competency distributions for a questionnaire",
+    dependencies=[Depends(require_analytics_key)],
+)
+async def get_competency_distributions(
+    questionnaire_id: str,
+    industry: str | None = None,
+    role: str | None = None,
+    experience_band: str | None = None,
+    session: AsyncSession = Depends(get_async_read_session),
+) -> list[CompetencyDistributionRead]:
+    """
+    Retrieve aggregate competency distributions (mean, percentiles, histogram)
+    for completed records, optionally filtered by industry, role and experience band.
+    Competencies with fewer than ANALYTICS_MIN_COHORT_SIZE records are omitted.
+    Requires the X-Analytics-Key header.
+    """
+    return await session.run_sync(
+        lambda sync_session: service_get_competency_distributions(
+            questionnaire_id,
+            sync_session,
+            industry=industry,
+            role=role,
+            experience_band=experience_band,
+        )
     )
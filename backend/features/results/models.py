@@ -12,3 +12,20 @@ class UserResultRead(BaseModel):
     # Mapping of competency -> percentage (0-100)
     results: dict[str, float]
     completed_at: Optional[datetime] = None  # Optional completion date if the questionnaire is completed
+
+
+class HistogramBucketRead(BaseModel):
+    range_start: int  # Inclusive lower bound of the percentage range
+    range_end: int  # Inclusive upper bound of the percentage range
+    count: int  # Number of completed records in the range
+
+
+class CompetencyDistributionRead(BaseModel):
+    competency: str
+    count: int  # Number of completed records scored for this competency
+    mean: float
+    p25: float
+    p50: float
+    p75: float
+    p90: float
+    histogram: list[HistogramBucketRead]
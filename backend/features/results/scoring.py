@@ -0,0 +1,220 @@
+"""
+Competency scoring and the materialized `user_results` rows built from it.
+
+Completed UserAnswer records are immutable, so their scores are computed once
+when `completed_at` is first set and stored in `user_results`. Records taken
+against a published questionnaire version are scored with that version and
+never change; for older records, scoring content edits mark stored rows stale
+and stale or missing rows are recomputed by `backfill_user_results` (see
+helpers/materialize_results.py).
+"""
+
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import String, update
+from sqlalchemy.dialects.postgresql import array, insert
+from sqlmodel import Session, select
+
+from entities.user_answers import UserAnswer
+from entities.user_results import UserResult
+from entities.users import User
+
+from .analytics import apply_competency_distribution, cohort_of
+from .answer_key import AnswerKey, get_answer_key, get_version_answer_key
+
+logger = logging.getLogger(__name__)
+
+
+def compute_competency_scores(
+    user_answer_dict: dict[str, str], answer_key: AnswerKey
+) -> dict[str, float]:
+    """
+    Compute competency -> percentage (0-100) for a question_id -> answer_id mapping.
+    """
+    # Map selected answers (by id) to their question and score
+    selected_by_qid: dict[str, int] = {}
+    for answer_id in user_answer_dict.values():
+        selected = answer_key.answers.get(answer_id)
+        if selected is not None:
+            question_id, score_value = selected
+            selected_by_qid[question_id] = score_value
+
+    # Aggregate per competency
+    sum_selected: dict[str, float] = {}
+    sum_max: dict[str, float] = {}
+
+    for qid in user_answer_dict:
+        question = answer_key.questions.get(qid)
+        if question is None:
+            continue
+        comp, max_score = question
+        selected = float(selected_by_qid.get(qid, 0))
+        max_score = float(max_score)
+        if max_score <= 0:
+            # Skip malformed questions without scoring
+            continue
+        sum_selected[comp] = sum_selected.get(comp, 0.0) + selected
+        sum_max[comp] = sum_max.get(comp, 0.0) + max_score
+
+    # Compute percentages (0-100)
+    competence_scores: dict[str, float] = {}
+    for comp, max_total in sum_max.items():
+        sel_total = sum_selected.get(comp, 0.0)
+        pct = 0.0
+        if max_total > 0:
+            pct = (sel_total / max_total) * 100.0
+        # Clamp and round to whole numbers for UI
+        pct = max(0.0, min(100.0, round(pct)))
+        competence_scores[comp] = pct
+    return competence_scores
+
+
+def materialize_user_result(
+    user_answers_record: UserAnswer,
+    user: User,
+    answer_key: AnswerKey | None,
+    session: Session,
+) -> dict[str, float]:
+    """
+    Compute and upsert the stored results of a completed record, keeping the
+    cohort analytics buckets in step. A record taken against a questionnaire
+    version is scored with that version's key; any other record with
+    `answer_key`, which must be freshly loaded since the row is stored as not
+    stale, or with a key loaded here when None.
+    Does not commit.
+    """
+    if user_answers_record.questionnaire_version_id:
+        answer_key = get_version_answer_key(user_answers_record.questionnaire_version_id, session)
+    elif answer_key is None:
+        answer_key = get_answer_key(session, fresh=True)
+    results = compute_competency_scores(user_answers_record.answers or {}, answer_key)
+    cohort = cohort_of(user)
+
+    previous = session.get(UserResult, user_answers_record.id)
+    if previous is not None and previous.experience_band is not None:
+        # Rescoring: take the old scores out of the cohort they were counted in
+        apply_competency_distribution(
+            previous.questionnaire_id,
+            (previous.industry, previous.role, previous.experience_band),
+            previous.results,
+            -1,
+            session,
+        )
+        cohort = (previous.industry, previous.role, previous.experience_band)
+
+    industry, role, band = cohort
+    stmt = insert(UserResult.__table__).values(
+        user_answers_record_id=user_answers_record.id,
+        user_id=user_answers_record.user_id,
+        questionnaire_id=user_answers_record.questionnaire_id,
+        results=results,
+        is_stale=False,
+        industry=industry,
+        role=role,
+        experience_band=band,
+        completed_at=user_answers_record.completed_at,
+        computed_at=datetime.now(timezone.utc),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserResult.__table__.c.user_answers_record_id],
+        set_={
+            "results": stmt.excluded.results,
+            "is_stale": False,
+            "industry": stmt.excluded.industry,
+            "role": stmt.excluded.role,
+            "experience_band": stmt.excluded.experience_band,
+            "completed_at": stmt.excluded.completed_at,
+            "computed_at": stmt.excluded.computed_at,
+        },
+    )
+    session.execute(stmt)
+    apply_competency_distribution(
+        user_answers_record.questionnaire_id, cohort, results, 1, session
+    )
+    if previous is not None:
+        # Keep the identity map in step with the upsert for later reads
+        session.expire(previous)
+    return results
+
+
+def discard_user_result(user_answers_record_id: str, session: Session) -> None:
+    """
+    Remove a record's scores from the cohort analytics buckets before the record
+    is deleted; the `user_results` row itself cascades. Does not commit.
+    """
+    previous = session.get(UserResult, user_answers_record_id)
+    if previous is None or previous.experience_band is None:
+        return
+    apply_competency_distribution(
+        previous.questionnaire_id,
+        (previous.industry, previous.role, previous.experience_band),
+        previous.results,
+        -1,
+        session,
+    )
+
+
+def mark_user_results_stale(session: Session, question_ids: list[str]) -> None:
+    """
+    Flag for recomputation the stored results of records answering any of
+    `question_ids`, after a change to those questions or their answers.
+    Results of records taken against a published questionnaire version are
+    unaffected by edits and keep their scores.
+    Does not commit; call inside the transaction that changes the content.
+    """
+    unversioned = select(UserAnswer.id).where(
+        UserAnswer.questionnaire_version_id.is_(None),
+        UserAnswer.answers.has_any(array(question_ids, type_=String)),
+    )
+    session.execute(
+        update(UserResult)
+        .where(
+            UserResult.is_stale.is_(False),
+            UserResult.user_answers_record_id.in_(unversioned),
+        )
+        .values(is_stale=True)
+    )
+
+
+def backfill_user_results(
+    session: Session, recompute_all: bool = False, batch_size: int = 500
+) -> int:
+    """
+    Materialize results for completed records that have none or whose stored
+    results are stale. With `recompute_all`, every completed record is rescored.
+    Commits once per batch and returns the number of records written.
+    """
+    answer_key = get_answer_key(session, fresh=True)
+    written = 0
+    last_id = ""
+    while True:
+        stmt = (
+            select(UserAnswer, User)
+            .join(User, User.id == UserAnswer.user_id)
+            .outerjoin(
+                UserResult,
+                UserResult.user_answers_record_id == UserAnswer.id,
+            )
+            .where(
+                (UserAnswer.completed_at.isnot(None))
+                & (UserAnswer.id > last_id)
+            )
+            .order_by(UserAnswer.id)
+            .limit(batch_size)
+        )
+        if not recompute_all:
+            stmt = stmt.where(
+                UserResult.user_answers_record_id.is_(None)
+                | UserResult.is_stale.is_(True)
+            )
+        rows = session.exec(stmt).all()
+        if not rows:
+            break
+        for record, user in rows:
+            materialize_user_result(record, user, answer_key, session)
+        session.commit()
+        written += len(rows)
+        last_id = rows[-1][0].id
+        logger.info(f"Materialized results for {written} records so far")
+    return written
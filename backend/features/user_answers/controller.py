@@ -1,20 +1,37 @@
 import logging
 
-from fastapi import APIRouter, Depends, status
-from sqlmodel import Session
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from pydantic import ValidationError
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from database.core import get_session
+from config import settings
+from database.core import async_engine, get_async_session
+from database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from database.replicas import get_async_read_session
 from entities.user_answers import UserAnswer
 from entities.users import User
-from features.auth.service import get_current_user
+from features.auth.service import (
+    get_current_user,
+    get_token_from_cookie_or_header,
+)
 
 from .models import (
-    CompletedAnswersSummaryRead,
+    CompletedAnswersSummaryPage,
+    UserAnswersAutosave,
     UserAnswersRecordCreate,
     UserAnswersRecordRead,
     UserAnswersRecordUpdate,
 )
 from .service import (  # get_user_answers_by_questionnaire as service_get_user_answers_by_questionnaire,; get_user_answers_by_user as service_get_user_answers_by_user,
+    autosave_user_answers_record as service_autosave_user_answers_record,
     create_user_answers_record as service_create_user_answers_record,
     delete_user_answers_record as service_delete_user_answers_record,
     get_latest_completed_user_answers as service_get_latest_completed_user_answers,
@@ -34,17 +51,17 @@ router = APIRouter(prefix="/user_answers", tags=["user_answers"])
     response_model=UserAnswersRecordRead,
     summary="Create User Answers Record",
 )
-def create_user_answers_record(
+async def create_user_answers_record(
     answer: UserAnswersRecordCreate,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> UserAnswersRecordRead:
     """
     Create a new user answer record in the system.
 
     The `answer` parameter should be a dictionary mapping question IDs (str) to answer IDs (str).
     """
-    return service_create_user_answers_record(answer, current_user, session)
+    return await service_create_user_answers_record(answer, current_user, session)
 
 
 # Note: Keep parameterized routes after fixed-prefix routes to avoid conflicts
@@ -55,10 +72,10 @@ def create_user_answers_record(
     response_model=UserAnswersRecordRead,
     summary="Update User Answers Record",
 )
-def update_user_answers_record(
+async def update_user_answers_record(
     update_data: UserAnswersRecordUpdate,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> UserAnswersRecordRead:
     """
     Update an existing user answers record.
@@ -66,23 +83,104 @@ def update_user_answers_record(
     Partial updates can specify a dictionary mapping question IDs to answer IDs,
     allowing updates to specific answers without overwriting the entire set.
     """
-    return service_update_user_answers_record(
+    return await service_update_user_answers_record(
         update_data, current_user, session
     )
 
 
+@router.post(
+    "/{user_answers_record_id}/autosave",
+    response_model=UserAnswersRecordRead,
+    summary="Autosave a batch of answers",
+)
+async def autosave_user_answers_record(
+    user_answers_record_id: str,
+    autosave: UserAnswersAutosave,
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+) -> UserAnswersRecordRead:
+    """
+    Apply the answers chosen since the last save as sequence-numbered deltas, in one write.
+
+    Deltas whose `seq` was already applied are skipped, so a batch can be retried safely.
+    Set `completed_at` to also complete the record.
+    """
+    return await service_autosave_user_answers_record(
+        user_answers_record_id, autosave, current_user, session
+    )
+
+
+@router.websocket("/{user_answers_record_id}/autosave/ws")
+async def autosave_user_answers_ws(websocket: WebSocket, user_answers_record_id: str):
+    """
+    Stream autosave batches over one connection (authenticated by the session cookie).
+
+    Each message is an autosave body; each reply is `{"status": 200, "seq": ..., "record": ...}`
+    or `{"status": <error status>, "seq": ..., "detail": ...}`. A database session is only
+    held while a message is being applied.
+
+    Browser handshakes must come from FRONTEND_URL, since the SameSite=lax cookie is also
+    sent with cross-site WebSocket handshakes. The token is re-checked for every message;
+    once it expired (or the user is gone) the reply is a 401 and the socket is closed.
+    """
+    origin = websocket.headers.get("origin")
+    if origin is not None and origin != settings.FRONTEND_URL:
+        logger.warning(f"Autosave socket rejected for origin {origin}")
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    try:
+        token = get_token_from_cookie_or_header(
+            websocket.headers.get("authorization"), websocket.cookies.get("access_token")
+        )
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            await get_current_user(token, session)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                autosave = UserAnswersAutosave.model_validate_json(message)
+            except ValidationError as e:
+                await websocket.send_json(
+                    {"status": 422, "detail": e.errors(include_url=False, include_context=False)}
+                )
+                continue
+            seq = max((delta.seq for delta in autosave.deltas), default=None)
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                try:
+                    current_user = await get_current_user(token, session)
+                except HTTPException as e:
+                    await websocket.send_json({"status": e.status_code, "seq": seq, "detail": e.detail})
+                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                    return
+                try:
+                    record = await service_autosave_user_answers_record(
+                        user_answers_record_id, autosave, current_user, session
+                    )
+                except HTTPException as e:
+                    await websocket.send_json({"status": e.status_code, "seq": seq, "detail": e.detail})
+                    continue
+            await websocket.send_json({"status": 200, "seq": seq, "record": record.model_dump(mode="json")})
+    except WebSocketDisconnect:
+        logger.info(f"Autosave socket for User Answers Record {user_answers_record_id} closed")
+
+
 @router.get(
     "/recent/{questionnaire_id}",
     response_model=UserAnswersRecordRead,
     summary="Get recent in-progress User Answers for a questionnaire",
 )
-def get_recent_user_answers(
+async def get_recent_user_answers(
     questionnaire_id: str,
     days: int = 7,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_read_session),
 ) -> UserAnswersRecordRead:
-    return service_get_recent_user_answers(
+    return await service_get_recent_user_answers(
         questionnaire_id, days, current_user, session
     )
 
@@ -92,33 +190,33 @@ def get_recent_user_answers(
     response_model=UserAnswersRecordRead,
     summary="Get latest completed User Answers for a questionnaire",
 )
-def get_latest_completed_user_answers(
+async def get_latest_completed_user_answers(
     questionnaire_id: str,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_read_session),
 ) -> UserAnswersRecordRead:
-    return service_get_latest_completed_user_answers(
+    return await service_get_latest_completed_user_answers(
         questionnaire_id, current_user, session
     )
 
 @router.get(
     "/completed",
-    response_model=list[CompletedAnswersSummaryRead],
+    response_model=CompletedAnswersSummaryPage,
     summary="List completed User Answers (optionally filter by questionnaire)",
 )
-def list_completed_user_answers(
+async def list_completed_user_answers(
     questionnaire_id: str | None = None,
-    limit: int | None = None,
-    offset: int | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
-) -> list[CompletedAnswersSummaryRead]:
-    return service_list_completed_user_answers(
+    session: AsyncSession = Depends(get_async_read_session),
+) -> CompletedAnswersSummaryPage:
+    return await service_list_completed_user_answers(
         current_user=current_user,
         session=session,
         questionnaire_id=questionnaire_id,
         limit=limit,
-        offset=offset,
+        cursor=cursor,
     )
 
 
@@ -137,15 +235,15 @@ def list_completed_user_answers(
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete User Answers Record",
 )
-def delete_user_answers_record(
+async def delete_user_answers_record(
     user_answers_record_id: str,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> None:
     """
     Delete a user answers record by its ID.
     """
-    return service_delete_user_answers_record(
+    return await service_delete_user_answers_record(
         user_answers_record_id, current_user, session
     )
 
@@ -154,14 +252,14 @@ def delete_user_answers_record(
     response_model=UserAnswersRecordRead,
     summary="Get User Answers Record by ID",
 )
-def get_user_answers_by_record_id(
+async def get_user_answers_by_record_id(
     user_answers_record_id: str,
     current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_read_session),
 ) -> UserAnswersRecordRead:
     """
     Retrieve a user answers record by its ID.
     """
-    return service_get_user_answers_by_record_id(
+    return await service_get_user_answers_by_record_id(
         user_answers_record_id, current_user, session
     )
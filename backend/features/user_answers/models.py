@@ -1,13 +1,16 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+AUTOSAVE_MAX_DELTAS = 100
 
 
 class UserAnswersRecordCreate(BaseModel):
     user_id: str
     questionnaire_id: str
     answers: dict[str, str]  # Mapping of question IDs to answer IDs provided by the user
+    questionnaire_version_id: Optional[str] = None  # Content hash of the version shown; defaults to the current one
 
 
 class UserAnswersRecordRead(BaseModel):
@@ -15,16 +18,37 @@ class UserAnswersRecordRead(BaseModel):
     id: str
     user_id: str
     questionnaire_id: str
+    questionnaire_version_id: Optional[str] = None  # Published questionnaire version the answers are scored against
     answers: dict[str, str]  # Mapping of question IDs to answer IDs provided by the user
     created_at: datetime
     updated_at: datetime
     completed_at: Optional[datetime] = None  # Optional completion date if the questionnaire is completed
+    revision: int  # Incremented by every update
+    autosave_seq: int  # Highest autosave sequence number applied
 
 
 class UserAnswersRecordUpdate(BaseModel):
     id: str
     answers: Optional[dict[str, str]] = None  # Mapping of question IDs to answer IDs provided by the user
     completed_at: Optional[datetime] = None  # Optional completion date if the questionnaire is completed
+    expected_revision: Optional[int] = None  # If set, the update fails with 409 unless the record is at this revision
+
+
+class AnswerDelta(BaseModel):
+    seq: int = Field(ge=1)  # Client sequence number, strictly increasing per client and record
+    answers: dict[str, str]  # Mapping of question IDs to answer IDs chosen since the previous delta
+
+
+class UserAnswersAutosave(BaseModel):
+    client_id: str = Field(min_length=1, max_length=64)  # Identifies the sending tab; seqs are tracked per client
+    deltas: list[AnswerDelta] = Field(default_factory=list, max_length=AUTOSAVE_MAX_DELTAS)
+    completed_at: Optional[datetime] = None  # Also complete the record, after applying the deltas
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.deltas and self.completed_at is None:
+            raise ValueError("Send at least one delta or completed_at")
+        return self
 
 
 
@@ -36,3 +60,8 @@ class CompletedAnswersSummaryRead(BaseModel):
     completed_at: datetime
 
 
+class CompletedAnswersSummaryPage(BaseModel):
+    items: list[CompletedAnswersSummaryRead]
+    next_cursor: Optional[str] = None  # Pass as `cursor` to fetch the next page; None on the last page
+
+
@@ -1,16 +1,29 @@
+import json
 import logging
 from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException, status
+from sqlalchemy import BigInteger, bindparam, cast, func, literal, text, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from database.pagination import DEFAULT_PAGE_SIZE, page_rows, paginate
+from entities.questionnaire_versions import QuestionnaireVersion
 from entities.questionnaires import Questionnaire
 from entities.user_answers import UserAnswer
 from entities.users import User
+from features.questionnaires.service import publish_questionnaire_version
+from features.results.scoring import (
+    discard_user_result,
+    materialize_user_result,
+)
 
 from .models import (
+    CompletedAnswersSummaryPage,
     CompletedAnswersSummaryRead,
+    UserAnswersAutosave,
     UserAnswersRecordCreate,
     UserAnswersRecordRead,
     UserAnswersRecordUpdate,
@@ -18,11 +31,24 @@ from .models import (
 
 logger = logging.getLogger(__name__)
 
+# Answers of the autosave deltas not applied yet from the sending client, merged in seq
+# order (jsonb keeps the last duplicate key)
+_UNAPPLIED_DELTAS = text(
+    """
+    COALESCE((
+        SELECT jsonb_object_agg(delta_answer.key, delta_answer.value ORDER BY delta.seq)
+        FROM jsonb_to_recordset(CAST(:deltas AS jsonb)) AS delta(seq bigint, answers jsonb)
+        CROSS JOIN LATERAL jsonb_each(delta.answers) AS delta_answer
+        WHERE delta.seq > COALESCE(CAST(user_answers.autosave_seqs ->> :client_id AS bigint), 0)
+    ), '{}'::jsonb)
+    """
+)
+
 
-def create_user_answers_record(
+async def create_user_answers_record(
     user_answers_record: UserAnswersRecordCreate,
     current_user: User,
-    session: Session,
+    session: AsyncSession,
 ) -> UserAnswersRecordRead:
     """
     Create a new User Answers Record in the database.
@@ -32,28 +58,47 @@ def create_user_answers_record(
             f"User Answers Record with ID {user_answers_record.user_id} does not match Current User ID"
         )
         raise HTTPException(status_code=401, detail="Unauthorized Access")
+    questionnaire_version_id = await _resolve_questionnaire_version(user_answers_record, session)
     new_record = UserAnswer(
         user_id=user_answers_record.user_id,
         questionnaire_id=user_answers_record.questionnaire_id,
+        questionnaire_version_id=questionnaire_version_id,
         answers=user_answers_record.answers,
     )
     session.add(new_record)
-    session.commit()
-    session.refresh(new_record)
+    await session.commit()
+    await session.refresh(new_record)
     logger.info(f"User Answers Record: {new_record.id}")
     return new_record
 
 
-def get_user_answers_by_record_id(
-    user_answers_record_id: str, current_user: User, session: Session
-) -> UserAnswersRecordRead:
+async def _resolve_questionnaire_version(
+    user_answers_record: UserAnswersRecordCreate, session: AsyncSession
+) -> str:
     """
-    Retrieve a User Answers Record by its ID.
+    Return the content hash of the questionnaire version a new record is scored against:
+    the one the client named, or the questionnaire's current content (published if new).
+    """
+    if user_answers_record.questionnaire_version_id is None:
+        version = await publish_questionnaire_version(user_answers_record.questionnaire_id, session)
+        return version.content_hash
+    version = await session.get(QuestionnaireVersion, user_answers_record.questionnaire_version_id)
+    if not version or version.questionnaire_id != user_answers_record.questionnaire_id:
+        raise HTTPException(
+            status_code=400, detail="Unknown version of this questionnaire"
+        )
+    return version.content_hash
+
+
+def check_user_answers_access(
+    user_answers_record: UserAnswer | None,
+    user_answers_record_id: str,
+    current_user: User,
+) -> UserAnswer:
+    """
+    Ensure a looked-up User Answers Record exists and belongs to the current user.
+    Shared by the async endpoints and the sync results/plan code.
     """
-    statement = select(UserAnswer).where(
-        UserAnswer.id == user_answers_record_id
-    )
-    user_answers_record = session.exec(statement).first()
     if not user_answers_record:
         logger.error(
             f"User Answers Record with ID {user_answers_record_id} not found"
@@ -66,6 +111,20 @@ def get_user_answers_by_record_id(
             f"User Answers Record with ID {user_answers_record.id} does not match Current User ID"
         )
         raise HTTPException(status_code=401, detail="Unauthorized Access")
+    return user_answers_record
+
+
+async def get_user_answers_by_record_id(
+    user_answers_record_id: str, current_user: User, session: AsyncSession
+) -> UserAnswersRecordRead:
+    """
+    Retrieve a User Answers Record by its ID.
+    """
+    user_answers_record = check_user_answers_access(
+        await session.get(UserAnswer, user_answers_record_id),
+        user_answers_record_id,
+        current_user,
+    )
 
     logger.info(f"User Answers Record retrieved: {user_answers_record.id}")
     return UserAnswersRecordRead.model_validate(
@@ -73,34 +132,146 @@ def get_user_answers_by_record_id(
     )  # Assuming UserAnswersRecordRead has a model_validate method to convert the model
 
 
-def update_user_answers_record(
+async def update_user_answers_record(
     user_answer_update: UserAnswersRecordUpdate,
     current_user: User,
-    session: Session,
+    session: AsyncSession,
 ) -> UserAnswersRecordRead:
     """
     Update an existing User Answers Record's information.
 
     Supports partial updates to the answers JSONB field, which is a mapping of question IDs to answer IDs.
-    Merges new answers with existing ones to avoid overwriting unrelated keys.
+    The new answers are merged into the stored ones by Postgres (`answers || patch`) in a single
+    UPDATE ... RETURNING, so concurrent autosaves from two tabs never overwrite each other's keys.
+    Every update increments `revision`; when `expected_revision` is sent the update only applies
+    at that revision (409 otherwise).
     Rejects updates if the record is already completed (completed_at is not None).
     """
-    statement = select(UserAnswer).where(
-        UserAnswer.id == user_answer_update.id
-    )
-    user_answers_record = session.exec(statement).first()
+    update_data = user_answer_update.model_dump(exclude_unset=True)
+    expected_revision = update_data.pop("expected_revision", None)
+
+    values = {"revision": UserAnswer.revision + 1}
+    if update_data.get("answers") is not None:
+        values["answers"] = UserAnswer.answers.op("||")(
+            literal(update_data["answers"], type_=JSONB)
+        )
+    if update_data.get("completed_at") is not None:
+        values["completed_at"] = update_data["completed_at"]
+
+    statement = _update_open_record(user_answer_update.id, current_user, values)
+    if expected_revision is not None:
+        statement = statement.where(UserAnswer.revision == expected_revision)
+    user_answers_record = (await session.execute(statement)).scalars().first()
     if not user_answers_record:
-        logger.error(
-            f"User Answers Record with ID {user_answer_update.id} not found"
+        await _raise_update_rejected(user_answer_update.id, expected_revision, current_user, session)
+
+    await _commit_update(user_answers_record, current_user, session)
+    return UserAnswersRecordRead.model_validate(user_answers_record)
+
+
+async def autosave_user_answers_record(
+    user_answers_record_id: str,
+    autosave: UserAnswersAutosave,
+    current_user: User,
+    session: AsyncSession,
+) -> UserAnswersRecordRead:
+    """
+    Apply a batch of sequence-numbered answer deltas (and optionally complete the record) in one UPDATE.
+
+    Sequence numbers are tracked per `client_id` (one per tab): deltas are merged in `seq` order,
+    later ones winning, and only those with a `seq` above the last one applied from that client
+    are applied, the comparison being made by Postgres under the row lock; the client's entry in
+    `autosave_seqs` then advances to the highest `seq` sent. Retrying a batch is therefore a
+    no-op, as is replaying one after the record was completed by it, while another tab's lower
+    numbers are still applied.
+    """
+    values = {"revision": UserAnswer.revision + 1}
+    if autosave.deltas:
+        max_seq = max(delta.seq for delta in autosave.deltas)
+        deltas = json.dumps([delta.model_dump() for delta in autosave.deltas])
+        values["answers"] = UserAnswer.answers.op("||")(
+            _UNAPPLIED_DELTAS.bindparams(
+                bindparam("deltas", deltas), bindparam("client_id", autosave.client_id)
+            )
         )
-        raise HTTPException(
-            status_code=404, detail="User Answers Record not found"
+        client_seq = func.coalesce(
+            cast(UserAnswer.autosave_seqs[autosave.client_id].astext, BigInteger), 0
         )
-    if user_answers_record.user_id != current_user.id:
-        logger.error(
-            f"User Answers Record with ID {user_answers_record.id} does not match Current User ID"
+        values["autosave_seqs"] = UserAnswer.autosave_seqs.op("||")(
+            func.jsonb_build_object(autosave.client_id, func.greatest(client_seq, max_seq))
         )
-        raise HTTPException(status_code=401, detail="Unauthorized Access")
+        values["autosave_seq"] = func.greatest(UserAnswer.autosave_seq, max_seq)
+    if autosave.completed_at is not None:
+        values["completed_at"] = autosave.completed_at
+
+    statement = _update_open_record(user_answers_record_id, current_user, values)
+    user_answers_record = (await session.execute(statement)).scalars().first()
+    if not user_answers_record:
+        user_answers_record = check_user_answers_access(
+            await session.get(UserAnswer, user_answers_record_id),
+            user_answers_record_id,
+            current_user,
+        )
+        applied_seq = user_answers_record.autosave_seqs.get(autosave.client_id, 0)
+        if max((delta.seq for delta in autosave.deltas), default=0) <= applied_seq:
+            # A retry of a batch that was applied, and completed the record, before its response was lost
+            return UserAnswersRecordRead.model_validate(user_answers_record)
+        await _raise_update_rejected(user_answers_record_id, None, current_user, session)
+
+    await _commit_update(user_answers_record, current_user, session)
+    return UserAnswersRecordRead.model_validate(user_answers_record)
+
+
+def _update_open_record(user_answers_record_id: str, current_user: User, values: dict):
+    """
+    UPDATE ... RETURNING of the current user's record, matching only while it is not completed.
+    """
+    return (
+        update(UserAnswer)
+        .where(
+            UserAnswer.id == user_answers_record_id,
+            UserAnswer.user_id == current_user.id,
+            UserAnswer.completed_at.is_(None),
+        )
+        .values(**values)
+        .returning(UserAnswer)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+
+
+async def _commit_update(user_answers_record: UserAnswer, current_user: User, session: AsyncSession) -> None:
+    if user_answers_record.completed_at is not None:
+        # First completion: store the scores alongside the now-immutable record
+        # Scoring is sync code shared with the batch helpers; run it on this session's connection
+        await session.run_sync(
+            lambda sync_session: materialize_user_result(
+                user_answers_record,
+                current_user,
+                None,
+                sync_session,
+            )
+        )
+
+    await session.commit()
+    logger.info(
+        f"User Answers Record updated: {user_answers_record.id} (revision {user_answers_record.revision})"
+    )
+
+
+async def _raise_update_rejected(
+    user_answers_record_id: str,
+    expected_revision: int | None,
+    current_user: User,
+    session: AsyncSession,
+) -> None:
+    """
+    Explain why the conditional UPDATE matched no row. Only runs on the error path.
+    """
+    user_answers_record = check_user_answers_access(
+        await session.get(UserAnswer, user_answers_record_id),
+        user_answers_record_id,
+        current_user,
+    )
     if user_answers_record.completed_at is not None:
         logger.error(
             f"User Answers Record with ID {user_answers_record.id} is already completed and cannot be updated"
@@ -108,27 +279,18 @@ def update_user_answers_record(
         raise HTTPException(
             status_code=400, detail="Cannot update a completed User Answers Record"
         )
-
-    update_data = user_answer_update.model_dump(exclude_unset=True)
-    if "answers" in update_data and update_data["answers"] is not None:
-        existing_answers = user_answers_record.answers or {}
-        # Merge existing answers with new answers
-        merged_answers = {**existing_answers, **update_data["answers"]}
-        user_answers_record.answers = merged_answers
-        update_data.pop("answers")
-
-    for key, value in update_data.items():
-        setattr(user_answers_record, key, value)
-
-    # session.add(user_answers_record)
-    session.commit()
-    session.refresh(user_answers_record)
-    logger.info(f"User Answers Record updated: {user_answers_record.id}")
-    return UserAnswersRecordRead.model_validate(user_answers_record)
+    logger.warning(
+        f"Stale update of User Answers Record {user_answers_record.id}: expected revision "
+        f"{expected_revision}, current {user_answers_record.revision}"
+    )
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"User Answers Record was modified since it was read (now at revision {user_answers_record.revision})",
+    )
 
 
-def delete_user_answers_record(
-    user_answers_record_id: str, current_user: User, session: Session
+async def delete_user_answers_record(
+    user_answers_record_id: str, current_user: User, session: AsyncSession
 ) -> None:
     """
     Delete a User Answers Record by its ID.
@@ -136,7 +298,7 @@ def delete_user_answers_record(
     statement = select(UserAnswer).where(
         UserAnswer.id == user_answers_record_id
     )
-    user_answers_record = session.exec(statement).first()
+    user_answers_record = (await session.exec(statement)).first()
     if not user_answers_record:
         logger.error(
             f"User Answers Record with ID {user_answers_record_id} not found"
@@ -149,19 +311,21 @@ def delete_user_answers_record(
             f"User Answers Record with ID {user_answers_record.id} does not match Current User ID"
         )
         raise HTTPException(status_code=401, detail="Unauthorized Access")
-    session.delete(user_answers_record)
-    session.commit()
+    if user_answers_record.completed_at is not None:
+        await session.run_sync(discard_user_result, user_answers_record.id)
+    await session.delete(user_answers_record)
+    await session.commit()
     logger.info(
         f"User Answers Record with ID {user_answers_record_id} deleted successfully"
     )
     return None
 
 
-def get_recent_user_answers(
+async def get_recent_user_answers(
     questionnaire_id: str,
     days: int,
     current_user: User,
-    session: Session,
+    session: AsyncSession,
 ) -> UserAnswersRecordRead:
     """
     Fetch the most recent User Answers Record for the given questionnaire within the last `days` days.
@@ -177,16 +341,16 @@ def get_recent_user_answers(
         )
         .order_by(UserAnswer.created_at.desc())
     )
-    record = session.exec(stmt).first()
+    record = (await session.exec(stmt)).first()
     if not record:
         raise HTTPException(status_code=404, detail="No recent user answers found")
     return UserAnswersRecordRead.model_validate(record)
 
 
-def get_latest_completed_user_answers(
+async def get_latest_completed_user_answers(
     questionnaire_id: str,
     current_user: User,
-    session: Session,
+    session: AsyncSession,
 ) -> UserAnswersRecordRead:
     """
     Fetch the latest completed (completed_at is not null) User Answers Record
@@ -201,22 +365,23 @@ def get_latest_completed_user_answers(
         )
         .order_by(UserAnswer.completed_at.desc())
     )
-    record = session.exec(stmt).first()
+    record = (await session.exec(stmt)).first()
     if not record:
         raise HTTPException(status_code=404, detail="No completed user answers found")
     return UserAnswersRecordRead.model_validate(record)
 
 
-def list_completed_user_answers(
+async def list_completed_user_answers(
     current_user: User,
-    session: Session,
+    session: AsyncSession,
     questionnaire_id: str | None = None,
-    limit: int | None = None,
-    offset: int | None = None,
-) -> list[CompletedAnswersSummaryRead]:
-    """Return all completed user answers for the current user, newest first.
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+) -> CompletedAnswersSummaryPage:
+    """Return a page of the current user's completed user answers, newest first.
 
-    Optionally filter by questionnaire_id and apply limit/offset for pagination.
+    Optionally filter by questionnaire_id; pass the returned `next_cursor` as
+    `cursor` to fetch the following page.
     """
     stmt = (
         select(UserAnswer, Questionnaire)
@@ -225,16 +390,14 @@ def list_completed_user_answers(
             (UserAnswer.user_id == current_user.id)
             & (UserAnswer.completed_at.isnot(None))
         )
-        .order_by(UserAnswer.completed_at.desc())
     )
     if questionnaire_id:
         stmt = stmt.where(UserAnswer.questionnaire_id == questionnaire_id)
-    if offset:
-        stmt = stmt.offset(offset)
-    if limit:
-        stmt = stmt.limit(limit)
+    stmt = paginate(stmt, UserAnswer.completed_at, UserAnswer.id, cursor, limit)
 
-    rows = session.exec(stmt).all()
+    rows, next_cursor = page_rows(
+        (await session.exec(stmt)).all(), limit, lambda row: (row[0].completed_at, row[0].id)
+    )
     results: list[CompletedAnswersSummaryRead] = []
     for ua, q in rows:
         # Safeguard if title missing
@@ -250,4 +413,4 @@ def list_completed_user_answers(
                 completed_at=ua.completed_at,
             )
         )
-    return results
+    return CompletedAnswersSummaryPage(items=results, next_cursor=next_cursor)
@@ -1,9 +1,10 @@
 import logging
 
 from fastapi import APIRouter, Depends, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from database.core import get_session
+from database.core import get_async_session
+from database.replicas import get_async_read_session
 from entities.user_module_progress import UserModuleProgress
 from entities.users import User
 
@@ -22,31 +23,31 @@ router = APIRouter(prefix="/module_progress", tags=["module_progress"])
 @router.post("/", response_model=UserModuleProgressRead, summary="Create User Module Progress")
 # def create_module_progress(module: LeadershipModuleProgressCreate, session: Session = Depends(get_session), current_user: User=Depends(get_current_user)) -> LeadershipModuleProgressRead:
 
-def create_user_module_progress(
-    progress: UserModuleProgressCreate, session: Session = Depends(get_session)
+async def create_user_module_progress(
+    progress: UserModuleProgressCreate, session: AsyncSession = Depends(get_async_session)
 ) -> UserModuleProgressRead:
     """
     Create a new user module progress record in the system.
     """
-    return service_create_user_module_progress(progress, session)   
+    return await service_create_user_module_progress(progress, session)   
 
 
 @router.get("/{progress_id}", response_model=UserModuleProgressRead, summary="Get User Module Progress by ID")
-def get_user_module_progress(
-    progress_id: str, session: Session = Depends(get_session)
+async def get_user_module_progress(
+    progress_id: str, session: AsyncSession = Depends(get_async_read_session)
 ) -> UserModuleProgressRead:
     """
     Retrieve a user module progress record by its ID.
     """
-    return service_get_user_module_progress_by_id(progress_id, session)
+    return await service_get_user_module_progress_by_id(progress_id, session)
 
 
 @router.delete("/{progress_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete User Module Progress")
-def delete_user_module_progress(progress_id: str, session: Session = Depends(get_session)):
+async def delete_user_module_progress(progress_id: str, session: AsyncSession = Depends(get_async_session)):
     """
     Delete a user module progress record by its ID.
     """
-    return service_delete_user_module_progress(progress_id, session)
+    return await service_delete_user_module_progress(progress_id, session)
 
 
 
@@ -2,7 +2,8 @@ import logging
 
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from entities.user_module_progress import UserModuleProgress
 from entities.users import User
@@ -13,7 +14,7 @@ logger = logging.getLogger(__name__)
 
 
 # def create_user_module_progress(module: UserModuleProgressCreate, session: Session, current_user: User) -> UserModuleProgressRead:
-def create_user_module_progress(progress: UserModuleProgressCreate, session: Session) -> UserModuleProgressRead:
+async def create_user_module_progress(progress: UserModuleProgressCreate, session: AsyncSession) -> UserModuleProgressRead:
     """
     Create a new user module progress record in the system.
     """
@@ -28,18 +29,18 @@ def create_user_module_progress(progress: UserModuleProgressCreate, session: Ses
     )
 
     session.add(new_progress)
-    session.commit()
-    session.refresh(new_progress)
+    await session.commit()
+    await session.refresh(new_progress)
     logger.info(f"User Module Progress created: {new_progress.id}")
     return new_progress
 
 
-def get_user_module_progress_by_id(progress_id: str, session: Session) -> UserModuleProgressRead:
+async def get_user_module_progress_by_id(progress_id: str, session: AsyncSession) -> UserModuleProgressRead:
     """
     Retrieve a user module progress record by its ID.
     """
     statement = select(UserModuleProgress).where(UserModuleProgress.id == progress_id)
-    progress = session.exec(statement).first()
+    progress = (await session.exec(statement)).first()
     if not progress:
         logger.error(f"User Module Progress with ID {progress_id} not found")
         raise HTTPException(status_code=404, detail="User Module Progress not found")
@@ -47,17 +48,17 @@ def get_user_module_progress_by_id(progress_id: str, session: Session) -> UserMo
     return UserModuleProgressRead.model_validate(progress)  # Assuming UserModuleProgressRead has a model_validate method to convert the model
 
 
-def delete_user_module_progress(progress_id: str, session: Session) -> None:
+async def delete_user_module_progress(progress_id: str, session: AsyncSession) -> None:
     """
     Delete a user module progress record by its ID.
     """
     statement = select(UserModuleProgress).where(UserModuleProgress.id == progress_id)
-    progress = session.exec(statement).first()
+    progress = (await session.exec(statement)).first()
     if not progress:
         logger.error(f"User Module Progress with ID {progress_id} not found")
         raise HTTPException(status_code=404, detail="User Module Progress not found")
-    session.delete(progress)
-    session.commit()
+    await session.delete(progress)
+    await session.commit()
     logger.info(f"User Module Progress with ID {progress_id} deleted successfully")
     return None
 
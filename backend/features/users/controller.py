@@ -1,9 +1,9 @@
 import logging
 
 from fastapi import APIRouter, Depends, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from database.core import get_session
+from database.core import get_async_session
 from entities.users import User
 from features.auth.service import get_current_user
 
@@ -35,7 +35,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/user", response_model=UserRead, summary="Return Authenticated User")
-def read_user(
+async def read_user(
     current_user: User=Depends(get_current_user)
 ): 
     logger.info(f"GET /users/user -user_id={current_user.id}")
@@ -43,18 +43,18 @@ def read_user(
 
 
 @router.patch("/user", response_model=UserRead, summary="Update User")
-def update_user(
-    user_update: UserUpdate, current_user: User=Depends(get_current_user), session: Session=Depends(get_session)
+async def update_user(
+    user_update: UserUpdate, current_user: User=Depends(get_current_user), session: AsyncSession=Depends(get_async_session)
 ) -> UserRead:
     """
     Update an existing user's information.
     """
-    return service_update_user(user_update, current_user, session)
+    return await service_update_user(user_update, current_user, session)
 
 
 @router.delete("/user", status_code=status.HTTP_204_NO_CONTENT, summary="Delete User")
-def delete_user(delete_in: UserDelete, current_user: User=Depends(get_current_user), session: Session=Depends(get_session)):
+async def delete_user(delete_in: UserDelete, current_user: User=Depends(get_current_user), session: AsyncSession=Depends(get_async_session)):
     """
     Delete a user by their ID.
     """
-    return service_delete_user(delete_in, current_user, session)
\ No newline at end of file
+    return await service_delete_user(delete_in, current_user, session)
\ No newline at end of file
@@ -2,10 +2,15 @@ import logging
 
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from entities.users import User
-from utils.security import get_password_hash, verify_password
+from features.auth.user_cache import (
+    invalidate_cached_user,
+    publish_user_invalidation,
+)
+from utils.password_pool import check_password, hash_password
 
 from .models import UserCreate, UserDelete, UserLogin, UserRead, UserUpdate
 
@@ -77,18 +82,28 @@ def read_current_user(current_user: User) -> User:
     
 
 
-def update_user(user_update: UserUpdate, current_user: User, session: Session) -> UserRead:
+async def _load_user(user_id: str, session: AsyncSession) -> User:
+    user = await session.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
+
+
+async def update_user(user_update: UserUpdate, current_user: User, session: AsyncSession) -> UserRead:
     """
     Update an existing user's information.
     Raises:
         HTTPException(404): If the user is not found
     """
     data = user_update.model_dump(exclude_unset=True)
+    # get_current_user may return a cached, detached snapshot; write to this session's row
+    current_user = await _load_user(current_user.id, session)
 
     # 1) We need to pull out and verify `current_password`
     supplied_old_password = data.pop("current_password", None)
     
-    if not verify_password(supplied_old_password, current_user.hashed_password):
+    # bcrypt is deliberately slow; it runs in the password pool
+    if not await check_password(supplied_old_password, current_user.hashed_password):
         logger.warning(
             f"User {current_user.id} attempted to update profile with incorrect password"
         )
@@ -101,7 +116,7 @@ def update_user(user_update: UserUpdate, current_user: User, session: Session) -
     # 2) If the client sent a new `password`, hash+store it:
     if "password" in data:
         new_pw = data.pop("password")
-        current_user.hashed_password = get_password_hash(new_pw)
+        current_user.hashed_password = await hash_password(new_pw)
         logger.info(f"User {current_user.id} updated their password successfully.")
 
     # 3) Update first_name/last_name/email if present:
@@ -125,17 +140,20 @@ def update_user(user_update: UserUpdate, current_user: User, session: Session) -
         logger.info(f"User {current_user.id} updated their years of experience successfully.")
     
     session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
+    await publish_user_invalidation(session, current_user.id)
+    await session.commit()
+    invalidate_cached_user(current_user.id)
+    await session.refresh(current_user)
     return UserRead.model_validate(current_user)
 
 
-def delete_user(delete_in: UserDelete, current_user: User, session: Session) -> None:
+async def delete_user(delete_in: UserDelete, current_user: User, session: AsyncSession) -> None:
     """
     Verify that delete_in.password matches current_user.hashed_password.
     If not, raise 401. If it matches, delete and commit.
     """
-    if not verify_password(delete_in.password, current_user.hashed_password):
+    current_user = await _load_user(current_user.id, session)
+    if not await check_password(delete_in.password, current_user.hashed_password):
         logger.warning(
             f"User {current_user.id} attempted to delete account with incorrect password."
         )
@@ -144,7 +162,9 @@ def delete_user(delete_in: UserDelete, current_user: User, session: Session) ->
             detail="Incorrect password, cannot delete account.",
         )
     logger.info(f"User {current_user.id} is deleting their account.")
-    session.delete(current_user)
-    session.commit()
+    await session.delete(current_user)
+    await publish_user_invalidation(session, current_user.id)
+    await session.commit()
+    invalidate_cached_user(current_user.id)
     # Return None; controller will return a 204 No Content automatically.
     return None
\ No newline at end of file
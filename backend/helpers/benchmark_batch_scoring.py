@@ -0,0 +1,79 @@
+import argparse
+import random
+import time
+
+from features.results.answer_key import AnswerKey
+from features.results.batch_scoring import score_answer_sets
+from features.results.scoring import compute_competency_scores
+
+
+def build_synthetic_data(
+    n_records: int, n_questions: int, n_competencies: int, seed: int = 7
+) -> tuple[AnswerKey, list[dict[str, str]]]:
+    """Build an answer key and answer sets shaped like the real questionnaire."""
+    rng = random.Random(seed)
+    questions: dict[str, tuple[str, int]] = {}
+    answers: dict[str, tuple[str, int]] = {}
+    options_by_qid: dict[str, list[str]] = {}
+    for q in range(n_questions):
+        question_id = f"q{q}"
+        scores = list(range(1, 6))
+        questions[question_id] = (f"competency-{q % n_competencies}", max(scores))
+        options_by_qid[question_id] = []
+        for score in scores:
+            answer_id = f"{question_id}-a{score}"
+            answers[answer_id] = (question_id, score)
+            options_by_qid[question_id].append(answer_id)
+
+    answer_sets = []
+    for _ in range(n_records):
+        answered = rng.sample(list(questions), rng.randint(n_questions // 2, n_questions))
+        answer_sets.append(
+            {question_id: rng.choice(options_by_qid[question_id]) for question_id in answered}
+        )
+    answer_key = AnswerKey(version=0, questions=questions, answers=answers)
+    return answer_key, answer_sets
+
+
+def best_of(repeat: int, func):
+    """Return the fastest wall time over `repeat` runs and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare per-record and vectorized batch competency scoring."
+    )
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--questions", type=int, default=40)
+    parser.add_argument("--competencies", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    answer_key, answer_sets = build_synthetic_data(
+        args.records, args.questions, args.competencies
+    )
+
+    per_record_s, per_record = best_of(
+        args.repeat,
+        lambda: [compute_competency_scores(a, answer_key) for a in answer_sets],
+    )
+    batch_s, batch = best_of(
+        args.repeat, lambda: score_answer_sets(answer_sets, answer_key)
+    )
+
+    assert per_record == batch, "Batch scores differ from per-record scores"
+    print(f"Records: {args.records}, questions: {args.questions}")
+    print(f"Per-record scoring (CPU only): {per_record_s * 1000:.1f} ms (best of {args.repeat})")
+    print(f"Batch scoring:                 {batch_s * 1000:.1f} ms (best of {args.repeat})")
+    print(f"Speedup: {per_record_s / batch_s:.1f}x")
+    print(
+        "Note: per-record scoring through get_user_results_by_record_id also "
+        "costs one query per record, which batch scoring replaces with one query."
+    )
@@ -0,0 +1,204 @@
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlmodel import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database.core import async_engine
+from entities.users import User
+from features.answers.service import list_answers
+from features.development_plans.service import list_development_plans_for_user
+from features.user_answers.service import (
+    get_latest_completed_user_answers,
+    get_recent_user_answers,
+    list_completed_user_answers,
+)
+
+# Tables that must be reached through an index by the checked queries
+INDEXED_TABLES = ("user_answers", "development_plans", "answers")
+CHECKED_SERVICES = (
+    "get_latest_completed_user_answers",
+    "get_recent_user_answers",
+    "list_completed_user_answers",
+    "list_answers",
+    "list_development_plans_for_user",
+)
+DEFAULT_COUNTS = {
+    "users": 2_000,
+    "questions": 2_000,
+    "questionnaires": 5,
+    "records_per_user": 20,
+    "plans_per_user": 5,
+}
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO users (id, first_name, last_name, email, hashed_password, role, years_experience, created_at, updated_at)
+    SELECT 'plan-check-user-' || g, 'Plan', 'Check', 'plan-check-' || g || '@example.com', 'x', 'manager', g % 30, now(), now()
+    FROM generate_series(1, :users) AS g
+    """,
+    """
+    INSERT INTO questions (id, question_text, is_active, created_at, updated_at)
+    SELECT 'plan-check-question-' || g, 'Question ' || g, true, now(), now()
+    FROM generate_series(1, :questions) AS g
+    """,
+    """
+    INSERT INTO answers (id, question_id, answer_text, score_value, created_at, updated_at)
+    SELECT 'plan-check-answer-' || q || '-' || s, 'plan-check-question-' || q, 'Answer ' || s, s, now(), now()
+    FROM generate_series(1, :questions) AS q, generate_series(1, 5) AS s
+    """,
+    """
+    INSERT INTO questionnaires (id, title, questions, is_active, created_at, updated_at)
+    SELECT 'plan-check-questionnaire-' || g, 'Questionnaire ' || g,
+           ARRAY(SELECT 'plan-check-question-' || q FROM generate_series(1, least(:questions, 60)) AS q), true, now(), now()
+    FROM generate_series(1, :questionnaires) AS g
+    """,
+    """
+    INSERT INTO user_answers (id, user_id, questionnaire_id, answers, created_at, updated_at, completed_at)
+    SELECT 'plan-check-record-' || u || '-' || r, 'plan-check-user-' || u,
+           'plan-check-questionnaire-' || (r % :questionnaires + 1), '{}'::jsonb,
+           now() - r * interval '1 day', now() - r * interval '1 day',
+           CASE WHEN r % 4 = 0 THEN NULL ELSE now() - r * interval '1 day' END
+    FROM generate_series(1, :users) AS u, generate_series(1, :records_per_user) AS r
+    """,
+    """
+    INSERT INTO development_plans (
+        id, user_id, user_answers_record_id, goal, start_date, end_date, status, progress,
+        action_items, target_date, created_at, updated_at
+    )
+    SELECT 'plan-check-plan-' || u || '-' || p, 'plan-check-user-' || u,
+           'plan-check-record-' || u || '-' || ((p - 1) % :records_per_user + 1),
+           'Goal', now(), now() + interval '90 days', 'active', 0, '[]', now() + interval '90 days',
+           now() - p * interval '1 day', now()
+    FROM generate_series(1, :users) AS u, generate_series(1, :plans_per_user) AS p
+    """,
+]
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    """Return the relations read by a sequential scan anywhere in a JSON plan tree."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+
+async def capture_queries(session: AsyncSession, user: User) -> dict[str, list[tuple]]:
+    """Run each checked service once and return the SQL it sent, keyed by service name."""
+    captured: list[tuple] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    services = {
+        "get_latest_completed_user_answers": lambda: get_latest_completed_user_answers(
+            "plan-check-questionnaire-1", user, session
+        ),
+        "get_recent_user_answers": lambda: get_recent_user_answers(
+            "plan-check-questionnaire-1", 30, user, session
+        ),
+        "list_completed_user_answers": lambda: list_completed_user_answers(user, session),
+        "list_answers": lambda: list_answers("plan-check-question-1", session),
+        "list_development_plans_for_user": lambda: session.run_sync(
+            lambda s: list_development_plans_for_user(user, s)
+        ),
+    }
+    queries: dict[str, list[tuple]] = {}
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        for name, call in services.items():
+            captured.clear()
+            await call()
+            queries[name] = list(captured)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    return queries
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    statement: str
+    cost: float
+    seq_scans: list[str]  # Indexed tables the plan reads sequentially
+
+
+async def explain_service_queries(
+    users: int = DEFAULT_COUNTS["users"],
+    questions: int = DEFAULT_COUNTS["questions"],
+    questionnaires: int = DEFAULT_COUNTS["questionnaires"],
+    records_per_user: int = DEFAULT_COUNTS["records_per_user"],
+    plans_per_user: int = DEFAULT_COUNTS["plans_per_user"],
+) -> dict[str, list[QueryPlan]]:
+    """
+    Seed synthetic data in a transaction that is rolled back, run each checked
+    service and return the plan of every query it sent, keyed by service name.
+    """
+    counts = {
+        "users": users,
+        "questions": questions,
+        "questionnaires": questionnaires,
+        "records_per_user": records_per_user,
+        "plans_per_user": plans_per_user,
+    }
+    plans: dict[str, list[QueryPlan]] = {}
+    async with async_engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            for statement in SEED_STATEMENTS:
+                await conn.execute(text(statement), counts)
+            for table in ("users", "questions", "answers", "questionnaires", *INDEXED_TABLES):
+                await conn.exec_driver_sql(f"ANALYZE {table}")
+
+            session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint")
+            user = await session.get(User, f"plan-check-user-{users // 2}")
+            queries = await capture_queries(session, user)
+
+            for name, statements in queries.items():
+                plans[name] = []
+                for statement, parameters in statements:
+                    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                    plan = result.scalar()
+                    plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]
+                    scans = [t for t in find_seq_scans(plan["Plan"]) if t in INDEXED_TABLES]
+                    plans[name].append(QueryPlan(statement, plan["Plan"]["Total Cost"], scans))
+        finally:
+            await transaction.rollback()
+    return plans
+
+
+async def main(args) -> int:
+    failures = 0
+    plans = await explain_service_queries(
+        args.users, args.questions, args.questionnaires, args.records_per_user, args.plans_per_user
+    )
+    await async_engine.dispose()
+    print(
+        f"Seeded {args.users} users, {args.users * args.records_per_user} user answers, "
+        f"{args.users * args.plans_per_user} development plans, {args.questions * 5} answers"
+    )
+    for name, service_plans in plans.items():
+        for plan in service_plans:
+            status = "FAIL" if plan.seq_scans else "ok"
+            print(f"{status:4} {name}: cost {plan.cost:.1f}")
+            if plan.seq_scans:
+                failures += 1
+                print(f"     sequential scan on {', '.join(plan.seq_scans)}:")
+                print("     " + " ".join(plan.statement.split()))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Seed synthetic data in a rolled-back transaction and fail if a hot "
+        "service query plans a sequential scan on an indexed table."
+    )
+    for name, default in DEFAULT_COUNTS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+
+from database.core import async_engine
+from features.exports.models import ExportDataset, ExportFormat
+from features.exports.service import stream_export
+
+
+async def main(args):
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        async for chunk in stream_export(
+            ExportDataset(args.dataset),
+            ExportFormat(args.format),
+            questionnaire_id=args.questionnaire_id,
+            since=args.since,
+            until=args.until,
+            include_results=args.include_results,
+        ):
+            output.write(chunk)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Stream user answers records, results or development plans as NDJSON or CSV "
+        "(read on the primary)."
+    )
+    parser.add_argument("dataset", choices=[dataset.value for dataset in ExportDataset])
+    parser.add_argument("--format", choices=[fmt.value for fmt in ExportFormat], default="ndjson")
+    parser.add_argument("--questionnaire-id")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="ISO timestamp, inclusive")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="ISO timestamp, exclusive")
+    parser.add_argument(
+        "--include-results",
+        action="store_true",
+        help="Add the competency percentages to answers and plans",
+    )
+    parser.add_argument("--output", help="File to write; standard output by default")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,44 @@
+import argparse
+import asyncio
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database.core import async_engine
+from features.imports.models import ImportFormat
+from features.imports.service import import_user_answers
+
+
+async def read_lines(path: str):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\r\n")
+
+
+async def main(args):
+    import_format = ImportFormat(args.format or ("csv" if args.path.endswith(".csv") else "ndjson"))
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        report = await import_user_answers(read_lines(args.path), import_format, session)
+    await async_engine.dispose()
+    for error in report.errors:
+        print(f"line {error.line}: {error.detail}")
+    print(
+        f"{report.imported} imported, {report.duplicates} duplicates, {report.rejected} rejected "
+        f"of {report.rows} rows in {report.elapsed_seconds:.1f}s ({report.rows_per_second:.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bulk import completed historical assessments, scoring them on the way in."
+    )
+    parser.add_argument(
+        "path",
+        help="NDJSON or CSV rows of email, questionnaire_id and/or questionnaire_version_id, "
+        "answers (question ID -> answer ID) and completed_at",
+    )
+    parser.add_argument(
+        "--format",
+        choices=[fmt.value for fmt in ImportFormat],
+        help="Defaults to csv for .csv files, ndjson otherwise",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,31 @@
+import argparse
+
+from database.core import get_session
+from features.results.analytics import rebuild_competency_distributions
+from features.results.scoring import backfill_user_results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Materialize competency scores for completed user answers."
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Recompute every completed record, not only missing or stale ones.",
+    )
+    parser.add_argument(
+        "--rebuild-analytics",
+        action="store_true",
+        help="Rebuild the cohort analytics buckets from user_results afterwards.",
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    session = next(get_session())
+    written = backfill_user_results(
+        session, recompute_all=args.all, batch_size=args.batch_size
+    )
+    print(f"Materialized results for {written} user answers records")
+    if args.rebuild_analytics:
+        rebuild_competency_distributions(session)
+        print("Rebuilt cohort competency analytics")
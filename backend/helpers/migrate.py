@@ -0,0 +1,35 @@
+import argparse
+
+from database.migrations import (
+    LATEST_SCHEMA_VERSION,
+    get_pending_migrations,
+    get_schema_version,
+    run_migrations,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Apply pending database schema migrations."
+    )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Show the current schema version and pending migrations without applying them.",
+    )
+    parser.add_argument(
+        "--to",
+        type=int,
+        default=None,
+        help=f"Stop after this version (default: latest, {LATEST_SCHEMA_VERSION}).",
+    )
+    args = parser.parse_args()
+
+    if args.status:
+        print(f"Schema version: {get_schema_version() or 0} (latest {LATEST_SCHEMA_VERSION})")
+        for migration in get_pending_migrations():
+            print(f"  pending {migration.version}: {migration.description}")
+    else:
+        applied = run_migrations(args.to)
+        for migration in applied:
+            print(f"Applied {migration.version}: {migration.description}")
+        print(f"Schema version: {get_schema_version() or 0}")
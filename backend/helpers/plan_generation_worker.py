@@ -0,0 +1,28 @@
+import argparse
+import time
+
+from config import settings
+from features.development_plans.jobs import (
+    start_plan_generation_workers,
+    stop_plan_generation_workers,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run development plan generation workers outside the API process."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.PLAN_GENERATION_WORKERS or 1,
+        help="Number of worker threads (the global concurrency cap still applies).",
+    )
+    args = parser.parse_args()
+
+    start_plan_generation_workers(args.workers)
+    print(f"Running {args.workers} plan generation workers; press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        stop_plan_generation_workers()
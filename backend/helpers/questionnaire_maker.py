@@ -1,26 +1,69 @@
-from fastapi import Depends
+import argparse
+import asyncio
+import json
+import time
 
-from database.core import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database.core import async_engine
+from database.pagination import MAX_PAGE_SIZE
+from features.question_and_answers.models import QuestionWithAnswersCreate
+from features.question_and_answers.service import (
+    create_question_with_answers_list,
+)
 from features.questionnaires.models import QuestionnaireCreate
 from features.questionnaires.service import create_questionnaire
 from features.questions.service import list_questions
 
-if __name__ == "__main__":
+
+async def import_questions(path: str, session: AsyncSession) -> list[str]:
+    """Bulk insert the questions of a JSON file (a list of question-with-answers objects); return their IDs."""
+    with open(path) as f:
+        data_list = [QuestionWithAnswersCreate.model_validate(item) for item in json.load(f)]
+    start = time.perf_counter()
+    created = await create_question_with_answers_list(data_list, session)
+    elapsed = time.perf_counter() - start
+    answers = sum(len(question.answers) for question in created)
+    print(f"Imported {len(created)} questions and {answers} answers in {elapsed:.2f}s")
+    return [question.question_id for question in created]
 
 
-    session = next(get_session())
-    questions_read_list = list_questions(session)
-    print(f"Questions read: {questions_read_list}")
-    questions_list = [question.id for question in questions_read_list]
-    
-    # print(f"Questions list: {questions_list}")
+async def main(args):
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        if args.questions_file:
+            questions_list = await import_questions(args.questions_file, session)
+        else:
+            questions_read_list = []
+            cursor = None
+            while True:
+                page = await list_questions(session, limit=MAX_PAGE_SIZE, cursor=cursor)
+                questions_read_list.extend(page.items)
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+            print(f"Questions read: {questions_read_list}")
+            questions_list = [question.id for question in questions_read_list]
 
-    questionnaire_create = QuestionnaireCreate(
-        title="Sample Questionnaire",
-        description="This is a sample questionnaire created for testing purposes.",
-        questions=questions_list, 
-        )
-    questionnaire = create_questionnaire(questionnaire_create, session=session)
-    print(f"Questionnaire created with ID: {questionnaire.id}")
+        # print(f"Questions list: {questions_list}")
 
+        questionnaire_create = QuestionnaireCreate(
+            title=args.title,
+            description="This is a sample questionnaire created for testing purposes.",
+            questions=questions_list,
+            )
+        questionnaire = await create_questionnaire(questionnaire_create, session=session)
+        print(f"Questionnaire created with ID: {questionnaire.id}")
+    await async_engine.dispose()
 
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Create a questionnaire from every stored question, or from questions "
+        "bulk imported from a JSON file."
+    )
+    parser.add_argument(
+        "--questions-file",
+        help="JSON list of {question_text, competency, answers: [{answer_text, score_value}]} to import first",
+    )
+    parser.add_argument("--title", default="Sample Questionnaire")
+    asyncio.run(main(parser.parse_args()))
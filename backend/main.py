@@ -1,28 +1,51 @@
 import logging
-import os
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from config import settings
 from database.core import (
     check_db_connection,
-    create_db_and_tables,
+    get_db_health,
     get_session,
 )
+from database.instrumentation import QueryStatsMiddleware, get_pool_status
+from database.migrations import verify_schema_version
+from database.replicas import (
+    ReadYourWritesMiddleware,
+    get_replica_status,
+    start_replica_health_checks,
+    stop_replica_health_checks,
+)
 from entities import (
     Answer,
+    CompetencyScoreBucket,
     DevelopmentPlan,
+    DevelopmentPlanPdf,
     LeadershipAssessment,
     LeadershipModule,
+    PlanGenerationJob,
     Question,
     Questionnaire,
+    UrlStatus,
     User,
     UserAnswer,
     UserModuleProgress,
+    UserResult,
+)
+from features.auth.user_cache import (
+    start_user_cache_listener,
+    stop_user_cache_listener,
+)
+from features.development_plans.jobs import (
+    start_plan_generation_workers,
+    stop_plan_generation_workers,
 )
+from metrics import MetricsMiddleware, metrics_response
 from routers import register_routers
+from utils.password_pool import start_password_pool, stop_password_pool
 
 load_dotenv()
 
@@ -31,14 +54,22 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
-    Application lifespan context manager to create the database and tables.
-    This is called when the application starts.
+    Application lifespan context manager to verify the database schema version.
+    This is called when the application starts; migrations run separately.
     """
     try:
-        logger.info("Creating database and tables...")
-        # Create the database and tables if they do not exist
-        create_db_and_tables()
+        logger.info("Verifying database schema...")
+        # Schema changes run via `python -m helpers.migrate`, not on every boot
+        verify_schema_version()
+        start_replica_health_checks()
+        start_plan_generation_workers()
+        start_user_cache_listener()
+        start_password_pool()
         yield
+        stop_password_pool()
+        stop_user_cache_listener()
+        stop_plan_generation_workers()
+        stop_replica_health_checks()
     except Exception as e:
         logger.error(f"Error during application startup: {e}")
         raise
@@ -56,23 +87,31 @@ async def health_check():
 
 
 @app.get("/health/db", summary="Database Health Check")
-async def db_health_check():
+def db_health_check():
     """
     Endpoint to check the database connection.
+    Reports the cached result of the last connectivity check and the in-process pool status.
     """
-    try:
-        check_db_connection()
-        return {"status": "ok", "db": "connected"}
-    except Exception as e:
-        logger.error(f"Database health check failed: {e}")
-        return {"status": "error", "db": "not connected"}
-    
+    pools = get_pool_status()
+    if not get_db_health():
+        return {"status": "error", "db": "not connected", "pools": pools}
+    return {"status": "ok", "db": "connected", "replicas": get_replica_status(), "pools": pools}
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """
+    Prometheus scrape endpoint.
+    """
+    return metrics_response()
+
 
 # Ensure FORNTEND_URL is set in the environment with the Production URL
-origins = [
-    FRONTEND_URL := os.getenv("FRONTEND_URL", "http://localhost:3000"),
-]
+origins = [settings.FRONTEND_URL]
 
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
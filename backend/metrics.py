@@ -0,0 +1,194 @@
+"""
+Prometheus metrics served at `/metrics`.
+
+HTTP metrics are recorded by `MetricsMiddleware` and labelled by route
+template (`/user_answers/{user_answers_record_id}`), never by raw path, to
+keep the label count bounded. Database metrics (pool state, checkout wait and
+per-request query stats) are recorded by `database.instrumentation`; plan
+generation records LLM latency and token usage and PDF render time here, and
+`utils.password_pool` its queue depth and rejections.
+
+Metrics live in the process that records them. When running several worker
+processes, scrape each one or set PROMETHEUS_MULTIPROC_DIR as described in
+the prometheus_client documentation.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from starlette.responses import Response
+
+from features.auth.user_cache import get_user_cache_stats
+from features.development_plans.plan_cache import get_plan_cache_stats
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests served", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response body was sent",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being served", ["method"]
+)
+
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+)
+DB_REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+DB_REQUEST_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Database time per HTTP request",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+DB_N_PLUS_ONE = Counter(
+    "http_request_db_n_plus_one_total",
+    "Requests that repeated one statement shape at least N_PLUS_ONE_THRESHOLD times",
+    ["route"],
+)
+
+LLM_REQUEST_DURATION = Histogram(
+    "llm_request_duration_seconds",
+    "Latency of plan generation LLM calls",
+    ["operation", "outcome"],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180),
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "Tokens used by plan generation LLM calls", ["operation", "kind"]
+)
+PDF_RENDER_DURATION = Histogram(
+    "pdf_render_duration_seconds",
+    "WeasyPrint development plan PDF render time",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+)
+PASSWORD_HASH_PENDING = Gauge(
+    "password_hash_pending", "Password hash/verify operations running or queued in the process pool"
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "Password operations rejected with 503 because the pool queue was full",
+    ["operation"],
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_label(scope) -> str:
+    """
+    Return the route template that served `scope`, or "unmatched" (404s, mounts).
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+@contextmanager
+def time_llm_call(operation: str) -> Iterator[None]:
+    """
+    Record the duration and outcome (ok/error) of the LLM call made in the block.
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        LLM_REQUEST_DURATION.labels(operation, outcome).observe(time.perf_counter() - start)
+
+
+def record_llm_usage(operation: str, response: Any) -> None:
+    """
+    Add the input/output token counts of an OpenAI Responses API result, if it reports usage.
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    for kind in ("input", "output"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if tokens:
+            LLM_TOKENS.labels(operation, kind).inc(tokens)
+
+
+class _PlanCacheCollector:
+    def collect(self):
+        stats = get_plan_cache_stats()
+        family = GaugeMetricFamily("plan_cache", "Plan cache counters and size", labels=["stat"])
+        for stat, value in stats.items():
+            family.add_metric([stat], value)
+        yield family
+
+
+class _UserCacheCollector:
+    def collect(self):
+        stats = get_user_cache_stats()
+        family = GaugeMetricFamily(
+            "auth_user_cache", "Authenticated user cache counters, size and hit rate", labels=["stat"]
+        )
+        for stat, value in stats.items():
+            family.add_metric([stat], value)
+        yield family
+
+
+REGISTRY.register(_PlanCacheCollector())
+REGISTRY.register(_UserCacheCollector())
+
+
+class MetricsMiddleware:
+    """
+    Record request count, latency and in-flight requests for every HTTP request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            route = route_label(scope)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+            HTTP_REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - start)
+
+
+def metrics_response() -> Response:
+    """
+    Render every registered metric in the Prometheus text format.
+    """
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
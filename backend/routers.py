@@ -5,6 +5,8 @@ from features.auth.controller import router as auth_router
 from features.development_plans.controller import (
     router as development_plans_router,
 )
+from features.exports.controller import router as exports_router
+from features.imports.controller import router as imports_router
 from features.leadership_assessments.controller import (
     router as assessments_router,
 )
@@ -40,4 +42,6 @@ def register_routers(app: FastAPI):
     app.include_router(questionnaires_router)
     app.include_router(auth_router)
     app.include_router(user_answers_router)
-    app.include_router(results_router)
\ No newline at end of file
+    app.include_router(results_router)
+    app.include_router(exports_router)
+    app.include_router(imports_router)
\ No newline at end of file
@@ -0,0 +1,104 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from features.development_plans import link_verifier
+from features.development_plans.link_verifier import LinkStatus, verify_urls
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Routes: /ok, /missing (404), /gone (410), /no-head (405 to HEAD), /slow."""
+
+    head_requests: list[str] = []
+
+    def do_HEAD(self):
+        StubHandler.head_requests.append(self.path)
+        if self.path == "/no-head":
+            self._respond(405)
+        else:
+            self._route()
+
+    def do_GET(self):
+        if self.path == "/no-head":
+            self._respond(206 if self.headers.get("Range") else 200, b"x")
+        else:
+            self._route()
+
+    def _route(self):
+        if self.path == "/ok":
+            self._respond(200, b"ok")
+        elif self.path == "/missing":
+            self._respond(404)
+        elif self.path == "/gone":
+            self._respond(410)
+        elif self.path == "/slow":
+            time.sleep(2)
+            self._respond(200, b"late")
+        else:
+            self._respond(500)
+
+    def _respond(self, status: int, body: bytes = b"") -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    stored = {}
+    monkeypatch.setattr(link_verifier, "_load_cached", lambda urls: {})
+    monkeypatch.setattr(link_verifier, "_store", stored.update)
+    StubHandler.head_requests.clear()
+    return stored
+
+
+def test_ok_link(base_url):
+    status = verify_urls([f"{base_url}/ok"])[f"{base_url}/ok"]
+    assert status == LinkStatus(True, f"{base_url}/ok", 200)
+
+
+@pytest.mark.parametrize("path, code", [("/missing", 404), ("/gone", 410)])
+def test_not_found_is_dead_without_get_retry(base_url, path, code):
+    url = f"{base_url}{path}"
+    assert verify_urls([url])[url] == LinkStatus(False, url, code)
+    assert StubHandler.head_requests == [path]
+
+
+def test_head_not_allowed_retried_with_get(base_url):
+    url = f"{base_url}/no-head"
+    assert verify_urls([url])[url] == LinkStatus(True, url, 206)
+
+
+def test_timeout_is_dead(base_url):
+    url = f"{base_url}/slow"
+    assert verify_urls([url])[url] == LinkStatus(False)
+
+
+def test_invalid_url_fails_only_that_link(base_url):
+    bad = "http://bad\x00host/"  # httpx.InvalidURL, not an httpx.HTTPError
+    statuses = verify_urls([bad, f"{base_url}/ok"])
+    assert statuses[bad] == LinkStatus(False)
+    assert statuses[f"{base_url}/ok"].ok
+
+
+def test_batch_timeout_marks_unchecked_links_dead(base_url, monkeypatch, no_cache):
+    monkeypatch.setattr(link_verifier.settings, "LINK_CHECK_TOTAL_TIMEOUT_SECONDS", 0.2)
+    url = f"{base_url}/slow"
+    assert verify_urls([url])[url] == LinkStatus(False)
+    assert no_cache == {}
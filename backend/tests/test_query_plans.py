@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from database.core import async_engine, engine
+from helpers.check_query_plans import CHECKED_SERVICES, explain_service_queries
+
+
+@pytest.fixture(scope="module")
+def plans():
+    """
+    Plans of every checked service query on a rolled-back synthetic data set
+    (40k user answers). Skips when DATABASE_URL is unreachable.
+    """
+    try:
+        engine.connect().close()
+    except OperationalError:
+        pytest.skip("No database reachable at DATABASE_URL")
+
+    async def explain():
+        try:
+            return await explain_service_queries()
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(explain())
+
+
+@pytest.mark.parametrize("service", CHECKED_SERVICES)
+def test_service_queries_use_indexes(plans, service):
+    assert plans[service], f"{service} sent no SELECT"
+    for plan in plans[service]:
+        assert not plan.seq_scans, (
+            f"sequential scan on {', '.join(plan.seq_scans)}: {' '.join(plan.statement.split())}"
+        )
@@ -0,0 +1,95 @@
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlmodel import Session, create_engine
+
+from config import settings
+from database import replicas
+from database.replicas import (
+    READ_PRIMARY_COOKIE,
+    ReadYourWritesMiddleware,
+    check_replicas,
+    get_read_session,
+)
+
+primary_engine = create_engine("sqlite://")
+replica_engine = create_engine("sqlite://")
+
+
+def _primary_session():
+    with Session(primary_engine) as session:
+        yield session
+
+
+def _database(session: Session) -> str:
+    return "replica" if session.get_bind() is replica_engine else "primary"
+
+
+app = FastAPI()
+app.add_middleware(ReadYourWritesMiddleware)
+
+
+@app.get("/read")
+def read(session: Session = Depends(get_read_session)):
+    return _database(session)
+
+
+@app.post("/write")
+def write(fail: bool = False, session: Session = Depends(get_read_session)):
+    if fail:
+        raise HTTPException(status_code=400, detail="Rejected")
+    return _database(session)
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    replica = replicas._Replica(name="replica1", engine=replica_engine, async_engine=None)
+    monkeypatch.setattr(replicas, "_replicas", [replica])
+    monkeypatch.setattr(replicas, "get_session", _primary_session)
+    check_replicas()
+    return replica
+
+
+@pytest.fixture
+def client(replica):
+    with TestClient(app) as client:
+        yield client
+
+
+def test_reads_go_to_a_healthy_replica(client, replica):
+    assert replica.healthy
+    assert client.get("/read").json() == "replica"
+
+
+def test_reads_stay_on_primary_without_a_healthy_replica(client, replica):
+    replica.healthy = False
+    assert client.get("/read").json() == "primary"
+
+
+def test_writes_use_the_primary(client):
+    assert client.post("/write").json() == "primary"
+
+
+def test_reads_stick_to_primary_after_a_write(client):
+    response = client.post("/write")
+    cookie = response.headers["set-cookie"]
+    assert cookie.startswith(f"{READ_PRIMARY_COOKIE}=1;")
+    assert f"Max-Age={settings.READ_YOUR_WRITES_SECONDS}" in cookie
+    assert client.get("/read").json() == "primary"
+
+    client.cookies.clear()  # The cookie expired
+    assert client.get("/read").json() == "replica"
+
+
+def test_failed_writes_do_not_pin_reads(client):
+    response = client.post("/write", params={"fail": True})
+    assert response.status_code == 400
+    assert "set-cookie" not in response.headers
+    assert client.get("/read").json() == "replica"
+
+
+def test_no_cookie_without_replicas(client, monkeypatch):
+    monkeypatch.setattr(replicas, "_replicas", [])
+    response = client.post("/write")
+    assert "set-cookie" not in response.headers
+    assert client.get("/read").json() == "primary"
@@ -0,0 +1,123 @@
+from uuid import uuid4
+
+import pytest
+
+from entities.answers import Answer
+from entities.questionnaire_versions import QuestionnaireVersion
+from entities.questionnaires import Questionnaire
+from entities.questions import Question
+from entities.user_answers import UserAnswer
+from entities.users import User
+from features.questionnaires.models import QuestionnaireSnapshot
+from features.questionnaires.service import get_snapshot_hash
+from features.results.answer_key import invalidate_answer_key
+from features.results.batch_scoring import batch_score_user_answers
+from features.results.service import get_user_results_by_record_id
+
+
+@pytest.fixture
+def questionnaire(db_session):
+    """
+    Two Vision questions scored 1 or 5, published as a version. Returns the
+    questionnaire, its version hash, and the low and high answer of each question.
+    """
+    user = User(
+        first_name="Ada",
+        last_name="L",
+        email=f"{uuid4().hex}@example.com",
+        hashed_password="x",
+        role="manager",
+        years_experience=6,
+    )
+    questions = [Question(question_text=f"Q{i}", competency="Vision") for i in range(2)]
+    answers = [
+        [Answer(question_id=q.id, answer_text=text, score_value=score) for text, score in (("lo", 1), ("hi", 5))]
+        for q in questions
+    ]
+    questionnaire = Questionnaire(title="T", questions=[q.id for q in questions])
+    db_session.add_all([user, *questions, questionnaire])
+    db_session.flush()
+    db_session.add_all([answer for pair in answers for answer in pair])
+    db_session.flush()
+
+    snapshot = QuestionnaireSnapshot.model_validate(
+        {
+            "questionnaire_id": questionnaire.id,
+            "title": questionnaire.title,
+            "questions": [
+                {
+                    "id": q.id,
+                    "question_text": q.question_text,
+                    "competency": q.competency,
+                    "answers": [
+                        {"id": a.id, "answer_text": a.answer_text, "score_value": a.score_value}
+                        for a in pair
+                    ],
+                }
+                for q, pair in zip(questions, answers)
+            ],
+        }
+    )
+    content_hash = get_snapshot_hash(snapshot)
+    db_session.add(
+        QuestionnaireVersion(
+            content_hash=content_hash,
+            questionnaire_id=questionnaire.id,
+            version=1,
+            content=snapshot.model_dump(mode="json"),
+        )
+    )
+    db_session.flush()
+    invalidate_answer_key()
+    yield user, questionnaire, content_hash, answers
+    invalidate_answer_key()
+
+
+def _record(db_session, user, questionnaire, content_hash, answers):
+    record = UserAnswer(
+        user_id=user.id,
+        questionnaire_id=questionnaire.id,
+        questionnaire_version_id=content_hash,
+        answers={pair[1].question_id: pair[1].id for pair in answers},
+    )
+    db_session.add(record)
+    db_session.flush()
+    return record
+
+
+def _raise_low_scores(db_session, answers):
+    # What PATCH /answers/{id} does: edit the live answer and drop the cached key
+    for low, _ in answers:
+        low.score_value = 10
+    db_session.flush()
+    invalidate_answer_key()
+
+
+def test_in_progress_versioned_record_keeps_its_version_scores(db_session, questionnaire):
+    user, questionnaire, content_hash, answers = questionnaire
+    record = _record(db_session, user, questionnaire, content_hash, answers)
+    before = get_user_results_by_record_id(record.id, user, db_session).results
+    assert before == {"Vision": 100.0}
+
+    _raise_low_scores(db_session, answers)
+
+    assert get_user_results_by_record_id(record.id, user, db_session).results == before
+
+
+def test_unversioned_record_follows_the_live_key(db_session, questionnaire):
+    user, questionnaire, _, answers = questionnaire
+    record = _record(db_session, user, questionnaire, None, answers)
+    _raise_low_scores(db_session, answers)
+
+    assert get_user_results_by_record_id(record.id, user, db_session).results == {"Vision": 50.0}
+
+
+def test_batch_scoring_uses_each_record_version(db_session, questionnaire):
+    user, questionnaire, content_hash, answers = questionnaire
+    versioned = _record(db_session, user, questionnaire, content_hash, answers)
+    unversioned = _record(db_session, user, questionnaire, None, answers)
+    _raise_low_scores(db_session, answers)
+
+    scores = batch_score_user_answers(db_session, record_ids=[versioned.id, unversioned.id])
+
+    assert scores == {versioned.id: {"Vision": 100.0}, unversioned.id: {"Vision": 50.0}}
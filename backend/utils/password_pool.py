@@ -0,0 +1,126 @@
+"""
+Bounded process pool for password hashing and verification.
+
+bcrypt is deliberately slow and CPU bound. Run on the request threadpool, a
+burst of logins occupies every thread (and, through the GIL, slows the event
+loop) so unrelated endpoints stall. Password work instead goes to
+`PASSWORD_HASH_WORKERS` worker processes, and at most
+`PASSWORD_HASH_MAX_PENDING` operations may be running or queued per API
+process; beyond that callers get a 503 with Retry-After right away rather
+than joining an ever growing queue. With `PASSWORD_HASH_WORKERS=0` the work
+runs on the threadpool as before, without the queue limit.
+
+Workers are spawned, so they re-import the main module: scripts that serve
+the app themselves must guard their entry point with `if __name__ == "__main__"`.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from metrics import PASSWORD_HASH_PENDING, PASSWORD_HASH_REJECTED
+from utils.security import (
+    get_password_hash,
+    verify_and_update_password,
+    verify_password,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: ProcessPoolExecutor | None = None
+_pending = 0
+
+
+def _noop() -> None:
+    pass
+
+
+def start_password_pool() -> None:
+    """
+    Start the worker processes, so the first logins do not pay for spawning them.
+    """
+    global _executor
+    if _executor is not None or settings.PASSWORD_HASH_WORKERS <= 0:
+        return
+    # Spawned, not forked: the API process runs threads (workers, listeners)
+    # that must not be duplicated mid-operation into the children
+    _executor = ProcessPoolExecutor(
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    for _ in range(settings.PASSWORD_HASH_WORKERS):
+        _executor.submit(_noop)
+    logger.info(f"Started {settings.PASSWORD_HASH_WORKERS} password hashing processes")
+
+
+def stop_password_pool() -> None:
+    """
+    Shut the worker processes down.
+    """
+    global _executor
+    if _executor is None:
+        return
+    _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+
+
+async def _run(operation: str, fn: Callable[..., T], *args) -> T:
+    global _pending
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return await run_in_threadpool(fn, *args)
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        PASSWORD_HASH_REJECTED.labels(operation).inc()
+        logger.warning(f"Password hashing saturated ({_pending} pending), rejecting {operation}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts in progress, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    start_password_pool()
+    _pending += 1
+    PASSWORD_HASH_PENDING.inc()
+    try:
+        return await asyncio.wrap_future(_executor.submit(fn, *args))
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM killed); replace the pool for later calls
+        logger.error(f"Password hashing pool broke during {operation}, restarting it")
+        stop_password_pool()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password service unavailable, please retry",
+            headers={"Retry-After": "1"},
+        )
+    finally:
+        _pending -= 1
+        PASSWORD_HASH_PENDING.dec()
+
+
+async def hash_password(password: str) -> str:
+    """
+    Hash a plaintext password in the pool. Raises 503 when saturated.
+    """
+    return await _run("hash", get_password_hash, password)
+
+
+async def check_password(plain: str, hashed: str) -> bool:
+    """
+    Verify a plaintext password in the pool. Raises 503 when saturated.
+    """
+    return await _run("verify", verify_password, plain, hashed)
+
+
+async def check_password_and_update(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """
+    Verify a plaintext password in the pool and return a replacement hash when
+    the stored one is outdated (see `verify_and_update_password`).
+    """
+    return await _run("verify", verify_and_update_password, plain, hashed)
@@ -13,6 +13,17 @@ def verify_password(plain: str, hashed: str) -> bool:
         return False
 
 
+def verify_and_update_password(plain: str, hashed: str) -> tuple[bool, str | None]:
+    """
+    Verify a plaintext password and, if its hash uses a deprecated scheme or
+    cost, also return a replacement hash (None otherwise).
+    """
+    try:
+        return pwd_context.verify_and_update(plain, hashed)
+    except UnknownHashError:
+        return False, None
+
+
 def get_password_hash(password: str) -> str:
     """Hash a plaintext password."""
     return pwd_context.hash(password)
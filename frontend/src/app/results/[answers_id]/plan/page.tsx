@@ -8,8 +8,9 @@ import { fetchResults } from '@/lib/api/results';
 import type { UserResults } from '@/types/results';
 import { Button } from '@/components/ui/button';
 import { useSession } from '@/contexts/SessionContext';
-import { generateDevelopmentPlan } from '@/lib/api/devplans';
+import { streamDevelopmentPlan } from '@/lib/api/devplans';
 import { Progress } from '@/components/ui/progress';
+import { PlanMarkdown } from '@/components/PlanMarkdown';
 
 export default function DevelopmentPlanPage() {
   const params = useParams<{ answers_id: string }>();
@@ -26,6 +27,7 @@ export default function DevelopmentPlanPage() {
   const [generating, setGenerating] = useState(false);
   const [progress, setProgress] = useState(0);
   const [genError, setGenError] = useState<string | null>(null);
+  const [streamedMarkdown, setStreamedMarkdown] = useState('');
   const { state } = useSession();
 
   // Track if we've already generated a plan for this answersId to prevent duplicates
@@ -92,19 +94,24 @@ export default function DevelopmentPlanPage() {
       console.log('[Plan Generation] Starting plan generation for', answersId);
       generationTriggeredRef.current = answersId;
       setGenError(null);
+      setStreamedMarkdown('');
       setGenerating(true);
       setProgress(10);
 
       try {
-        const resp = await generateDevelopmentPlan({
-          user_id: state.user.id,
-          user_answers_record_id: answersId,
-          focus_areas: selected,
-          duration_days: parseInt(duration, 10),
-          role: state.user.role,
-          industry: state.user.industry,
-          years_experience: state.user.years_experience,
-        });
+        // Stream the markdown so the plan appears while the model is still writing it
+        await streamDevelopmentPlan(
+          {
+            user_id: state.user.id,
+            user_answers_record_id: answersId,
+            focus_areas: selected,
+            duration_days: parseInt(duration, 10),
+            role: state.user.role,
+            industry: state.user.industry,
+            years_experience: state.user.years_experience,
+          },
+          (text) => setStreamedMarkdown((prev) => prev + text),
+        );
 
         // Complete the progress bar
         setProgress(100);
@@ -172,6 +179,7 @@ export default function DevelopmentPlanPage() {
                     <p className="text-xs text-muted-foreground text-center">
                       This may take 30-60 seconds as we analyze your results and create a tailored plan
                     </p>
+                    {streamedMarkdown && <PlanMarkdown content={streamedMarkdown} />}
                   </div>
                 )}
               </div>
@@ -1,14 +1,13 @@
 import { Card, CardContent, CardDescription, CardFooter, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { useQuestionnaire } from "@/contexts/QuestionnaireContext";
-import { updateUserAnswers } from "@/lib/api/user_answers";
 import { useEffect, useMemo, useState } from "react";
 import { fetchUserAnswersById } from "@/lib/api/user_answers";
 import { useRouter } from "next/navigation";
 import { CheckCircle } from "lucide-react";
 
 export function SubmissionCard() {
-  const { questionnaire, questions, userResponses, goToPrevious, userAnswersId } = useQuestionnaire();
+  const { questionnaire, questions, userResponses, goToPrevious, userAnswersId, flushAnswers } = useQuestionnaire();
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const router = useRouter();
@@ -65,7 +64,8 @@ export function SubmissionCard() {
         setIsSubmitting(false);
         return;
       }
-      await updateUserAnswers({ id: userAnswersId, completed_at: new Date().toISOString() });
+      // Send any unsaved answers and complete the record in one request
+      await flushAnswers({ complete: true });
 
       // Navigate to Thank You with answers_id to enable deep link to results
       router.push(`/thank-you?answers_id=${encodeURIComponent(userAnswersId)}`);
@@ -2,7 +2,8 @@
 
 import React, { createContext, useContext, useState, useCallback, ReactNode } from 'react';
 import { Questionnaire, Question, Answer, UserResponse } from '@/types/questionnaire';
-import { updateUserAnswers } from '@/lib/api/user_answers';
+import { autosaveUserAnswers } from '@/lib/api/user_answers';
+import type { UserAnswers } from '@/types/user_answers';
 
 interface QuestionWithAnswers extends Question {
   answers: Answer[];
@@ -26,6 +27,7 @@ interface QuestionnaireContextType {
   recordResponse: (questionId: string, answerId: string, scoreValue: number) => void;
   getResponseForQuestion: (questionId: string) => UserResponse | undefined;
   saveAnswer: (questionId: string, answerId: string | null, options?: { flush?: boolean }) => void;
+  flushAnswers: (options?: { complete?: boolean }) => Promise<UserAnswers | null>;
   hydrateAnswers: (answers: Record<string, string>) => void;
 
   // State setters
@@ -38,6 +40,14 @@ interface QuestionnaireContextType {
 
 const QuestionnaireContext = createContext<QuestionnaireContextType | undefined>(undefined);
 
+function newClientId(): string {
+  // randomUUID is only available in secure contexts
+  if (typeof crypto !== 'undefined' && typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID();
+  }
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+}
+
 export function QuestionnaireProvider({ children }: { children: ReactNode }) {
   const [questionnaire, setQuestionnaire] = useState<Questionnaire | null>(null);
   const [questions, setQuestions] = useState<QuestionWithAnswers[]>([]);
@@ -46,8 +56,66 @@ export function QuestionnaireProvider({ children }: { children: ReactNode }) {
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [userAnswersId, setUserAnswersId] = useState<string | null>(null);
-  // Debounce timers per question to avoid duplicate PATCH calls
-  const debounceTimersRef = React.useRef<Record<string, ReturnType<typeof setTimeout> | undefined>>({});
+  // Answers chosen since the last autosave, sent together once the user pauses
+  const pendingAnswersRef = React.useRef<Record<string, string>>({});
+  const flushTimerRef = React.useRef<ReturnType<typeof setTimeout> | undefined>(undefined);
+  // Autosave batches are numbered per tab (client id); the server skips numbers it already applied
+  // from this tab, so retries are harmless and other tabs' numbers never hide ours.
+  const [clientId] = useState(newClientId);
+  const lastSeqRef = React.useRef(0);
+  // Flushes run one at a time, in order, so an immediate save never overtakes a debounced one in flight
+  const flushQueueRef = React.useRef<Promise<unknown>>(Promise.resolve());
+
+  const flushAnswers = useCallback((options?: { complete?: boolean }): Promise<UserAnswers | null> => {
+    if (flushTimerRef.current) {
+      clearTimeout(flushTimerRef.current);
+      flushTimerRef.current = undefined;
+    }
+    const send = async (): Promise<UserAnswers | null> => {
+      if (!userAnswersId) return null;
+      const answers = pendingAnswersRef.current;
+      const hasAnswers = Object.keys(answers).length > 0;
+      if (!hasAnswers && !options?.complete) return null;
+
+      pendingAnswersRef.current = {};
+      const seq = ++lastSeqRef.current;
+      try {
+        return await autosaveUserAnswers(userAnswersId, {
+          client_id: clientId,
+          deltas: hasAnswers ? [{ seq, answers }] : [],
+          ...(options?.complete ? { completed_at: new Date().toISOString() } : {}),
+        });
+      } catch (err) {
+        // Keep unsent answers for the next save, without overriding answers chosen meanwhile
+        pendingAnswersRef.current = { ...answers, ...pendingAnswersRef.current };
+        throw err;
+      }
+    };
+    const result = flushQueueRef.current.then(send, send);
+    flushQueueRef.current = result.catch(() => undefined);
+    return result;
+  }, [userAnswersId, clientId]);
+
+  const queueAnswer = useCallback((questionId: string, answerId: string | null, flush: boolean) => {
+    if (answerId === null) {
+      delete pendingAnswersRef.current[questionId];
+    } else {
+      pendingAnswersRef.current[questionId] = answerId;
+    }
+    const send = () => {
+      flushAnswers().catch(() => {
+        // Handle error silently; pending answers are retried with the next save
+      });
+    };
+    if (flush) {
+      send();
+      return;
+    }
+    if (flushTimerRef.current) {
+      clearTimeout(flushTimerRef.current);
+    }
+    flushTimerRef.current = setTimeout(send, 1000);
+  }, [flushAnswers]);
 
   const goToNext = useCallback(() => {
     setCurrentIndex((prev) => {
@@ -93,10 +161,8 @@ export function QuestionnaireProvider({ children }: { children: ReactNode }) {
     });
     // Avoid network call if nothing actually changed
     if (!didChange || !userAnswersId) return;
-    updateUserAnswers({ id: userAnswersId, answers: { [questionId]: answerId } }).catch(() => {
-      // Handle error silently or add error handling logic here if needed
-    });
-  }, [userAnswersId]);
+    queueAnswer(questionId, answerId, false);
+  }, [userAnswersId, queueAnswer]);
 
   const getResponseForQuestion = useCallback((questionId: string) => {
     return userResponses.find((r) => r.question_id === questionId);
@@ -127,42 +193,15 @@ export function QuestionnaireProvider({ children }: { children: ReactNode }) {
 
     if (!userAnswersId) return;
 
-    // Debounced server update to prevent duplicates
-    const timers = debounceTimersRef.current;
-
-    const send = () => {
-      updateUserAnswers({ id: userAnswersId, answers: { [questionId]: answerId } })
-        .catch(() => {
-          // Handle error silently or add error handling logic here if needed
-        });
-    };
-
-    if (options?.flush) {
-      // On flush, if there is a pending timer, send now and clear it
-      if (timers[questionId]) {
-        clearTimeout(timers[questionId]);
-        delete timers[questionId];
-        send();
-        return;
-      }
-      // If no pending timer, only send if something actually changed in this call
-      if (didChange) {
-        send();
-      }
-      return;
-    }
-
-    // Non-flush: only schedule if there was a change
-    if (!didChange) return;
-
-    if (timers[questionId]) {
-      clearTimeout(timers[questionId]);
+    // Batched, debounced server update; flush sends pending answers right away
+    if (didChange) {
+      queueAnswer(questionId, answerId, Boolean(options?.flush));
+    } else if (options?.flush) {
+      flushAnswers().catch(() => {
+        // Handle error silently; pending answers are retried with the next save
+      });
     }
-    timers[questionId] = setTimeout(() => {
-      send();
-      delete timers[questionId];
-    }, 300);
-  }, [userAnswersId]);
+  }, [userAnswersId, queueAnswer, flushAnswers]);
 
   // Hydrate existing answers from a map without triggering network calls
   const hydrateAnswers = useCallback((answers: Record<string, string>) => {
@@ -191,6 +230,7 @@ export function QuestionnaireProvider({ children }: { children: ReactNode }) {
     recordResponse,
     getResponseForQuestion,
     saveAnswer,
+    flushAnswers,
     hydrateAnswers,
     setQuestionnaire,
     setQuestions,
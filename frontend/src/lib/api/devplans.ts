@@ -1,4 +1,4 @@
-import type { GeneratePlanResponse, DevelopmentPlanSummary } from '@/types/devplans';
+import type { GeneratePlanResponse, DevelopmentPlanSummary, DevelopmentPlanSummaryPage, PlanGenerationJob } from '@/types/devplans';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
@@ -12,6 +12,25 @@ export interface GeneratePlanPayload {
   years_experience: number;
 }
 
+const JOB_POLL_INTERVAL_MS = 2000;
+
+async function readError(res: Response): Promise<string> {
+  let msg = res.statusText;
+  try { const data = await res.json(); msg = data?.detail || msg; } catch {}
+  return msg;
+}
+
+export async function fetchPlanGenerationJob(jobId: string): Promise<PlanGenerationJob> {
+  const res = await fetch(`${API_BASE_URL}/devplans/jobs/${encodeURIComponent(jobId)}`, {
+    method: 'GET',
+    credentials: 'include',
+  });
+  if (!res.ok) {
+    throw new Error(`Failed to fetch plan generation job: ${await readError(res)}`);
+  }
+  return res.json();
+}
+
 export async function generateDevelopmentPlan(payload: GeneratePlanPayload): Promise<GeneratePlanResponse> {
   const res = await fetch(`${API_BASE_URL}/devplans/generate`, {
     method: 'POST',
@@ -20,11 +39,56 @@ export async function generateDevelopmentPlan(payload: GeneratePlanPayload): Pro
     body: JSON.stringify(payload),
   });
   if (!res.ok) {
-    let msg = res.statusText;
-    try { const data = await res.json(); msg = data?.detail || msg; } catch {}
-    throw new Error(`Failed to generate plan: ${msg}`);
+    throw new Error(`Failed to generate plan: ${await readError(res)}`);
   }
-  return res.json();
+  // Generation runs as a background job; poll until it finishes
+  let job: PlanGenerationJob = await res.json();
+  while (job.status === 'queued' || job.status === 'running') {
+    await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    job = await fetchPlanGenerationJob(job.id);
+  }
+  if (job.status !== 'succeeded' || !job.result) {
+    throw new Error(`Failed to generate plan: ${job.error || 'Generation failed'}`);
+  }
+  return job.result;
+}
+
+/**
+ * Generate a plan over Server-Sent Events, calling onDelta with markdown as the model writes it.
+ * Resolves with the saved plan once the stream completes.
+ */
+export function streamDevelopmentPlan(
+  payload: GeneratePlanPayload,
+  onDelta: (text: string) => void,
+): Promise<GeneratePlanResponse> {
+  const params = new URLSearchParams({
+    user_answers_record_id: payload.user_answers_record_id,
+    duration_days: String(payload.duration_days),
+    role: payload.role,
+    industry: payload.industry,
+    years_experience: String(payload.years_experience),
+  });
+  payload.focus_areas.forEach((area) => params.append('focus_areas', area));
+
+  return new Promise((resolve, reject) => {
+    const source = new EventSource(`${API_BASE_URL}/devplans/generate/stream?${params}`, {
+      withCredentials: true,
+    });
+    source.addEventListener('delta', (event) => {
+      onDelta(JSON.parse((event as MessageEvent).data).text);
+    });
+    source.addEventListener('done', (event) => {
+      source.close();
+      resolve(JSON.parse((event as MessageEvent).data));
+    });
+    source.addEventListener('error', (event) => {
+      source.close();
+      const data = (event as MessageEvent).data;
+      let msg = 'Stream interrupted';
+      try { if (data) msg = JSON.parse(data)?.detail || msg; } catch {}
+      reject(new Error(`Failed to generate plan: ${msg}`));
+    });
+  });
 }
 
 export async function fetchDevelopmentPlanByUserAnswers(userAnswersRecordId: string): Promise<GeneratePlanResponse> {
@@ -40,13 +104,17 @@ export async function fetchDevelopmentPlanByUserAnswers(userAnswersRecordId: str
   return res.json();
 }
 
-export async function fetchDevelopmentPlanSummaries(): Promise<DevelopmentPlanSummary[]> {
-  const res = await fetch(`${API_BASE_URL}/devplans/`, {
+// Returns one page of the user's plans, newest first; pass the page's next_cursor as `cursor` to fetch the next one.
+export async function fetchDevelopmentPlanSummariesPage(params?: { limit?: number; cursor?: string }): Promise<DevelopmentPlanSummaryPage> {
+  const qs = new URLSearchParams();
+  if (typeof params?.limit === 'number') qs.set('limit', String(params.limit));
+  if (params?.cursor) qs.set('cursor', params.cursor);
+  const res = await fetch(`${API_BASE_URL}/devplans/${qs.toString() ? `?${qs.toString()}` : ''}`, {
     method: 'GET',
     credentials: 'include',
   });
   if (!res.ok) {
-    if (res.status === 404) return [];
+    if (res.status === 404) return { items: [], next_cursor: null };
     let msg = res.statusText;
     try { const data = await res.json(); msg = data?.detail || msg; } catch {}
     throw new Error(`Failed to fetch development plans: ${msg}`);
@@ -54,6 +122,12 @@ export async function fetchDevelopmentPlanSummaries(): Promise<DevelopmentPlanSu
   return res.json();
 }
 
+// First page of the user's plans (the most recent ones)
+export async function fetchDevelopmentPlanSummaries(params?: { limit?: number }): Promise<DevelopmentPlanSummary[]> {
+  const page = await fetchDevelopmentPlanSummariesPage(params);
+  return page.items;
+}
+
 export async function downloadDevelopmentPlanPdf(
   userAnswersRecordId: string,
 ): Promise<Blob> {
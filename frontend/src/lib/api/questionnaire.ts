@@ -31,31 +31,14 @@ export async function fetchAnswersByQuestion(questionId: string): Promise<Answer
   return response.json();
 }
 
-// Fetch all questions for a questionnaire
-export async function fetchQuestionnaireWithDetails(questionnaireId: string) {
-  // First, fetch the questionnaire
-  const questionnaire = await fetchQuestionnaire(questionnaireId);
-  
-  // Then, fetch all questions in parallel
-  const questionsPromises = questionnaire.questions.map(questionId => 
-    fetchQuestion(questionId)
-  );
-  const questions = await Promise.all(questionsPromises);
-  
-  // Finally, fetch all answers for each question in parallel
-  const answersPromises = questions.map(question => 
-    fetchAnswersByQuestion(question.id)
-  );
-  const answersArrays = await Promise.all(answersPromises);
-  
-  // Combine questions with their answers
-  const questionsWithAnswers = questions.map((question, index) => ({
-    ...question,
-    answers: answersArrays[index]
-  }));
-  
-  return {
-    questionnaire,
-    questions: questionsWithAnswers
-  };
+// Fetch a questionnaire with its ordered questions and their answers in one request
+export async function fetchQuestionnaireWithDetails(questionnaireId: string): Promise<{
+  questionnaire: Questionnaire;
+  questions: (Question & { answers: Answer[] })[];
+}> {
+  const response = await fetch(`${API_BASE_URL}/questionnaires/${questionnaireId}/bundle`);
+  if (!response.ok) {
+    throw new Error(`Failed to fetch questionnaire: ${response.statusText}`);
+  }
+  return response.json();
 }
@@ -1,4 +1,4 @@
-import type { UserAnswersSubmission, UserAnswersUpdate, CompletedAnswersSummary } from '@/types/user_answers';
+import type { UserAnswers, UserAnswersSubmission, UserAnswersUpdate, UserAnswersAutosave, CompletedAnswersSummary, CompletedAnswersSummaryPage } from '@/types/user_answers';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
@@ -37,6 +37,24 @@ export async function updateUserAnswers(update: UserAnswersUpdate) {
   return res.json();
 }
 
+// Save a batch of answer deltas (and optionally complete the record) in one request; safe to retry
+export async function autosaveUserAnswers(id: string, autosave: UserAnswersAutosave): Promise<UserAnswers> {
+  const res = await fetch(`${API_BASE_URL}/user_answers/${encodeURIComponent(id)}/autosave`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json'
+    },
+    body: JSON.stringify(autosave),
+    credentials: 'include'
+  });
+  if (!res.ok) {
+    let msg = res.statusText;
+    try { const data = await res.json(); msg = data?.detail || msg; } catch {}
+    throw new Error(`Failed to save user answers: ${msg}`);
+  }
+  return res.json();
+}
+
 // Fetch the most recent user_answers for a questionnaire within a given window (days)
 export async function fetchRecentUserAnswers(params: { questionnaire_id: string; days?: number }) {
   const days = params.days ?? 7;
@@ -78,12 +96,13 @@ export async function fetchLatestCompletedUserAnswers(params: { questionnaire_id
   return res.json();
 }
 
-// List completed user_answers for the authenticated user (optionally filter by questionnaire)
-export async function fetchCompletedUserAnswers(params?: { questionnaire_id?: string; limit?: number; offset?: number }): Promise<CompletedAnswersSummary[] | null> {
+// List completed user_answers for the authenticated user (optionally filter by questionnaire).
+// Returns one page, newest first; pass the page's next_cursor as `cursor` to fetch the next one.
+export async function fetchCompletedUserAnswersPage(params?: { questionnaire_id?: string; limit?: number; cursor?: string }): Promise<CompletedAnswersSummaryPage | null> {
   const qs = new URLSearchParams();
   if (params?.questionnaire_id) qs.set('questionnaire_id', params.questionnaire_id);
   if (typeof params?.limit === 'number') qs.set('limit', String(params.limit));
-  if (typeof params?.offset === 'number') qs.set('offset', String(params.offset));
+  if (params?.cursor) qs.set('cursor', params.cursor);
   const url = `${API_BASE_URL}/user_answers/completed${qs.toString() ? `?${qs.toString()}` : ''}`;
   const res = await fetch(url, { method: 'GET', credentials: 'include' });
   if (!res.ok) {
@@ -92,6 +111,12 @@ export async function fetchCompletedUserAnswers(params?: { questionnaire_id?: st
   return res.json();
 }
 
+// First page of completed user_answers (the most recent ones)
+export async function fetchCompletedUserAnswers(params?: { questionnaire_id?: string; limit?: number }): Promise<CompletedAnswersSummary[] | null> {
+  const page = await fetchCompletedUserAnswersPage(params);
+  return page ? page.items : null;
+}
+
 // export async function completeUserAnswers(id: string) {
 //   const res = await fetch(`${API_BASE_URL}/complete`, {
 //     method: 'PATCH',
@@ -23,6 +23,19 @@ export interface GeneratePlanResponse {
   plan_markdown: string;
 }
 
+export interface PlanGenerationJob {
+  id: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed';
+  user_answers_record_id: string;
+  development_plan_id: string | null;
+  error: string | null;
+  attempts: number;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+  result: GeneratePlanResponse | null;
+}
+
 export interface DevelopmentPlanSummary {
   plan_id: string;
   user_answers_record_id: string;
@@ -30,3 +43,8 @@ export interface DevelopmentPlanSummary {
   questionnaire_title: string;
   created_at: string;
 }
+
+export interface DevelopmentPlanSummaryPage {
+  items: DevelopmentPlanSummary[];
+  next_cursor: string | null;
+}
@@ -4,10 +4,13 @@ export interface UserAnswers {
     id: string;
     user_id: string;
     questionnaire_id: string;
+    questionnaire_version_id: string | null; // Content hash of the questionnaire version scored against
     answers: Record<string, string>; // Dict of answers provided by the user
     created_at: string;
     updated_at: string;
     completed_at: string | null;
+    revision: number; // Incremented by every update
+    autosave_seq: number; // Highest autosave sequence number applied
 }
 
 
@@ -22,6 +25,20 @@ export interface UserAnswersUpdate{
     id: string;
     answers?: Record<string, string | null>; // optional
     completed_at?: string; // optional
+    expected_revision?: number; // optional; the update fails with 409 if the record moved past it
+}
+
+
+export interface AnswerDelta {
+    seq: number; // Strictly increasing per client; deltas already applied from the client are skipped
+    answers: Record<string, string>;
+}
+
+
+export interface UserAnswersAutosave {
+    client_id: string; // Identifies the sending tab; the server tracks applied seqs per client
+    deltas?: AnswerDelta[];
+    completed_at?: string; // optional; completes the record after applying the deltas
 }
 
 
@@ -31,3 +48,8 @@ export interface CompletedAnswersSummary {
     questionnaire_title: string;
     completed_at: string;
 }
+
+export interface CompletedAnswersSummaryPage {
+    items: CompletedAnswersSummary[];
+    next_cursor: string | null;
+}